@@ -251,8 +251,23 @@ class SimulationContext:
         # Fencepost the creation of the initial population.
         self._clock.step_backward()
         population_size = pop_params.population_size
-        self.simulant_creator(population_size, {"sim_state": "setup"})
-        self._clock.step_forward(self.get_population().index)
+        # Creating the population in chunks caps the size of the intermediate
+        # data built by simulant initializers. Each chunk draws its CRN
+        # attributes where the previous chunk left off and the index map places
+        # keys in order when there is more than one chunk, so the population
+        # doesn't depend on the chunk size. With key columns, it may differ from
+        # the population created in a single chunk, though.
+        chunk_size = pop_params.initialization_chunk_size or population_size
+        created = 0
+        while True:
+            count = min(chunk_size, population_size - created)
+            self._randomness.set_crn_attribute_offset(created)
+            self.simulant_creator(count, {"sim_state": "setup"})
+            created += count
+            if created >= population_size:
+                break
+        self._randomness.set_crn_attribute_offset(0)
+        self._clock.step_forward(self._population.get_simulant_index())
 
     def step(self) -> None:
         self._logger.debug(self.current_time)
@@ -260,12 +275,12 @@ class SimulationContext:
             self._logger.debug(f"Event: {event}")
             self._lifecycle.set_state(event)
             pop_to_update = self._clock.get_active_simulants(
-                self.get_population().index,
+                self._population.get_simulant_index(),
                 self._clock.event_time,
             )
             self._logger.debug(f"Updating: {len(pop_to_update)}")
             self.time_step_emitters[event](pop_to_update)
-        self._clock.step_forward(self.get_population().index)
+        self._clock.step_forward(self._population.get_simulant_index())
 
     def run(
         self,
@@ -286,7 +301,7 @@ class SimulationContext:
 
     def finalize(self) -> None:
         self._lifecycle.set_state("simulation_end")
-        self.end_emitter(self.get_population().index)
+        self.end_emitter(self._population.get_simulant_index())
         unused_config_keys = self.configuration.unused_keys()
         if unused_config_keys:
             self._logger.warning(
@@ -295,7 +310,7 @@ class SimulationContext:
 
     def report(self, print_results: bool = True) -> None:
         self._lifecycle.set_state("report")
-        self.report_emitter(self.get_population().index)
+        self.report_emitter(self._population.get_simulant_index())
         results = self.get_results()
         if print_results:
             for measure, df in results.items():
@@ -315,6 +330,10 @@ class SimulationContext:
             for measure, df in results.items():
                 output_file = Path(results_dir) / f"{measure}.parquet"
                 df.to_parquet(output_file, index=False)
+            stream_profile = self._randomness.get_stream_profile()
+            if not stream_profile.empty:
+                output_file = Path(results_dir) / "randomness_profile.parquet"
+                stream_profile.to_parquet(output_file, index=False)
         except ConfigurationKeyError:
             self._logger.info("No results directory set; results are not written to disk.")
 
@@ -338,6 +357,11 @@ class SimulationContext:
             for label, ts in timing_dict.items()
         ]
         performance_metrics = pd.DataFrame(records)
+        randomness_metrics = self._randomness.get_performance_metrics()
+        if not randomness_metrics.empty:
+            performance_metrics = pd.concat(
+                [performance_metrics, randomness_metrics], ignore_index=True
+            )
         return performance_metrics
 
     def add_components(self, component_list: List[Component]) -> None:
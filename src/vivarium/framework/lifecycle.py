@@ -461,6 +461,7 @@ class LifeCycleManager(Manager):
         self._current_state_start_time = time.time()
         self._timings: defaultdict[str, list[float]] = defaultdict(list)
         self._make_constraint = ConstraintMaker(self)
+        self._exit_hooks: list[Callable[[str], None]] = []
 
     @property
     def name(self) -> str:
@@ -517,6 +518,8 @@ class LifeCycleManager(Manager):
         """
         new_state = self.lifecycle.get_state(state)
         if self._current_state.valid_next_state(new_state):
+            for hook in self._exit_hooks:
+                hook(self._current_state.name)
             self._timings[self._current_state.name].append(
                 time.time() - self._current_state_start_time
             )
@@ -559,6 +562,20 @@ class LifeCycleManager(Manager):
         s = self.lifecycle.get_state(state_name)
         s.add_handlers(handlers)
 
+    def add_exit_hook(self, hook: Callable[[str], None]) -> None:
+        """Registers a function to be called whenever a life cycle state ends.
+
+        Hooks are called in registration order with the name of the state
+        being exited, after the transition has been validated but before the
+        next state is entered.
+
+        Parameters
+        ----------
+        hook
+            The function to call at the end of each life cycle state.
+        """
+        self._exit_hooks.append(hook)
+
     def add_constraint(
         self,
         method: Callable[..., Any],
@@ -644,6 +661,17 @@ class LifeCycleInterface(Interface):
         """
         self._manager.add_handlers(state, handlers)
 
+    def add_exit_hook(self, hook: Callable[[str], None]) -> None:
+        """Registers a function to be called whenever a life cycle state ends.
+
+        Parameters
+        ----------
+        hook
+            The function to call with the name of each life cycle state as
+            it ends.
+        """
+        self._manager.add_exit_hook(hook)
+
     def add_constraint(
         self,
         method: Callable[..., Any],
@@ -0,0 +1,89 @@
+"""
+======================
+The Population Archive
+======================
+
+Simulants that are no longer tracked (e.g. because they have died or left the
+simulated population) are still kept in the :term:`State Table`, where every
+read and copy of the table has to step over them. The population manager can be
+configured to periodically compact the state table by moving untracked
+simulants into a :class:`PopulationArchive`. The archive keeps them out of the
+way of the running simulation while still making them available to
+:meth:`PopulationManager.get_population
+<vivarium.framework.population.manager.PopulationManager.get_population>`.
+
+Archived simulants keep their index labels, and labels are never reused for new
+simulants, so anything keyed on simulant labels (e.g. the randomness system's
+:class:`IndexMap <vivarium.framework.randomness.index_map.IndexMap>`) remains
+valid after compaction.
+
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+
+class PopulationArchive:
+    """Cold storage for simulants removed from the state table.
+
+    Archived simulants are held in memory unless the archive is given a
+    directory, in which case each batch of archived simulants is written to
+    its own parquet file there.
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        """
+
+        Parameters
+        ----------
+        directory
+            The directory to spill archived simulants to. If not provided,
+            archived simulants are held in memory.
+        """
+        self._directory = Path(directory) if directory else None
+        self._batches: list[pd.DataFrame | Path] = []
+        self._index: pd.Index[int] = pd.Index([], dtype=int)
+
+    @property
+    def index(self) -> pd.Index[int]:
+        """The index of the archived simulants."""
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, population: pd.DataFrame) -> None:
+        """Adds simulants to the archive.
+
+        Parameters
+        ----------
+        population
+            The simulants to archive, with all state table columns.
+        """
+        if population.empty:
+            return
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            path = self._directory / f"archived_simulants_{len(self._batches)}.parquet"
+            population.to_parquet(path)
+            self._batches.append(path)
+        else:
+            self._batches.append(population)
+        self._index = self._index.append(population.index)  # type: ignore [no-untyped-call]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Provides all archived simulants.
+
+        Returns
+        -------
+            A new table with the archived simulants.
+        """
+        batches = [
+            pd.read_parquet(batch) if isinstance(batch, Path) else batch
+            for batch in self._batches
+        ]
+        if not batches:
+            return pd.DataFrame()
+        return pd.concat(batches)
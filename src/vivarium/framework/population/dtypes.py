@@ -0,0 +1,143 @@
+"""
+======================
+State Table Data Types
+======================
+
+Columns created by components often use wider data types than they need, e.g.
+``object`` columns of a handful of distinct strings, ``int64`` columns of small
+counts or ``float64`` columns of flags. The population manager can be configured
+to replace these with compact data types once the initial population has been
+created. Compact data types are only used to store the state table. Population
+views convert compacted columns back to their original data types when they are
+read, so components never see them. This module provides the rules used to pick
+those data types and to bring later updates into them.
+
+"""
+from __future__ import annotations
+
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+
+Dtype = Union[np.dtype[Any], pd.CategoricalDtype]
+
+CATEGORICAL_MAX_UNIQUE_FRACTION = 0.5
+"""The largest fraction of distinct values a string column can have to become categorical."""
+
+_INTEGER_DTYPES: list[np.dtype[np.signedinteger[Any]]] = [
+    np.dtype(np.int8),
+    np.dtype(np.int16),
+    np.dtype(np.int32),
+    np.dtype(np.int64),
+]
+
+
+def infer_compact_dtype(values: pd.Series[Any]) -> Dtype | None:
+    """Infers a more compact data type for a state table column.
+
+    Low-cardinality string columns become categorical, integer columns
+    become the narrowest integer type that holds their values, and float
+    columns holding only zeros and ones become boolean.
+
+    Parameters
+    ----------
+    values
+        The column values.
+
+    Returns
+    -------
+        The compact data type, or None if there is no more compact data type
+        that can hold the values exactly.
+    """
+    dtype = values.dtype
+    if values.empty or not isinstance(dtype, np.dtype):
+        return None
+
+    if dtype == object:
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            return None
+        unique = pd.unique(values.dropna())
+        if len(unique) > max(1, CATEGORICAL_MAX_UNIQUE_FRACTION * len(values)):
+            return None
+        return pd.CategoricalDtype(sorted(unique))
+
+    if dtype.kind == "i":
+        compact = get_integer_dtype(values.min(), values.max())
+        return compact if compact.itemsize < dtype.itemsize else None
+
+    if dtype.kind == "f" and values.isin([0, 1]).all():
+        return np.dtype(bool)
+
+    return None
+
+
+def get_integer_dtype(minimum: int, maximum: int) -> np.dtype[Any]:
+    """Gets the narrowest signed integer type that holds a range of values.
+
+    Parameters
+    ----------
+    minimum
+        The smallest value to hold.
+    maximum
+        The largest value to hold.
+
+    Returns
+    -------
+        The narrowest signed integer data type holding the values.
+    """
+    for dtype in _INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= minimum and maximum <= info.max:
+            return dtype
+    return _INTEGER_DTYPES[-1]
+
+
+def get_update_dtype(update: pd.Series[Any], compact_dtype: Dtype) -> Dtype | None:
+    """Finds a compact data type that can hold both a column and an update to it.
+
+    Parameters
+    ----------
+    update
+        The new values for the column.
+    compact_dtype
+        The current compact data type of the column.
+
+    Returns
+    -------
+        The compact data type, widened if necessary to hold the update, or
+        None if no compact data type can hold the update exactly.
+    """
+    if update.dtype == compact_dtype:
+        return compact_dtype
+
+    if isinstance(compact_dtype, pd.CategoricalDtype):
+        if isinstance(update.dtype, pd.CategoricalDtype):
+            update_values = list(update.dtype.categories)
+        elif update.dtype == object:
+            update_values = list(pd.unique(update.dropna()))
+        else:
+            return None
+        new_categories = [
+            value for value in update_values if value not in compact_dtype.categories
+        ]
+        if not new_categories:
+            return compact_dtype
+        if not all(isinstance(value, str) for value in new_categories):
+            return None
+        return pd.CategoricalDtype(list(compact_dtype.categories) + sorted(new_categories))
+
+    if compact_dtype.kind == "i":
+        if update.dtype.kind not in "iu":
+            return None
+        if update.empty:
+            return compact_dtype
+        update_dtype = get_integer_dtype(update.min(), update.max())
+        return max(compact_dtype, update_dtype, key=lambda dtype: dtype.itemsize)
+
+    if compact_dtype.kind == "b":
+        if update.dtype.kind not in "iuf" or not update.isin([0, 1]).all():
+            return None
+        return compact_dtype
+
+    return None
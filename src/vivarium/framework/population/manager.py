@@ -9,20 +9,46 @@ The manager and :ref:`builder <builder_concept>` interface for the
 """
 from __future__ import annotations
 
+import weakref
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from pathlib import Path
 from types import MethodType
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+from vivarium.framework.population.archive import PopulationArchive
+from vivarium.framework.population.dtypes import (
+    Dtype,
+    get_update_dtype,
+    infer_compact_dtype,
+)
 from vivarium.framework.population.exceptions import PopulationError
 from vivarium.framework.population.population_view import PopulationView
+from vivarium.framework.population.snapshots import (
+    PopulationDiff,
+    PopulationSnapshot,
+    SnapshotLineage,
+)
+from vivarium.framework.population.state_table import (
+    STATE_TABLE_ENGINES,
+    BufferedStateTable,
+    ColumnarStateTable,
+    DataFrameStateTable,
+    MemoryMappedStateTable,
+    StateTable,
+)
 from vivarium.manager import Interface, Manager
 from vivarium.types import ClockStepSize, ClockTime
 
 if TYPE_CHECKING:
+    from layered_config_tree import LayeredConfigTree
+
     from vivarium.framework.engine import Builder
+    from vivarium.framework.event import Event
 
 
 @dataclass
@@ -132,18 +158,108 @@ class PopulationManager(Manager):
     CONFIGURATION_DEFAULTS = {
         "population": {
             "population_size": 100,
+            # Number of simulants to create the initial population in batches of.
+            # Zero, or at least the population size, creates the initial
+            # population all at once. Populations created in several chunks are
+            # the same whatever the chunk size, but with key columns they don't
+            # share common random numbers with populations created all at once.
+            "initialization_chunk_size": 0,
+            # One of dataframe, columnar or memory_mapped. The dataframe engine
+            # copies the whole table each time simulants are added.
+            "state_table_engine": "dataframe",
+            # Directory for the files of the memory_mapped state table engine. Each
+            # state table keeps its files in a directory of its own in it, which
+            # is removed once the simulation has reported. If empty, a state_table
+            # directory under the results directory is used.
+            "state_table_directory": "",
+            # True or False. Whether to defer population updates and write
+            # them to the state table at lifecycle boundaries.
+            "buffer_updates": False,
+            # One of full, sampled or off. Sampled checks every update while the
+            # initial population is created and a fraction of them after that.
+            "validation_mode": "full",
+            # True or False. Whether to store columns in smaller data types once
+            # the initial population is created.
+            "compact_dtypes": False,
+            "compaction": {
+                # Number of time steps between compactions. Zero disables compaction.
+                "interval": 0,
+                # Directory to spill archived simulants to. Empty to archive in memory.
+                "archive_directory": "",
+            },
         },
     }
 
+    VALIDATION_MODES = ("full", "sampled", "off")
+    """Settings of the ``population.validation_mode`` configuration key."""
+    VALIDATION_SAMPLE_INTERVAL = 100
+    """How often population updates are validated in the ``sampled`` mode."""
+
     @property
     def population(self) -> pd.DataFrame:
-        """The current population state table."""
-        if self._population is None:
+        """The current population state table.
+
+        With the ``dataframe`` state table engine this is the state table itself.
+        The other engines return a new table on every access, so changes to it
+        are not written back to the population.
+        """
+        if self._state_table is None:
             raise PopulationError("Population has not been initialized.")
-        return self._population
+        return self._state_table.to_frame(copy=False)
+
+    @property
+    def _population(self) -> pd.DataFrame | None:
+        # Direct access to the underlying table as a dataframe. With the
+        # dataframe engine this is the state table itself and can be modified
+        # in place. The other engines build a copy, so changes must be written
+        # back by assigning the modified table to this property.
+        if self._state_table is None:
+            return None
+        return self._state_table.to_frame(copy=False)
+
+    @_population.setter
+    def _population(self, population: pd.DataFrame | None) -> None:
+        self._state_table = (
+            self._make_state_table(population) if population is not None else None
+        )
+        self._tracked_mask = None
+        self._tracked_index = None
+        self._row_versions = {}
+        if self._state_table is not None:
+            self.record_update(self._state_table.columns)
 
     def __init__(self) -> None:
-        self._population: pd.DataFrame | None = None
+        self._state_table_type: type[StateTable] = DataFrameStateTable
+        self._state_table_kwargs: dict[str, Any] = {}
+        self._buffer_updates = False
+        self._validation_mode = "full"
+        self._update_count = 0
+        self._compaction_interval = 0
+        self._steps_since_compaction = 0
+        self._archive = PopulationArchive()
+        self._compact_dtypes = False
+        # Maps compacted columns to their compact and original data types.
+        self._compacted_columns: dict[str, tuple[Dtype, Dtype]] = {}
+        self._dtype_compaction_report = pd.DataFrame()
+        self._state_table: StateTable | None = None
+        # Whether each row of the state table is tracked, maintained as the
+        # tracked column is written, with spare capacity for new simulants,
+        # and the index of the tracked rows.
+        self._tracked_mask: npt.NDArray[np.bool_] | None = None
+        self._tracked_index: pd.Index[int] | None = None
+        # The latest version of the state table, the version at which each
+        # column was last written and, for columns whose updated simulants
+        # have been requested and for every column while a snapshot lineage
+        # is alive, the version at which each row was last written. Row
+        # versions have spare capacity for new simulants.
+        self._version = 0
+        self._column_versions: dict[str, int] = {}
+        self._row_versions: dict[str, npt.NDArray[np.int64]] = {}
+        self._requested_columns: set[str] = set()
+        # The numbers of live snapshot lineages and of those that leave
+        # unchanged values out of diffs.
+        self._snapshot_lineages = 0
+        self._unchanged_skipping_lineages = 0
         self._initializer_components = InitializerComponentSet()
         self.creating_initial_population = False
         self.adding_simulants = False
@@ -163,8 +279,41 @@ class PopulationManager(Manager):
         self.clock = builder.time.clock()
         self.step_size = builder.time.step_size()
         self.resources = builder.resources
+        self.logger = builder.logging.get_logger(self.name)
         self._add_constraint = builder.lifecycle.add_constraint
 
+        engine = builder.configuration.population.state_table_engine
+        if engine not in STATE_TABLE_ENGINES:
+            raise PopulationError(
+                f"Unknown state table engine {engine}. "
+                f"Available engines are {list(STATE_TABLE_ENGINES)}."
+            )
+        self._state_table_type = STATE_TABLE_ENGINES[engine]
+        if issubclass(self._state_table_type, MemoryMappedStateTable):
+            self._state_table_kwargs = {
+                "directory": self._get_state_table_directory(builder.configuration)
+            }
+        self._buffer_updates = builder.configuration.population.buffer_updates
+        self._compact_dtypes = builder.configuration.population.compact_dtypes
+
+        validation_mode = builder.configuration.population.validation_mode
+        if validation_mode not in self.VALIDATION_MODES:
+            raise PopulationError(
+                f"Unknown population validation mode {validation_mode}. "
+                f"Available modes are {list(self.VALIDATION_MODES)}."
+            )
+        self._validation_mode = validation_mode
+        if builder.configuration.population.initialization_chunk_size < 0:
+            raise PopulationError(
+                "The population initialization chunk size must be zero or positive."
+            )
+        compaction = builder.configuration.population.compaction
+        self._compaction_interval = compaction.interval
+        self._archive = PopulationArchive(compaction.archive_directory)
+        builder.lifecycle.add_exit_hook(self.on_lifecycle_state_exit)
+        # Close the state table after every other component has reported.
+        builder.event.register_listener("report", self.on_report, priority=9)
+
         builder.lifecycle.add_constraint(
             self.get_view,
             allow_during=[
@@ -185,11 +334,45 @@ class PopulationManager(Manager):
         )
         self._view = self.get_view("tracked")
 
+    @staticmethod
+    def _get_state_table_directory(configuration: LayeredConfigTree) -> str:
+        directory = configuration.population.state_table_directory
+        if not directory:
+            results_directory = (
+                configuration.to_dict().get("output_data", {}).get("results_directory")
+            )
+            if results_directory:
+                directory = str(Path(results_directory) / "state_table")
+        return directory
+
     def on_initialize_simulants(self, pop_data: SimulantData) -> None:
         """Adds a ``tracked`` column to the state table for new simulants."""
         status = pd.Series(True, index=pop_data.index)
         self._view.update(status)
 
+    def on_lifecycle_state_exit(self, state: str) -> None:
+        """Maintains the state table at the end of a life cycle state.
+
+        Buffered population updates are written at the end of every state,
+        column data types are compacted (if configured) at the end of initial
+        population creation, and the state table is compacted on the
+        configured schedule at the end of each time step.
+        """
+        if isinstance(self._state_table, BufferedStateTable):
+            self._state_table.flush()
+        if state == "population_creation" and self._compact_dtypes:
+            self.compact_dtypes()
+        if state == "time_step__cleanup" and self._compaction_interval:
+            self._steps_since_compaction += 1
+            if self._steps_since_compaction >= self._compaction_interval:
+                self.compact()
+                self._steps_since_compaction = 0
+
+    def on_report(self, _: Event) -> None:
+        """Releases the storage the state table holds outside of memory."""
+        if self._state_table is not None:
+            self._state_table.close()
+
     def __repr__(self) -> str:
         return "PopulationManager()"
 
@@ -332,14 +515,18 @@ class PopulationManager(Manager):
         population_configuration = (
             population_configuration if population_configuration else {}
         )
-        if self._population is None:
+        if self._state_table is None:
             self.creating_initial_population = True
-            self._population = pd.DataFrame()
-
-        new_index = range(len(self._population) + count)
-        new_population = self._population.reindex(new_index)
-        index = new_population.index.difference(self._population.index)
-        self._population = new_population
+            self._state_table = self._make_state_table()
+
+        size = len(self._state_table)
+        index = self._state_table.add_rows(count)
+        if self._tracked_mask is not None:
+            # New simulants aren't tracked until they're initialized.
+            self._tracked_mask = self._append_rows(self._tracked_mask, size, count, False)
+        for column, row_versions in self._row_versions.items():
+            self._row_versions[column] = self._append_rows(row_versions, size, count, 0)
+        self.record_update(self._state_table.columns, index)
         self.adding_simulants = True
         for initializer in self.resources:
             initializer(
@@ -350,6 +537,255 @@ class PopulationManager(Manager):
 
         return index
 
+    def should_validate_update(self) -> bool:
+        """Whether the next population update should be checked against the state table.
+
+        In the ``full`` validation mode every update is checked. In the
+        ``sampled`` mode, updates made while creating the initial population
+        and every :attr:`VALIDATION_SAMPLE_INTERVAL`-th update after that are
+        checked. In the ``off`` mode no updates are checked.
+
+        Returns
+        -------
+            Whether to validate the update.
+        """
+        if self._validation_mode == "full":
+            return True
+        if self._validation_mode == "off":
+            return False
+        if self.creating_initial_population:
+            return True
+        validate = self._update_count % self.VALIDATION_SAMPLE_INTERVAL == 0
+        self._update_count += 1
+        return validate
+
+    def compact(self) -> None:
+        """Moves untracked simulants from the state table into the archive.
+
+        Archived simulants keep their index labels and are still included in
+        :meth:`get_population` when untracked simulants are requested, but are
+        no longer available to population views.
+        """
+        if self._state_table is None or "tracked" not in self._state_table.columns:
+            return
+        tracked = self._state_table.get_column("tracked")
+        keep = tracked.to_numpy(dtype=bool, na_value=True)
+        untracked = tracked.index[~keep]
+        if untracked.empty:
+            return
+        self._archive.add(self._state_table.get(untracked, list(self._state_table.columns)))
+        self._state_table.remove_rows(untracked)
+        self._row_versions = {
+            column: row_versions[: len(keep)][keep]
+            for column, row_versions in self._row_versions.items()
+        }
+        self._tracked_mask = None
+        self._tracked_index = None
+
+    def compact_dtypes(self) -> None:
+        """Converts state table columns to more compact data types.
+
+        Low-cardinality string columns become categorical, integer columns
+        become the narrowest integer type holding their values, and float
+        columns holding only zeros and ones become boolean. Compact data
+        types are only used to store the state table; reads convert
+        compacted columns back to their original data types (see
+        :meth:`restore_dtypes`). Later updates to a compacted column are
+        converted to its compact data type, which is widened (e.g. with new
+        categories) when an update doesn't fit. If no compact data type can
+        hold an update exactly, the column reverts to its original data type.
+
+        The bytes saved per column are logged and available from
+        :meth:`get_dtype_compaction_report`.
+        """
+        if self._state_table is None:
+            return
+        records = []
+        for column in self._state_table.columns:
+            if column in self._compacted_columns:
+                continue
+            values = self._state_table.get_column(column)
+            dtype = infer_compact_dtype(values)
+            if dtype is None:
+                continue
+            compact_values = values.astype(dtype)
+            self._state_table.add_column(column, compact_values)
+            self._compacted_columns[column] = (dtype, values.dtype)
+            records.append(
+                {
+                    "column": column,
+                    "original_dtype": str(values.dtype),
+                    "compact_dtype": str(dtype),
+                    "original_bytes": values.memory_usage(index=False, deep=True),
+                    "compact_bytes": compact_values.memory_usage(index=False, deep=True),
+                }
+            )
+        report = pd.DataFrame(
+            records,
+            columns=[
+                "column",
+                "original_dtype",
+                "compact_dtype",
+                "original_bytes",
+                "compact_bytes",
+            ],
+        )
+        report["bytes_saved"] = report["original_bytes"] - report["compact_bytes"]
+        self._dtype_compaction_report = pd.concat([self._dtype_compaction_report, report])
+        self.logger.info(
+            f"Compacted {len(report)} state table columns, saving "
+            f"{report['bytes_saved'].sum()} bytes.\n{report.to_string(index=False)}"
+        )
+
+    def get_dtype_compaction_report(self) -> pd.DataFrame:
+        """Provides the data types and bytes saved for each compacted column.
+
+        Returns
+        -------
+            A table with one row per compacted column, giving its original and
+            compact data types, its size in bytes with each, and the bytes saved.
+        """
+        return self._dtype_compaction_report.reset_index(drop=True)
+
+    def restore_dtypes(self, population: pd.DataFrame) -> pd.DataFrame:
+        """Converts compacted columns read from the state table to their original data types.
+
+        Components read and write columns with the data types they created
+        them with, so e.g. a counter can't overflow a narrowed integer type
+        and new strings can be assigned to a categorical column.
+
+        Parameters
+        ----------
+        population
+            Rows and columns read from the state table.
+
+        Returns
+        -------
+            The population, with compacted columns converted to their original
+            data types. The provided population is not modified.
+        """
+        if not self._compacted_columns:
+            return population
+        restored = {}
+        for column in population:
+            if column not in self._compacted_columns:
+                continue
+            compact_dtype, original_dtype = self._compacted_columns[column]
+            # Columns with uninitialized rows are read with missing values
+            # and keep the data type they're read with, as they do uncompacted.
+            if population[column].dtype == compact_dtype:
+                restored[column] = population[column].astype(original_dtype)
+        return population.assign(**restored) if restored else population
+
+    def coerce_update(self, population_update: pd.DataFrame) -> pd.DataFrame:
+        """Converts an update to the compact data types of the columns it updates.
+
+        Parameters
+        ----------
+        population_update
+            The update to the simulation state table.
+
+        Returns
+        -------
+            The update, with compacted columns converted to their compact data
+            types. The provided update is not modified.
+        """
+        if not self._compacted_columns:
+            return population_update
+        coerced = {}
+        for column in population_update:
+            if column not in self._compacted_columns:
+                continue
+            compact_dtype, original_dtype = self._compacted_columns[column]
+            update = population_update[column]
+            dtype = get_update_dtype(update, compact_dtype)
+            if dtype is None:
+                # Give up on compacting the column.
+                del self._compacted_columns[column]
+                self._set_column_dtype(column, original_dtype)
+                continue
+            if dtype != compact_dtype:
+                self._compacted_columns[column] = (dtype, original_dtype)
+                self._set_column_dtype(column, dtype)
+            if update.dtype != dtype:
+                coerced[column] = update.astype(dtype)
+        return population_update.assign(**coerced) if coerced else population_update
+
+    def _set_column_dtype(self, column: str, dtype: Dtype) -> None:
+        values = self._state_table.get_column(column)
+        if values.hasnans and not isinstance(dtype, pd.CategoricalDtype):
+            # New simulants are being added and the column will take on the
+            # data type of the update that initializes them.
+            return
+        self._state_table.add_column(column, values.astype(dtype))
+
+    def _make_state_table(self, population: pd.DataFrame | None = None) -> StateTable:
+        state_table = self._state_table_type(population, **self._state_table_kwargs)
+        return BufferedStateTable(state_table) if self._buffer_updates else state_table
+
+    def _get_updated_simulants(
+        self, columns: Sequence[str], since_version: int
+    ) -> pd.Index[int]:
+        if self._state_table is None:
+            return pd.Index([], dtype=int)
+        size = len(self._state_table)
+        updated = np.zeros(size, dtype=bool)
+        for column in columns:
+            row_versions = self._row_versions.get(column)
+            if row_versions is None or len(row_versions) < size:
+                row_versions = np.full(size, self.get_column_version(column), dtype=np.int64)
+                if column in self._requested_columns or self._snapshot_lineages:
+                    self._row_versions[column] = row_versions
+            updated |= row_versions[:size] > since_version
+        return self._state_table.index[updated]
+
+    def _release_snapshot_lineage(self, skip_unchanged: bool) -> None:
+        """Stops tracking writes for a snapshot lineage that is no longer alive."""
+        self._snapshot_lineages -= 1
+        self._unchanged_skipping_lineages -= skip_unchanged
+        if not self._snapshot_lineages:
+            self._row_versions = {
+                column: row_versions
+                for column, row_versions in self._row_versions.items()
+                if column in self._requested_columns
+            }
+
+    @staticmethod
+    def _append_rows(
+        values: npt.NDArray[Any], size: int, count: int, fill: Any
+    ) -> npt.NDArray[Any]:
+        """Fills the rows of a per-simulant array for simulants being added.
+
+        Like the columns of a :class:`ColumnarStateTable`, the array is
+        reallocated with spare capacity when it runs out, so only its first
+        ``size + count`` rows are meaningful.
+        """
+        if size + count > len(values):
+            capacity = max(
+                size + count,
+                ColumnarStateTable.GROWTH_FACTOR * len(values),
+                ColumnarStateTable.MINIMUM_CAPACITY,
+            )
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:size] = values[:size]
+            values = grown
+        values[size : size + count] = fill
+        return values
+
+    def get_state_table(self) -> StateTable:
+        """Provides the engine holding the population state table.
+
+        This is the read and write path used by population views, which
+        gather only the rows and columns they need from the table and write
+        updates directly to it.
+
+        Returns
+        -------
+            The population state table, or an empty table if the population
+            has not been initialized.
+        """
+        return self._state_table if self._state_table is not None else DataFrameStateTable()
+
     ###############
     # Context API #
     ###############
@@ -366,10 +802,219 @@ class PopulationManager(Manager):
         -------
             A copy of the population table.
         """
-        pop = self._population.copy() if self._population is not None else pd.DataFrame()
-        if not untracked and "tracked" in pop.columns:
-            pop = pop[pop.tracked]
-        return pop
+        if self._state_table is None:
+            return pd.DataFrame()
+        if not untracked and "tracked" in self._state_table.columns:
+            # Gather the tracked simulants rather than copying and filtering
+            # the whole table.
+            return self.restore_dtypes(
+                self._state_table.get(
+                    self.get_tracked_index(), list(self._state_table.columns)
+                )
+            )
+        pop = self._state_table.to_frame()
+        if untracked and len(self._archive):
+            pop = pd.concat([pop, self._archive.to_frame()]).sort_index()
+        return self.restore_dtypes(pop)
+
+    def get_tracked_index(self) -> pd.Index[int]:
+        """Provides the index of the tracked simulants in the state table.
+
+        The index is maintained as the ``tracked`` column is written, so
+        repeated calls between updates to the column are constant time.
+
+        Returns
+        -------
+            The index of the tracked simulants, in state table order.
+        """
+        if self._state_table is None or "tracked" not in self._state_table.columns:
+            return pd.Index([], dtype=int)
+        if self._tracked_index is None:
+            size = len(self._state_table)
+            if self._tracked_mask is None or len(self._tracked_mask) < size:
+                tracked = self._state_table.get_column("tracked")
+                self._tracked_mask = tracked.to_numpy(dtype=bool, na_value=False)
+            self._tracked_index = self._state_table.index[self._tracked_mask[:size]]
+        return self._tracked_index
+
+    def update_tracked(self, tracked: pd.Series[bool]) -> None:
+        """Records new values written to the ``tracked`` column.
+
+        Parameters
+        ----------
+        tracked
+            The new values of the ``tracked`` column for a subset of simulants.
+        """
+        self._tracked_index = None
+        if self._tracked_mask is None or self._state_table is None:
+            # The mask is rebuilt from the state table when it's next needed.
+            return
+        positions = self._state_table.index.get_indexer(tracked.index)  # type: ignore [no-untyped-call]
+        self._tracked_mask[positions] = tracked.to_numpy(dtype=bool, na_value=False)
+
+    def record_update(
+        self,
+        columns: Sequence[str],
+        index: pd.Index[int] | None = None,
+        update: pd.DataFrame | None = None,
+    ) -> None:
+        """Records that state table columns are being written.
+
+        Parameters
+        ----------
+        columns
+            The columns being written.
+        index
+            The simulants whose values are being written. If not provided,
+            the columns are being written for all simulants.
+        update
+            The values being written, if known, which must not have been
+            written to the state table yet. While a snapshot that leaves
+            unchanged values out of diffs is alive, simulants whose values
+            are left unchanged by the update aren't recorded as updated.
+        """
+        if len(columns) == 0:
+            return
+        self._version += 1
+        positions = None
+        for column in columns:
+            self._column_versions[column] = self._version
+            if column not in self._row_versions:
+                continue
+            if index is None:
+                self._row_versions[column][:] = self._version
+                continue
+            if positions is None:
+                positions = self._state_table.index.get_indexer(index)  # type: ignore [no-untyped-call, union-attr]
+            column_positions = positions
+            if update is not None and self._unchanged_skipping_lineages:
+                column_positions = positions[self._get_changed_rows(update[column])]
+            self._row_versions[column][column_positions] = self._version
+
+    def _get_changed_rows(self, values: pd.Series[Any]) -> npt.NDArray[np.bool_]:
+        current = self._state_table.get(values.index, [values.name])[values.name]  # type: ignore [union-attr]
+        try:
+            unchanged = (current == values).to_numpy(dtype=bool, na_value=False)
+        except (TypeError, ValueError):
+            # e.g. categoricals with different categories.
+            return np.ones(len(values), dtype=bool)
+        return ~(unchanged | (current.isna() & values.isna()).to_numpy())
+
+    def get_column_version(self, columns: str | Sequence[str]) -> int:
+        """Provides the version at which state table columns were last written.
+
+        Versions are drawn from a single counter that increases every time
+        the state table is written, so versions of different columns can be
+        compared and a set of columns is unchanged for as long as its version
+        is unchanged.
+
+        Parameters
+        ----------
+        columns
+            The state table columns.
+
+        Returns
+        -------
+            The version at which any of the columns was last written, or 0 if
+            none of them has been written.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        return max((self._column_versions.get(column, 0) for column in columns), default=0)
+
+    def get_updated_simulants(
+        self, columns: str | Sequence[str], since_version: int
+    ) -> pd.Index[int]:
+        """Provides the simulants whose values in state table columns have been written.
+
+        Writes are tracked per simulant for a column from the first time this
+        is called for it. Before that, all simulants are considered written
+        whenever the column was. While a snapshot that leaves unchanged values
+        out of diffs is alive, writes that leave a simulant's value unchanged
+        aren't counted.
+
+        Parameters
+        ----------
+        columns
+            The state table columns.
+        since_version
+            A version previously returned by :meth:`get_column_version`.
+
+        Returns
+        -------
+            The index of the simulants whose values in any of the columns have
+            been written since the given version, in state table order.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        self._requested_columns.update(columns)
+        return self._get_updated_simulants(columns, since_version)
+
+    def get_snapshot(self, skip_unchanged: bool = False) -> PopulationSnapshot:
+        """Provides a copy of the state table to apply later diffs to.
+
+        Writes are tracked per simulant for every column while the snapshot,
+        or a snapshot derived from it, is alive, so diffs only hold the
+        simulants whose values were written.
+
+        Parameters
+        ----------
+        skip_unchanged
+            Whether to also leave values that are written back unchanged out
+            of diffs while the snapshot is alive. This compares each write
+            with the state table, which slows down every update.
+
+        Returns
+        -------
+            A snapshot of the full state table, tracked and untracked
+            simulants included. Archived simulants are not included.
+        """
+        lineage = SnapshotLineage()
+        self._snapshot_lineages += 1
+        self._unchanged_skipping_lineages += skip_unchanged
+        weakref.finalize(lineage, self._release_snapshot_lineage, skip_unchanged)
+
+        columns = list(self.get_state_table().columns)
+        version = self.get_column_version(columns)
+        self._get_updated_simulants(columns, version)
+        return PopulationSnapshot(version, self.get_state_table().to_frame(), lineage)
+
+    def get_diff(self, since_version: int) -> PopulationDiff:
+        """Provides the changes to the state table since a given version.
+
+        Parameters
+        ----------
+        since_version
+            The version of an earlier snapshot or diff.
+
+        Returns
+        -------
+            The values written to the state table since the given version.
+        """
+        state_table = self.get_state_table()
+        columns = list(state_table.columns)
+        updates = {}
+        for column in columns:
+            updated = self._get_updated_simulants([column], since_version)
+            if not updated.empty:
+                updates[column] = state_table.get(updated, [column])[column]
+        return PopulationDiff(
+            since_version=since_version,
+            version=self.get_column_version(columns),
+            index=state_table.index.copy(),
+            dtypes=state_table.get(state_table.index[:0], columns).dtypes,
+            updates=updates,
+        )
+
+    def get_simulant_index(self) -> pd.Index[int]:
+        """Provides the index of the simulants in the state table.
+
+        Returns
+        -------
+            The index of all simulants in the state table, tracked or not.
+            Archived simulants are not included.
+        """
+        return self._state_table.index if self._state_table is not None else pd.Index([])
 
 
 class PopulationInterface(Interface):
@@ -448,6 +1093,44 @@ class PopulationInterface(Interface):
         """
         return self._manager.get_simulant_creator()
 
+    def get_column_version(self, columns: str | Sequence[str]) -> int:
+        """Gets the version at which state table columns were last written.
+
+        Versions are drawn from a single counter that increases every time
+        the state table is written, so anything computed from a set of columns
+        remains valid for as long as their version is unchanged.
+
+        Parameters
+        ----------
+        columns
+            The state table columns.
+
+        Returns
+        -------
+            The version at which any of the columns was last written, or 0 if
+            none of them has been written.
+        """
+        return self._manager.get_column_version(columns)
+
+    def get_updated_simulants(
+        self, columns: str | Sequence[str], since_version: int
+    ) -> pd.Index[int]:
+        """Gets the simulants whose values in state table columns have been written.
+
+        Parameters
+        ----------
+        columns
+            The state table columns.
+        since_version
+            A version previously returned by :meth:`get_column_version`.
+
+        Returns
+        -------
+            The index of the simulants whose values in any of the columns have
+            been written since the given version.
+        """
+        return self._manager.get_updated_simulants(columns, since_version)
+
     def initializes_simulants(
         self,
         initializer: Callable[[SimulantData], None],
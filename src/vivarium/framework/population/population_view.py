@@ -16,9 +16,12 @@ from __future__ import annotations
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
 
 from vivarium.framework.population.exceptions import PopulationError
+from vivarium.framework.population.queries import QueryPredicate, compile_query
+from vivarium.framework.population.state_table import DataFrameStateTable, StateTable
 
 if TYPE_CHECKING:
     from vivarium.framework.population.manager import PopulationManager
@@ -70,6 +73,16 @@ class PopulationView:
     def name(self) -> str:
         return f"population_view_{self._id}"
 
+    @property
+    def query(self) -> str:
+        """The :mod:`pandas`-style filter applied any time this view is read from."""
+        return self._query
+
+    @query.setter
+    def query(self, query: str) -> None:
+        self._query = query
+        self._predicate = compile_query(query) if query else None
+
     @property
     def columns(self) -> list[str]:
         """The columns that the view can read and update.
@@ -80,7 +93,7 @@ class PopulationView:
         actually needed, like for some metrics collection applications.
         """
         if not self._columns:
-            return list(self._manager.get_population(True).columns)
+            return list(self._manager.get_state_table().columns)
         return list(self._columns)
 
     def subview(self, columns: str | Sequence[str]) -> PopulationView:
@@ -155,15 +168,10 @@ class PopulationView:
         --------
         :meth:`subview <PopulationView.subview>`
         """
-        pop = self._manager.get_population(True).loc[index]
-
-        if not index.empty:
-            if self.query:
-                pop = pop.query(self.query)
-            if query:
-                pop = pop.query(query)
+        state_table = self._manager.get_state_table()
+        columns = self.columns
 
-        non_existent_columns = set(self.columns) - set(pop.columns)
+        non_existent_columns = set(columns) - set(state_table.columns)
         if non_existent_columns:
             raise PopulationError(
                 f"Requested column(s) {non_existent_columns} not in population table. "
@@ -175,7 +183,30 @@ class PopulationView:
                 "success depends on component initialization order which may change in "
                 "different run settings."
             )
-        return pop.loc[:, self.columns]
+
+        predicates: list[QueryPredicate] = []
+        if not index.empty:
+            if self._predicate is not None:
+                predicates.append(self._predicate)
+            if query:
+                predicates.append(compile_query(query))
+
+        if predicates:
+            # Evaluate the queries on just the columns they reference and
+            # then gather the view columns for the selected rows only.
+            query_columns = self._get_query_columns(predicates, state_table.columns)
+            query_population = self._manager.restore_dtypes(
+                state_table.get(index, query_columns)
+            )
+            mask = np.ones(len(index), dtype=bool)
+            for predicate in predicates:
+                mask &= predicate(query_population)
+            index = index[mask]
+
+        # Gather only the requested rows and columns so the cost of a read
+        # scales with the size of the result rather than the size of the
+        # state table.
+        return self._manager.restore_dtypes(state_table.get(index, columns))
 
     def update(self, population_update: pd.Series[Any] | pd.DataFrame) -> None:
         """Updates the state table with the provided data.
@@ -198,26 +229,33 @@ class PopulationView:
             this view manages or if the view is being updated with a data
             type inconsistent with the original population data.
         """
-        state_table = self._manager.get_population(True)
+        state_table = self._manager.get_state_table()
         population_update = self._format_update_and_check_preconditions(
             population_update,
             state_table,
             self.columns,
             self._manager.creating_initial_population,
             self._manager.adding_simulants,
+            self._manager.should_validate_update(),
         )
+        if not self._manager.creating_initial_population:
+            population_update = self._manager.coerce_update(population_update)
         if self._manager.creating_initial_population:
-            new_columns = list(set(population_update).difference(state_table))
-            self._manager.population[new_columns] = population_update[new_columns]
+            new_columns = list(set(population_update).difference(state_table.columns))
+            for column in new_columns:
+                state_table.add_column(column, population_update[column])
+            self._manager.record_update(new_columns)
         elif not population_update.empty:
-            update_columns = list(set(population_update).intersection(state_table))
+            update_columns = list(set(population_update).intersection(state_table.columns))
+            self._manager.record_update(
+                update_columns, population_update.index, population_update
+            )
             for column in update_columns:
-                column_update = self._update_column_and_ensure_dtype(
-                    population_update[column],
-                    state_table[column],
-                    self._manager.adding_simulants,
+                state_table.update_column(
+                    column, population_update[column], self._manager.adding_simulants
                 )
-                self._manager.population[column] = column_update
+        if "tracked" in population_update:
+            self._manager.update_tracked(population_update["tracked"])
 
     def __repr__(self) -> str:
         return f"PopulationView(_id={self._id}, _columns={self.columns}, query={self.query})"
@@ -226,13 +264,36 @@ class PopulationView:
     # Helper methods #
     ##################
 
+    @staticmethod
+    def _get_query_columns(
+        predicates: list[QueryPredicate], available_columns: pd.Index[str]
+    ) -> list[str]:
+        """Finds the state table columns needed to evaluate a set of queries.
+
+        Parameters
+        ----------
+        predicates
+            The compiled queries.
+        available_columns
+            The columns in the state table.
+
+        Returns
+        -------
+            The state table columns referenced by the queries, in state table
+            order. Queries that cannot be compiled may report extra columns,
+            e.g. column names appearing inside string literals.
+        """
+        referenced = {column for predicate in predicates for column in predicate.columns}
+        return [column for column in available_columns if column in referenced]
+
     @staticmethod
     def _format_update_and_check_preconditions(
         population_update: pd.Series[Any] | pd.DataFrame,
-        state_table: pd.DataFrame,
+        state_table: pd.DataFrame | StateTable,
         view_columns: list[str],
         creating_initial_population: bool,
         adding_simulants: bool,
+        validate: bool = True,
     ) -> pd.DataFrame:
         """Standardizes the population update format and checks preconditions.
 
@@ -264,6 +325,10 @@ class PopulationView:
         the existing state table. When new simulants are added in the middle of the
         simulation, we require that only one component provide updates to a column.
 
+        Preconditions 1-4 and the restriction on adding columns are always checked.
+        The remaining checks compare the update against the data in the state table
+        and can be skipped with the ``validate`` argument.
+
         Parameters
         ----------
         population_update
@@ -276,6 +341,8 @@ class PopulationView:
             Whether the initial population is being created.
         adding_simulants
             Whether new simulants are currently being initialized.
+        validate
+            Whether to check the update against the data in the state table.
 
         Returns
         -------
@@ -293,32 +360,38 @@ class PopulationView:
 
         """
         assert not creating_initial_population or adding_simulants
+        state_table = PopulationView._as_state_table(state_table)
 
         population_update = PopulationView._coerce_to_dataframe(
             population_update,
             view_columns,
         )
 
-        unknown_simulants = len(population_update.index.difference(state_table.index))
-        if unknown_simulants:
-            raise PopulationError(
-                "Population updates must have an index that is a subset of the current "
-                f"population state table. {unknown_simulants} simulants were provided "
-                f"in an update with no matching index in the existing table."
-            )
+        if validate:
+            unknown_simulants = len(population_update.index.difference(state_table.index))
+            if unknown_simulants:
+                raise PopulationError(
+                    "Population updates must have an index that is a subset of the "
+                    f"current population state table. {unknown_simulants} simulants "
+                    f"were provided in an update with no matching index in the "
+                    f"existing table."
+                )
 
         if creating_initial_population:
-            PopulationView._ensure_coherent_initialization(population_update, state_table)
+            if validate:
+                PopulationView._ensure_coherent_initialization(population_update, state_table)
         else:
-            new_columns = list(set(population_update).difference(state_table))
+            new_columns = list(set(population_update).difference(state_table.columns))
             if new_columns:
                 raise PopulationError(
                     f"Attempting to add new columns {new_columns} to the state table "
                     f"outside the initial population creation phase."
                 )
 
-            if adding_simulants:
-                state_table_new_simulants = state_table.loc[population_update.index, :]
+            if adding_simulants and validate:
+                state_table_new_simulants = state_table.get(
+                    population_update.index, list(population_update)
+                )
                 conflicting_columns = [
                     column
                     for column in population_update
@@ -397,7 +470,7 @@ class PopulationView:
 
     @staticmethod
     def _ensure_coherent_initialization(
-        population_update: pd.DataFrame, state_table: pd.DataFrame
+        population_update: pd.DataFrame, state_table: pd.DataFrame | StateTable
     ) -> None:
         """Ensure that overlapping population updates have the same information.
 
@@ -422,21 +495,22 @@ class PopulationView:
             If the population update contains no new information or if it contains
             information in conflict with the existing state table.
         """
+        state_table = PopulationView._as_state_table(state_table)
         missing_pops = len(state_table.index.difference(population_update.index))
         if missing_pops:
             raise PopulationError(
                 f"Components should initialize the same population at the simulation start. "
                 f"A component is missing updates for {missing_pops} simulants."
             )
-        new_columns = set(population_update).difference(state_table)
-        overlapping_columns = set(population_update).intersection(state_table)
+        new_columns = set(population_update).difference(state_table.columns)
+        overlapping_columns = set(population_update).intersection(state_table.columns)
         if not new_columns:
             raise PopulationError(
                 f"A component is providing a population update for {list(population_update)} "
                 "but all provided columns are initialized by other components."
             )
         for column in overlapping_columns:
-            if not population_update[column].equals(state_table[column]):
+            if not population_update[column].equals(state_table.get_column(column)):
                 raise PopulationError(
                     "Two components are providing conflicting initialization data for the "
                     f"{column} state table column."
@@ -450,46 +524,16 @@ class PopulationView:
     ) -> pd.Series[Any]:
         """Build the updated state table column with an appropriate dtype.
 
-        Parameters
-        ----------
-        update
-            The new column values for a subset of the existing index.
-        existing
-            The existing column values for all simulants in the state table.
-        adding_simulants
-            Whether new simulants are currently being initialized.
-
-        Returns
-        -------
-            The column with the provided update applied
+        See :meth:`DataFrameStateTable._update_column_and_ensure_dtype
+        <vivarium.framework.population.state_table.DataFrameStateTable._update_column_and_ensure_dtype>`.
         """
-        # FIXME: This code does not work as described. I'm leaving it here because writing
-        #  real dtype checking code is a pain and we never seem to hit the actual edge cases.
-        #  I've also seen this error, though I don't have a reproducible and useful example.
-        #  I'm reasonably sure what's really being accounted for here is non-nullable columns
-        #  that temporarily have null values introduced in the space between rows being
-        #  added to the state table and initializers filling them with their first values.
-        #  That means the space of dtype casting issues is actually quite small. What should
-        #  actually happen in the long term is to separate the population creation entirely
-        #  from the mutation of existing state. I.e. there's not an actual reason we need
-        #  to do all these sequential operations on a single underlying dataframe during
-        #  the creation of new simulants besides the fact that it's the existing
-        #  implementation.
-        update_values = update.array.copy()
-        new_state_table_values = existing.array.copy()
-        update_index_positional = existing.index.get_indexer(update.index)  # type: ignore [no-untyped-call]
-
-        # Assumes the update index labels can be interpreted as an array position.
-        new_state_table_values[update_index_positional] = update_values
-
-        unmatched_dtypes = new_state_table_values.dtype != update_values.dtype
-        if unmatched_dtypes and not adding_simulants:
-            # This happens when the population is being grown because extending
-            # the index forces columns that don't have a natural null type
-            # to become 'object'
-            raise PopulationError(
-                "A component is corrupting the population table by modifying the dtype of "
-                f"the {update.name} column from {existing.dtype} to {update.dtype}."
-            )
-        new_state_table_values = new_state_table_values.astype(update_values.dtype)
-        return pd.Series(new_state_table_values, index=existing.index, name=existing.name)
+        return DataFrameStateTable._update_column_and_ensure_dtype(
+            update, existing, adding_simulants
+        )
+
+    @staticmethod
+    def _as_state_table(state_table: pd.DataFrame | StateTable) -> StateTable:
+        """Wraps a raw dataframe so checks can be written against the state table API."""
+        if isinstance(state_table, pd.DataFrame):
+            return DataFrameStateTable(state_table)
+        return state_table
@@ -0,0 +1,283 @@
+"""
+==================
+Population Queries
+==================
+
+Population views filter the simulants they return with :mod:`pandas`-style
+query strings. Rather than re-parsing and re-evaluating those strings with
+:meth:`pandas.DataFrame.query` on every read, queries are compiled once into
+:class:`QueryPredicate` objects that evaluate directly on the columns they
+reference and return a boolean mask of the selected simulants.
+
+Queries are compiled with :func:`compile_query`, which caches the predicates of
+the most recently used query strings, so that views with identical query strings
+usually share a single predicate. The cache is bounded because queries passed to
+:meth:`PopulationView.get <vivarium.framework.population.population_view.PopulationView.get>`
+are often built with changing values, e.g. dates or thresholds.
+
+The compiler supports the subset of the query language used to filter
+simulants: comparisons (including chained comparisons and ``in`` / ``not in``
+list membership) between columns and literals, bare boolean columns, and
+``and`` / ``or`` / ``not`` (or ``&`` / ``|`` / ``~``) combinations of these.
+Column names may be backtick-quoted. Any query outside this subset is
+evaluated with :meth:`pandas.DataFrame.eval` instead, so all queries that
+:mod:`pandas` accepts remain valid.
+
+"""
+from __future__ import annotations
+
+import ast
+import io
+import re
+import tokenize
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# Matches backtick-quoted column names and bare python identifiers in a query string.
+_QUERY_TOKEN_PATTERN = re.compile(r"`([^`]*)`|([A-Za-z_][A-Za-z0-9_]*)")
+_BACKTICK_PATTERN = re.compile(r"`([^`]*)`")
+
+QUERY_CACHE_SIZE = 1024
+"""The number of compiled queries kept for reuse."""
+
+Mask = npt.NDArray[np.bool_]
+Condition = Callable[[pd.DataFrame], Mask]
+Operand = Callable[[pd.DataFrame], Any]
+
+
+class QueryPredicate:
+    """A compiled population query.
+
+    Calling the predicate on a table containing the columns it references
+    returns a boolean mask of the rows selected by the query.
+    """
+
+    def __init__(self, query: str, columns: list[str], condition: Condition | None):
+        """
+
+        Parameters
+        ----------
+        query
+            The :mod:`pandas`-style query string the predicate was compiled from.
+        columns
+            The columns the query may reference.
+        condition
+            The compiled condition, or None if the query can only be evaluated
+            by :mod:`pandas`.
+        """
+        self.query = query
+        self.columns = columns
+        self._condition = condition
+
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the query is evaluated without :meth:`pandas.DataFrame.eval`."""
+        return self._condition is not None
+
+    def __call__(self, population: pd.DataFrame) -> Mask:
+        """Evaluates the query.
+
+        Parameters
+        ----------
+        population
+            A table containing at least the columns referenced by the query.
+
+        Returns
+        -------
+            A boolean mask with the same length as the population that is True
+            for the rows selected by the query.
+        """
+        if self._condition is not None and all(c in population for c in self.columns):
+            return self._condition(population)
+        # Let pandas resolve anything that isn't a column (or raise).
+        return _to_mask(population.eval(self.query))
+
+    def __repr__(self) -> str:
+        return f"QueryPredicate({self.query!r})"
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_query(query: str) -> QueryPredicate:
+    """Compiles a query string into a predicate.
+
+    Parameters
+    ----------
+    query
+        A :mod:`pandas`-style query string.
+
+    Returns
+    -------
+        The compiled predicate. Calls with the same query string return the
+        same predicate while it is among the :data:`QUERY_CACHE_SIZE` most
+        recently compiled.
+    """
+    try:
+        expression, column_names = _to_python_expression(query)
+        compiler = _QueryCompiler(column_names)
+        condition = compiler.compile_condition(ast.parse(expression, mode="eval").body)
+        return QueryPredicate(query, compiler.columns, condition)
+    except (_UnsupportedQuery, SyntaxError, tokenize.TokenError):
+        columns = []
+        for quoted, bare in _QUERY_TOKEN_PATTERN.findall(query):
+            column = quoted or bare
+            if column not in columns:
+                columns.append(column)
+        return QueryPredicate(query, columns, None)
+
+
+##################
+# Helper methods #
+##################
+
+
+class _UnsupportedQuery(Exception):
+    """Raised when a query uses syntax the compiler doesn't handle."""
+
+    pass
+
+
+def _to_mask(values: Any) -> Mask:
+    if isinstance(values, (pd.Series, pd.api.extensions.ExtensionArray)):
+        return cast(Mask, values.to_numpy(dtype=bool, na_value=False))
+    return np.asarray(values, dtype=np.bool_)
+
+
+def _to_python_expression(query: str) -> tuple[str, dict[str, str]]:
+    """Rewrites a query as a python expression the way :mod:`pandas` does.
+
+    Backtick-quoted column names are replaced with placeholder identifiers and
+    ``&`` and ``|`` are replaced with ``and`` and ``or`` so they bind less
+    tightly than comparisons.
+    """
+    column_names: dict[str, str] = {}
+
+    def replace_backticks(match: re.Match[str]) -> str:
+        placeholder = f"__query_column_{len(column_names)}__"
+        column_names[placeholder] = match.group(1)
+        return placeholder
+
+    expression = _BACKTICK_PATTERN.sub(replace_backticks, query)
+    tokens = []
+    for token in tokenize.generate_tokens(io.StringIO(expression).readline):
+        if token.type == tokenize.OP and token.string in ("&", "|"):
+            tokens.append((tokenize.NAME, "and" if token.string == "&" else "or"))
+        else:
+            tokens.append((token.type, token.string))
+    return tokenize.untokenize(tokens), column_names
+
+
+class _QueryCompiler:
+    """Compiles the abstract syntax tree of a query into closures."""
+
+    _COMPARISONS: dict[type[ast.cmpop], Callable[[Any, Any], Any]] = {
+        ast.Eq: lambda left, right: left == right,
+        ast.NotEq: lambda left, right: left != right,
+        ast.Lt: lambda left, right: left < right,
+        ast.LtE: lambda left, right: left <= right,
+        ast.Gt: lambda left, right: left > right,
+        ast.GtE: lambda left, right: left >= right,
+    }
+
+    def __init__(self, column_names: dict[str, str]):
+        self._column_names = column_names
+        self.columns: list[str] = []
+
+    def compile_condition(self, node: ast.expr) -> Condition:
+        if isinstance(node, ast.BoolOp):
+            conditions = [self.compile_condition(value) for value in node.values]
+            combine: Callable[[Mask, Mask], Mask] = (
+                np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            )
+
+            def boolean_operation(population: pd.DataFrame) -> Mask:
+                mask = conditions[0](population)
+                for condition in conditions[1:]:
+                    mask = combine(mask, condition(population))
+                return mask
+
+            return boolean_operation
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            operand = self.compile_condition(node.operand)
+            return lambda population: ~operand(population)
+
+        if isinstance(node, ast.Compare):
+            left = node.left
+            comparisons = []
+            for op, right in zip(node.ops, node.comparators):
+                comparisons.append(self._compile_comparison(op, left, right))
+                left = right
+            if len(comparisons) == 1:
+                return comparisons[0]
+
+            def chained_comparison(population: pd.DataFrame) -> Mask:
+                mask = comparisons[0](population)
+                for comparison in comparisons[1:]:
+                    mask = mask & comparison(population)
+                return mask
+
+            return chained_comparison
+
+        if isinstance(node, ast.Name):
+            column = self._compile_column(node)
+            return lambda population: _to_mask(column(population))
+
+        raise _UnsupportedQuery
+
+    def _compile_comparison(
+        self, op: ast.cmpop, left: ast.expr, right: ast.expr
+    ) -> Condition:
+        left_operand = self._compile_operand(left)
+        right_operand = self._compile_operand(right)
+        if not isinstance(left, ast.Name) and not isinstance(right, ast.Name):
+            raise _UnsupportedQuery
+
+        # Like pandas, comparing a column for (in)equality with a list tests membership.
+        is_list = isinstance(right, (ast.List, ast.Tuple))
+        if isinstance(op, ast.In) or (isinstance(op, ast.Eq) and is_list):
+            if not isinstance(left, ast.Name) or not is_list:
+                raise _UnsupportedQuery
+            return lambda population: _to_mask(
+                left_operand(population).isin(right_operand(population))
+            )
+        if isinstance(op, ast.NotIn) or (isinstance(op, ast.NotEq) and is_list):
+            if not isinstance(left, ast.Name) or not is_list:
+                raise _UnsupportedQuery
+            return lambda population: ~_to_mask(
+                left_operand(population).isin(right_operand(population))
+            )
+        if type(op) not in self._COMPARISONS or is_list:
+            raise _UnsupportedQuery
+
+        compare = self._COMPARISONS[type(op)]
+        return lambda population: _to_mask(
+            compare(left_operand(population), right_operand(population))
+        )
+
+    def _compile_operand(self, node: ast.expr) -> Operand:
+        if isinstance(node, ast.Name):
+            return self._compile_column(node)
+        value = self._literal_value(node)
+        return lambda population: value
+
+    def _compile_column(self, node: ast.Name) -> Operand:
+        column = self._column_names.get(node.id, node.id)
+        if column not in self.columns:
+            self.columns.append(column)
+        return lambda population: population[column]
+
+    def _literal_value(self, node: ast.expr) -> Any:
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self._literal_value(element) for element in node.elts]
+        try:
+            value = ast.literal_eval(node)
+        except ValueError:
+            raise _UnsupportedQuery
+        if isinstance(value, (list, tuple, set, dict)):
+            raise _UnsupportedQuery
+        return value
@@ -0,0 +1,114 @@
+"""
+====================
+Population Snapshots
+====================
+
+Checkpointing or recording a long simulation by copying the full
+:term:`State Table` every time step stores mostly unchanged values over and
+over. Instead, the population manager can provide a full
+:class:`PopulationSnapshot` of the state table once and then a
+:class:`PopulationDiff` holding only the values written since that snapshot
+(or since any earlier diff). Applying the diffs to the snapshot in order
+reproduces the state table at each step.
+
+Diffs are built from the versions the population manager records as the state
+table is written. The manager records writes per simulant only while a snapshot,
+or a snapshot derived from it with :meth:`PopulationSnapshot.apply`, is alive;
+otherwise a diff holds every simulant of each column that was written. Snapshots
+can also be taken to leave values that components write back unchanged out of
+diffs, which costs a comparison with the state table on each write while they
+are alive.
+
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import pandas as pd
+
+from vivarium.framework.population.exceptions import PopulationError
+
+
+@dataclass
+class PopulationDiff:
+    """The changes to the state table since a given version."""
+
+    #: The state table version the changes are relative to.
+    since_version: int
+    #: The state table version after the changes.
+    version: int
+    #: The index of the state table after the changes.
+    index: pd.Index[int]
+    #: The data types of the state table columns after the changes.
+    dtypes: pd.Series[Any]
+    #: The values written to each column since ``since_version``.
+    updates: dict[str, pd.Series[Any]]
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the changed values."""
+        return sum(
+            int(update.memory_usage(index=True, deep=True))
+            for update in self.updates.values()
+        ) + int(self.index.memory_usage(deep=True))
+
+
+class SnapshotLineage:
+    """Shared by a snapshot and every snapshot derived from it.
+
+    The population manager records writes for diffs while a lineage is alive.
+    """
+
+
+@dataclass
+class PopulationSnapshot:
+    """A copy of the state table at a given version."""
+
+    #: The state table version the copy was made at.
+    version: int
+    #: The copy of the state table.
+    population: pd.DataFrame
+    #: The lineage of the snapshot, if it was provided by a population manager.
+    lineage: SnapshotLineage | None = field(default=None, repr=False, compare=False)
+
+    def apply(self, diff: PopulationDiff) -> PopulationSnapshot:
+        """Brings the snapshot up to date with a set of changes to the state table.
+
+        Parameters
+        ----------
+        diff
+            Changes to the state table since this snapshot or an earlier
+            version.
+
+        Returns
+        -------
+            A new snapshot of the state table after the changes.
+
+        Raises
+        ------
+        PopulationError
+            If the diff is missing changes made after this snapshot.
+        """
+        if diff.since_version > self.version:
+            raise PopulationError(
+                f"Cannot apply changes since version {diff.since_version} to a "
+                f"population snapshot of version {self.version}."
+            )
+        columns = {}
+        for column, dtype in diff.dtypes.items():
+            update = diff.updates.get(cast(str, column))
+            if column in self.population:
+                values = self.population[column]
+                if update is not None and not update.empty:
+                    unchanged = values[~values.index.isin(update.index)]
+                    if unchanged.dtype != update.dtype:
+                        # Let the final cast settle e.g. differing categories.
+                        unchanged, update = unchanged.astype(object), update.astype(object)
+                    values = pd.concat([unchanged, update])
+            else:
+                values = update if update is not None else pd.Series(dtype=dtype)
+            columns[column] = values.reindex(diff.index).astype(dtype)
+        return PopulationSnapshot(
+            diff.version, pd.DataFrame(columns, index=diff.index), self.lineage
+        )
@@ -0,0 +1,738 @@
+"""
+===================
+State Table Engines
+===================
+
+The population manager keeps the simulation :term:`State Table` in a state table
+engine. The engine owns the underlying data and provides the small set of row and
+column operations that population views need to read and update simulant state.
+
+Three engines are provided:
+
+    1. :class:`DataFrameStateTable` holds the state table in a single
+       :class:`pandas.DataFrame`. This is the default engine and the reference
+       implementation other engines are tested against. Adding rows reindexes
+       the whole frame, so adding simulants in many small batches costs time
+       quadratic in the population size.
+    2. :class:`ColumnarStateTable` holds one contiguous array per column with
+       spare capacity, and tracks only the recently added rows that haven't
+       been initialized yet. Updates are scattered into the column arrays in
+       place and adding rows takes time proportional to the rows added.
+    3. :class:`MemoryMappedStateTable` is a columnar state table whose
+       fixed-width columns are held in memory-mapped files, so the state table
+       can be larger than the available memory.
+
+The engine used in a simulation is selected with the
+``population.state_table_engine`` configuration key.
+
+Either engine can be wrapped in a :class:`BufferedStateTable`, which defers
+updates to existing columns and applies them in a single batch per column when
+the simulation moves to its next life cycle state. Buffering is enabled with the
+``population.buffer_updates`` configuration key.
+
+"""
+from __future__ import annotations
+
+import contextlib
+import shutil
+import tempfile
+import weakref
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pandas.api.extensions import ExtensionArray
+
+from vivarium.framework.population.exceptions import PopulationError
+
+ColumnArray = Union[npt.NDArray[Any], ExtensionArray]
+
+
+class StateTable(ABC):
+    """Storage for the simulation state table.
+
+    Rows of the state table represent simulants and are labelled by the
+    simulant index. Columns represent simulant attributes.
+    """
+
+    @property
+    @abstractmethod
+    def index(self) -> pd.Index[int]:
+        """The simulant index of the state table."""
+        pass
+
+    @property
+    @abstractmethod
+    def columns(self) -> pd.Index[str]:
+        """The columns of the state table."""
+        pass
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @abstractmethod
+    def get(self, index: pd.Index[int], columns: list[str]) -> pd.DataFrame:
+        """Gathers the requested rows and columns into a new table.
+
+        Parameters
+        ----------
+        index
+            The simulants to gather.
+        columns
+            The columns to gather.
+
+        Returns
+        -------
+            A new table with the requested rows and columns. Rows that have
+            been created but not yet initialized are null.
+
+        Raises
+        ------
+        KeyError
+            If any simulant in the index is not in the state table.
+        """
+        pass
+
+    @abstractmethod
+    def get_column(self, column: str) -> pd.Series[Any]:
+        """Provides a full column of the state table.
+
+        The returned series may share data with the state table and must not
+        be modified.
+
+        Parameters
+        ----------
+        column
+            The column to get.
+
+        Returns
+        -------
+            The column values for every simulant in the state table.
+        """
+        pass
+
+    @abstractmethod
+    def add_column(self, column: str, values: pd.Series[Any]) -> None:
+        """Adds a new column to the state table.
+
+        If the column already exists, it is replaced.
+
+        Parameters
+        ----------
+        column
+            The name of the new column.
+        values
+            The values of the new column, indexed by simulant.
+        """
+        pass
+
+    @abstractmethod
+    def update_column(
+        self, column: str, update: pd.Series[Any], adding_simulants: bool
+    ) -> None:
+        """Writes new values for a subset of simulants to an existing column.
+
+        Parameters
+        ----------
+        column
+            The column to update.
+        update
+            The new column values for a subset of the state table index.
+        adding_simulants
+            Whether new simulants are currently being initialized.
+
+        Raises
+        ------
+        PopulationError
+            If the update would change the dtype of the column outside of
+            simulant initialization.
+        """
+        pass
+
+    @abstractmethod
+    def add_rows(self, count: int) -> pd.Index[int]:
+        """Adds uninitialized rows to the end of the state table.
+
+        New rows are labelled with consecutive integers starting after the
+        largest label the state table has ever held, so labels of removed
+        rows are never reused.
+
+        Parameters
+        ----------
+        count
+            The number of rows to add.
+
+        Returns
+        -------
+            The index of the new rows.
+        """
+        pass
+
+    @abstractmethod
+    def remove_rows(self, index: pd.Index[int]) -> None:
+        """Removes rows from the state table.
+
+        The labels of the remaining rows are unchanged.
+
+        Parameters
+        ----------
+        index
+            The simulants to remove.
+        """
+        pass
+
+    @abstractmethod
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        """Provides the full state table as a :class:`pandas.DataFrame`.
+
+        Parameters
+        ----------
+        copy
+            Whether the returned table must be a copy. If False, the returned
+            table may share data with the state table, in which case it must
+            not be modified. Only the dataframe engine shares its table; the
+            other engines always assemble a new one, so modifying it never
+            changes the state table.
+
+        Returns
+        -------
+            The full state table.
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases any storage the state table holds outside of memory.
+
+        The state table must not be used after it is closed.
+        """
+        pass
+
+    @staticmethod
+    def _get_dtype_error(update: pd.Series[Any], existing_dtype: Any) -> PopulationError:
+        return PopulationError(
+            "A component is corrupting the population table by modifying the dtype of "
+            f"the {update.name} column from {existing_dtype} to {update.dtype}."
+        )
+
+    @staticmethod
+    def _get_next_label(index: pd.Index[int]) -> int:
+        return int(index.max()) + 1 if len(index) else 0
+
+
+class DataFrameStateTable(StateTable):
+    """A state table held in a single :class:`pandas.DataFrame`.
+
+    Adding rows reindexes the frame, which copies every column.
+    """
+
+    def __init__(self, data: pd.DataFrame | None = None):
+        self._data = data if data is not None else pd.DataFrame()
+        self._next_label = self._get_next_label(self._data.index)
+
+    @property
+    def index(self) -> pd.Index[int]:
+        return self._data.index
+
+    @property
+    def columns(self) -> pd.Index[str]:
+        return self._data.columns
+
+    def get(self, index: pd.Index[int], columns: list[str]) -> pd.DataFrame:
+        return self._data.loc[index, columns]
+
+    def get_column(self, column: str) -> pd.Series[Any]:
+        return self._data[column]
+
+    def add_column(self, column: str, values: pd.Series[Any]) -> None:
+        self._data[column] = values
+
+    def update_column(
+        self, column: str, update: pd.Series[Any], adding_simulants: bool
+    ) -> None:
+        self._data[column] = self._update_column_and_ensure_dtype(
+            update, self._data[column], adding_simulants
+        )
+
+    def add_rows(self, count: int) -> pd.Index[int]:
+        index = pd.RangeIndex(self._next_label, self._next_label + count)
+        if len(self._data.index) == self._next_label:
+            # The usual case of a table that has never had rows removed.
+            new_index: pd.Index[int] = pd.RangeIndex(self._next_label + count)
+        else:
+            new_index = self._data.index.append(index)  # type: ignore [no-untyped-call]
+        self._data = self._data.reindex(new_index)
+        self._next_label += count
+        return index
+
+    def remove_rows(self, index: pd.Index[int]) -> None:
+        self._data = self._data.drop(index)
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        return self._data.copy() if copy else self._data
+
+    @staticmethod
+    def _update_column_and_ensure_dtype(
+        update: pd.Series[Any],
+        existing: pd.Series[Any],
+        adding_simulants: bool,
+    ) -> pd.Series[Any]:
+        """Build the updated state table column with an appropriate dtype.
+
+        Parameters
+        ----------
+        update
+            The new column values for a subset of the existing index.
+        existing
+            The existing column values for all simulants in the state table.
+        adding_simulants
+            Whether new simulants are currently being initialized.
+
+        Returns
+        -------
+            The column with the provided update applied
+        """
+        # FIXME: This code does not work as described. I'm leaving it here because writing
+        #  real dtype checking code is a pain and we never seem to hit the actual edge cases.
+        #  I've also seen this error, though I don't have a reproducible and useful example.
+        #  I'm reasonably sure what's really being accounted for here is non-nullable columns
+        #  that temporarily have null values introduced in the space between rows being
+        #  added to the state table and initializers filling them with their first values.
+        #  That means the space of dtype casting issues is actually quite small. What should
+        #  actually happen in the long term is to separate the population creation entirely
+        #  from the mutation of existing state. I.e. there's not an actual reason we need
+        #  to do all these sequential operations on a single underlying dataframe during
+        #  the creation of new simulants besides the fact that it's the existing
+        #  implementation.
+        update_values = update.array.copy()
+        new_state_table_values = existing.array.copy()
+        update_index_positional = existing.index.get_indexer(update.index)  # type: ignore [no-untyped-call]
+
+        # Assumes the update index labels can be interpreted as an array position.
+        new_state_table_values[update_index_positional] = update_values
+
+        unmatched_dtypes = new_state_table_values.dtype != update_values.dtype
+        if unmatched_dtypes and not adding_simulants:
+            # This happens when the population is being grown because extending
+            # the index forces columns that don't have a natural null type
+            # to become 'object'
+            raise StateTable._get_dtype_error(update, existing.dtype)
+        new_state_table_values = new_state_table_values.astype(update_values.dtype)
+        return pd.Series(new_state_table_values, index=existing.index, name=existing.name)
+
+
+class ColumnarStateTable(StateTable):
+    """A state table held as one contiguous array per column.
+
+    Numpy dtypes are stored in :class:`numpy.ndarray` objects and pandas
+    extension dtypes (e.g. categoricals) in their extension arrays. Rows added
+    to the table are tracked per column until they are written, so adding rows
+    never changes the dtype of a column. Reads gather the requested rows from
+    each column and present rows that have not been written yet as nulls,
+    exactly as the :class:`DataFrameStateTable` does.
+
+    Column arrays are allocated with spare capacity beyond the rows in the
+    table. When rows are added and the capacity is exhausted, the capacity
+    grows geometrically so that adding simulants has an amortized cost
+    proportional to the number of simulants added rather than the size of
+    the table. Only the live prefix of each array is ever exposed.
+    """
+
+    GROWTH_FACTOR = 2
+    """The factor by which the capacity of the column arrays grows when full."""
+    MINIMUM_CAPACITY = 1024
+    """The smallest capacity allocated when the column arrays grow."""
+
+    def __init__(self, data: pd.DataFrame | None = None):
+        self._index: pd.Index[int] = pd.RangeIndex(0)
+        self._capacity = 0
+        self._data: dict[str, ColumnArray] = {}
+        # For columns with uninitialized rows, the position of the first of
+        # them and which rows from there on have been written. Rows are only
+        # ever added at the end, so this covers just the most recently added
+        # rows rather than the whole column.
+        self._uninitialized: dict[str, tuple[int, npt.NDArray[np.bool_]]] = {}
+        if data is not None:
+            self._index = data.index
+            self._capacity = len(data.index)
+            columns: list[str] = list(data.columns)
+            for column in columns:
+                self._store(
+                    column, self._reserve(self._to_array(data[column]), self._capacity)
+                )
+        self._next_label = self._get_next_label(self._index)
+
+    @property
+    def index(self) -> pd.Index[int]:
+        return self._index
+
+    @property
+    def columns(self) -> pd.Index[str]:
+        return pd.Index(list(self._data), dtype=object)
+
+    @property
+    def capacity(self) -> int:
+        """The number of rows the column arrays can hold without growing."""
+        return self._capacity
+
+    def get(self, index: pd.Index[int], columns: list[str]) -> pd.DataFrame:
+        positions = self._get_positions(index)
+        return pd.DataFrame(
+            {column: self._take(column, positions) for column in columns},
+            index=index,
+            columns=columns,
+        )
+
+    def get_column(self, column: str) -> pd.Series[Any]:
+        data = self._data[column][: len(self._index)]
+        if isinstance(data, np.ndarray):
+            # Present subclasses (e.g. memory maps) as plain arrays.
+            data = data.view(np.ndarray)
+        values = pd.Series(data, index=self._index, name=column, copy=False)
+        if column in self._uninitialized:
+            start, written = self._uninitialized[column]
+            valid = np.ones(len(self._index), dtype=bool)
+            valid[start:] = written
+            values = values.where(valid)
+        return values
+
+    def add_column(self, column: str, values: pd.Series[Any]) -> None:
+        if not values.index.equals(self._index):
+            values = values.reindex(self._index)
+        self._store(column, self._reserve(self._to_array(values), self._capacity))
+        self._uninitialized.pop(column, None)
+
+    def update_column(
+        self, column: str, update: pd.Series[Any], adding_simulants: bool
+    ) -> None:
+        positions = self._get_positions(update.index)
+        values = self._data[column]
+        if values.dtype != update.dtype:
+            if not adding_simulants:
+                raise self._get_dtype_error(update, values.dtype)
+            # Fall back to the reference semantics and let the column
+            # take on the dtype of the update.
+            new_values = DataFrameStateTable._update_column_and_ensure_dtype(
+                update, self.get_column(column), adding_simulants
+            )
+            self._store(column, self._reserve(self._to_array(new_values), self._capacity))
+        else:
+            values[positions] = update.array
+
+        if column in self._uninitialized:
+            start, written = self._uninitialized[column]
+            written[positions[positions >= start] - start] = True
+            first_unwritten = int(np.argmin(written))
+            if written[first_unwritten]:
+                del self._uninitialized[column]
+            elif first_unwritten:
+                self._uninitialized[column] = (
+                    start + first_unwritten,
+                    written[first_unwritten:],
+                )
+
+    def add_rows(self, count: int) -> pd.Index[int]:
+        start = len(self._index)
+        index = pd.RangeIndex(self._next_label, self._next_label + count)
+        if self._has_positional_index() and start == self._next_label:
+            self._index = pd.RangeIndex(0, start + count)
+        else:
+            self._index = self._index.append(index)  # type: ignore [no-untyped-call]
+        self._next_label += count
+
+        if start + count > self._capacity:
+            self._grow(start + count)
+        for column in self._data:
+            if column in self._uninitialized:
+                first, written = self._uninitialized[column]
+                written = np.concatenate([written, np.zeros(count, dtype=bool)])
+                self._uninitialized[column] = (first, written)
+            else:
+                self._uninitialized[column] = (start, np.zeros(count, dtype=bool))
+        return index
+
+    def remove_rows(self, index: pd.Index[int]) -> None:
+        size = len(self._index)
+        keep = np.ones(size, dtype=bool)
+        keep[self._get_positions(index)] = False
+        new_size = int(keep.sum())
+        # Compact the remaining rows to the front of the existing arrays.
+        for values in self._data.values():
+            values[:new_size] = values[:size][keep]
+        for column, (start, written) in self._uninitialized.items():
+            self._uninitialized[column] = (
+                int(keep[:start].sum()),
+                written[keep[start:]],
+            )
+        self._index = self._index[keep]
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        # The columns are always copied into a new table, whatever ``copy`` is.
+        return pd.DataFrame(
+            {column: self.get_column(column) for column in self._data},
+            index=self._index,
+            columns=self.columns,
+        )
+
+    ##################
+    # Helper methods #
+    ##################
+
+    def _grow(self, size: int) -> None:
+        """Grows the capacity of the column arrays to hold at least ``size`` rows."""
+        capacity = max(size, self.GROWTH_FACTOR * self._capacity, self.MINIMUM_CAPACITY)
+        for column, values in list(self._data.items()):
+            self._store(column, self._reserve(values, capacity))
+        self._capacity = capacity
+
+    def _has_positional_index(self) -> bool:
+        """Whether simulant index labels are the positions of rows in the arrays."""
+        return (
+            isinstance(self._index, pd.RangeIndex)
+            and self._index.start == 0
+            and self._index.step == 1
+        )
+
+    def _get_positions(self, index: pd.Index[int]) -> npt.NDArray[np.intp]:
+        """Converts simulant index labels into array positions."""
+        if self._has_positional_index():
+            positions = np.asarray(index, dtype=np.intp)
+            missing = (positions < 0) | (positions >= len(self._index))
+        else:
+            positions = self._index.get_indexer(index)  # type: ignore [no-untyped-call]
+            missing = positions < 0
+        if missing.any():
+            raise KeyError(f"{list(index[missing])} not in index")
+        return positions
+
+    def _take(self, column: str, positions: npt.NDArray[np.intp]) -> ColumnArray:
+        """Gathers values from a column, presenting uninitialized rows as nulls."""
+        values = self._data[column].take(positions)
+        if column in self._uninitialized:
+            start, written = self._uninitialized[column]
+            valid = np.ones(len(positions), dtype=bool)
+            recent = positions >= start
+            valid[recent] = written[positions[recent] - start]
+            if not valid.all():
+                return pd.Series(values).where(valid).array
+        return values
+
+    def _store(self, column: str, values: ColumnArray) -> None:
+        """Sets the array holding a column."""
+        self._data[column] = values
+
+    @staticmethod
+    def _to_array(values: pd.Series[Any]) -> ColumnArray:
+        """Copies a series into the array type used to store it."""
+        if isinstance(values.dtype, np.dtype):
+            return values.to_numpy(copy=True)
+        return values.array.copy()
+
+    def _reserve(self, values: ColumnArray, capacity: int) -> ColumnArray:
+        """Extends a column array with placeholder values up to the given capacity."""
+        count = capacity - len(values)
+        if count <= 0:
+            return values
+        if isinstance(values, np.ndarray):
+            return np.concatenate([values, np.zeros(count, dtype=values.dtype)])
+        placeholder = values.take(np.full(count, -1), allow_fill=True)
+        # _concat_same_type is missing from the pandas stubs.
+        return type(values)._concat_same_type([values, placeholder])  # type: ignore [attr-defined]
+
+
+class MemoryMappedStateTable(ColumnarStateTable):
+    """A columnar state table with its columns held in memory-mapped files.
+
+    Columns with fixed-width numpy dtypes (booleans, numbers, datetimes and
+    timedeltas) are stored in :class:`numpy.memmap` arrays backed by files in
+    a directory of the state table's own on disk, so the operating system can
+    page them in and out of memory as they are used. Views read only the rows they request through the
+    mapping. Columns with other dtypes (e.g. strings and categoricals) are
+    held in memory as in the :class:`ColumnarStateTable`.
+    """
+
+    MAPPED_DTYPE_KINDS = "biufcmM"
+    """The numpy dtype kinds of the columns that are memory-mapped."""
+
+    def __init__(self, data: pd.DataFrame | None = None, directory: str | Path | None = None):
+        """
+
+        Parameters
+        ----------
+        data
+            The initial state table.
+        directory
+            The directory to create the state table's own directory of
+            memory-mapped column files in. If not provided, the system's
+            temporary directory is used. The state table's directory is
+            removed when the state table is closed or deleted.
+        """
+        if directory:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        self._directory = Path(
+            tempfile.mkdtemp(prefix="vivarium_state_table_", dir=directory or None)
+        )
+        self._remove_directory = weakref.finalize(
+            self, shutil.rmtree, self._directory, ignore_errors=True
+        )
+        self._file_count = 0
+        super().__init__(data)
+
+    @property
+    def directory(self) -> Path:
+        """The directory holding the memory-mapped column files."""
+        return self._directory
+
+    def close(self) -> None:
+        """Removes the directory holding the memory-mapped column files.
+
+        The state table must not be used after it is closed.
+        """
+        self._remove_directory()
+
+    ##################
+    # Helper methods #
+    ##################
+
+    def _store(self, column: str, values: ColumnArray) -> None:
+        replaced = self._data.get(column)
+        super()._store(column, values)
+        if isinstance(replaced, np.memmap) and replaced is not values:
+            path = replaced.filename
+            del replaced
+            if path is None:
+                return
+            # Readers may still hold a reference to the mapping, in which case
+            # some platforms won't let the file be removed yet.
+            with contextlib.suppress(OSError):
+                Path(path).unlink()
+
+    def _reserve(self, values: ColumnArray, capacity: int) -> ColumnArray:
+        if (
+            not isinstance(values, np.ndarray)
+            or values.dtype.kind not in self.MAPPED_DTYPE_KINDS
+            or capacity == 0
+        ):
+            return super()._reserve(values, capacity)
+        if isinstance(values, np.memmap) and len(values) >= capacity:
+            return values
+
+        path = self._directory / f"column_{self._file_count}.dat"
+        self._file_count += 1
+        mapped = np.memmap(path, dtype=values.dtype, mode="w+", shape=(capacity,))
+        mapped[: len(values)] = values
+        return mapped
+
+
+class BufferedStateTable(StateTable):
+    """A state table that defers updates to existing columns.
+
+    Updates made outside simulant initialization are validated and recorded
+    per column rather than written to the wrapped state table. Reads overlay
+    the pending updates on the wrapped state table so every reader sees its
+    own (and every other) write immediately. Calling :meth:`flush` applies
+    all pending updates to a column with a single write, with later updates
+    to a simulant taking precedence over earlier ones.
+    """
+
+    def __init__(self, state_table: StateTable):
+        self._state_table = state_table
+        self._pending: defaultdict[str, list[pd.Series[Any]]] = defaultdict(list)
+
+    @property
+    def state_table(self) -> StateTable:
+        """The wrapped state table."""
+        return self._state_table
+
+    @property
+    def index(self) -> pd.Index[int]:
+        return self._state_table.index
+
+    @property
+    def columns(self) -> pd.Index[str]:
+        return self._state_table.columns
+
+    @property
+    def has_pending_updates(self) -> bool:
+        """Whether there are updates that haven't been written to the state table."""
+        return bool(self._pending)
+
+    def get(self, index: pd.Index[int], columns: list[str]) -> pd.DataFrame:
+        population = self._state_table.get(index, columns)
+        for column in columns:
+            if column in self._pending:
+                pending = self._get_pending(column)
+                pending = pending[pending.index.isin(index)]
+                if not pending.empty:
+                    population.loc[pending.index, column] = pending
+        return population
+
+    def get_column(self, column: str) -> pd.Series[Any]:
+        self._flush_column(column)
+        return self._state_table.get_column(column)
+
+    def add_column(self, column: str, values: pd.Series[Any]) -> None:
+        self._pending.pop(column, None)
+        self._state_table.add_column(column, values)
+
+    def update_column(
+        self, column: str, update: pd.Series[Any], adding_simulants: bool
+    ) -> None:
+        if adding_simulants:
+            self._flush_column(column)
+            self._state_table.update_column(column, update, adding_simulants)
+            return
+        existing_dtype = self._state_table.get_column(column).dtype
+        if update.dtype != existing_dtype:
+            raise self._get_dtype_error(update, existing_dtype)
+        # Copy so later changes to the caller's data can't leak into the table.
+        self._pending[column].append(update.copy())
+
+    def add_rows(self, count: int) -> pd.Index[int]:
+        self.flush()
+        return self._state_table.add_rows(count)
+
+    def remove_rows(self, index: pd.Index[int]) -> None:
+        self.flush()
+        self._state_table.remove_rows(index)
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        self.flush()
+        return self._state_table.to_frame(copy)
+
+    def close(self) -> None:
+        self._state_table.close()
+
+    def flush(self) -> None:
+        """Writes all pending updates to the wrapped state table."""
+        for column in list(self._pending):
+            self._flush_column(column)
+
+    ##################
+    # Helper methods #
+    ##################
+
+    def _get_pending(self, column: str) -> pd.Series[Any]:
+        """Combines the pending updates to a column, keeping the latest value per simulant."""
+        updates = self._pending[column]
+        if len(updates) > 1:
+            combined = pd.concat(updates)
+            combined = combined[~combined.index.duplicated(keep="last")]
+            self._pending[column] = [combined]
+        return self._pending[column][0]
+
+    def _flush_column(self, column: str) -> None:
+        if column in self._pending:
+            update = self._get_pending(column)
+            del self._pending[column]
+            self._state_table.update_column(column, update, adding_simulants=False)
+
+
+STATE_TABLE_ENGINES: dict[str, type[StateTable]] = {
+    "dataframe": DataFrameStateTable,
+    "columnar": ColumnarStateTable,
+    "memory_mapped": MemoryMappedStateTable,
+}
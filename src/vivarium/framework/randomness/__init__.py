@@ -28,4 +28,11 @@ For more information, see the Common Random Numbers
 
 from vivarium.framework.randomness.exceptions import RandomnessError
 from vivarium.framework.randomness.manager import RandomnessInterface, RandomnessManager
-from vivarium.framework.randomness.stream import RESIDUAL_CHOICE, RandomnessStream, get_hash
+from vivarium.framework.randomness.stream import (
+    RESIDUAL_CHOICE,
+    CounterBasedRandomnessStream,
+    GeneratorRandomnessStream,
+    RandomnessStream,
+    get_hash,
+)
+from vivarium.framework.randomness.tabulation import TabulatedPPF
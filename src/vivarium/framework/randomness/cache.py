@@ -0,0 +1,113 @@
+"""
+=====================
+Randomness Draw Cache
+=====================
+
+A :class:`RandomnessStream <vivarium.framework.randomness.stream.RandomnessStream>`
+generates a block of random numbers as long as the index map every time it is
+asked for draws. When several components ask for draws with the same stream
+key and additional key during a time step, e.g. when a pipeline that uses
+randomness is evaluated by both an observer and a transition, the same block
+is generated again each time. The :class:`DrawCache` keeps the most recently
+used blocks for the rest of the time step so they can be reused.
+
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from vivarium.types import ClockTime
+
+
+class DrawCache:
+    """A bounded cache of blocks of random numbers that is cleared every time step.
+
+    Blocks are keyed by the seed they were generated from, as the seed
+    determines the block completely.
+
+    Attributes
+    ----------
+    max_size
+        The maximum number of blocks to keep. When the cache is full, the
+        least recently used block is dropped.
+    hits
+        The number of lookups that found a block.
+    misses
+        The number of lookups that did not find a block.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], ClockTime]):
+        self.max_size = max_size
+        self._clock = clock
+        self._time: ClockTime | None = None
+        self._blocks: OrderedDict[int, npt.NDArray[np.float64]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def lookups(self) -> int:
+        """The number of lookups made."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found a block, or NaN if none were made."""
+        return self.hits / self.lookups if self.lookups else np.nan
+
+    def get(self, seed: int) -> npt.NDArray[np.float64] | None:
+        """Gets the block of random numbers generated from a seed during this time step.
+
+        Parameters
+        ----------
+        seed
+            The seed the block was generated from.
+
+        Returns
+        -------
+            The block of random numbers, or None if it isn't in the cache.
+        """
+        self._evict_if_stale()
+        block = self._blocks.get(seed)
+        if block is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._blocks.move_to_end(seed)
+        return block
+
+    def put(self, seed: int, block: npt.NDArray[np.float64]) -> None:
+        """Adds a block of random numbers to the cache.
+
+        Parameters
+        ----------
+        seed
+            The seed the block was generated from.
+        block
+            The block of random numbers. It is made read-only, as it will be
+            shared by everyone who asks for it.
+        """
+        if self.max_size <= 0:
+            return
+        self._evict_if_stale()
+        block.flags.writeable = False
+        self._blocks[seed] = block
+        self._blocks.move_to_end(seed)
+        while len(self._blocks) > self.max_size:
+            self._blocks.popitem(last=False)
+
+    def _evict_if_stale(self) -> None:
+        """Drops every block if the clock has advanced since they were generated."""
+        time = self._clock()
+        if time != self._time:
+            self._blocks.clear()
+            self._time = time
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __repr__(self) -> str:
+        return f"DrawCache(max_size={self.max_size}, size={len(self)})"
@@ -16,6 +16,7 @@ from datetime import datetime
 from typing import Any
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import pandas.api.types as pdt
 
@@ -27,17 +28,69 @@ class IndexMap:
 
     SIM_INDEX_COLUMN = "simulant_index"
     TEN_DIGIT_MODULUS = 10_000_000_000
-
-    def __init__(self, key_columns: list[str] | None = None, size: int = 1_000_000):
+    _UNCLAIMED = np.iinfo(np.int32).max
+    _PRIME_POWERS = [
+        np.power(p, np.arange(10, dtype=np.int64))
+        for p in [2, 3, 5, 7, 11, 13, 17, 19, 23, 27]
+    ]
+    """Each of the primes used in hashing raised to the powers 0 through 9, so that
+    raising a prime to the power of a digit is a lookup."""
+
+    def __init__(
+        self,
+        key_columns: list[str] | None = None,
+        size: int = 1_000_000,
+        place_in_order: bool = False,
+    ):
         self._use_crn = bool(key_columns)
         self._key_columns = key_columns if key_columns else []
-        self._map: pd.Series[int] | None = None
-        """The mapping between the key columns and the randomness index."""
+        self._map_chunks: list[pd.Series[int]] = []
+        """The mappings between the key columns and the randomness index added by each
+        update, which are combined when the full mapping is needed."""
+        self._key_hashes: list[npt.NDArray[np.int64]] = []
+        """The unreduced hashes of the keys in the map, used to find new keys that may
+        already be in the map without comparing them against every key. They are kept
+        in sorted runs, each more than twice as long as the next, so that adding keys
+        takes amortized logarithmic time per key and there are few runs to search."""
+        self._claims = np.zeros(0, dtype=np.int32)
+        """For each randomness index, -1 if a key in the map uses it and
+        ``_UNCLAIMED`` otherwise. While new keys are placed, it holds the
+        earliest new key trying to use it."""
+        self._positions = np.empty(0, dtype=np.int64)
+        """The randomness index of each simulant, indexed by simulant index, or -1 for
+        simulant indices that aren't in the map."""
         self._size = size
+        self._place_in_order = place_in_order
+        """Whether collisions are resolved one key at a time, so that the position of
+        a key doesn't depend on how keys are batched into updates. Otherwise,
+        collided keys are re-hashed together in rounds."""
+        self.crn_attribute_offset = 0
+        """The position in a stream of random numbers of the first simulant whose CRN
+        attributes are being drawn, which is nonzero while the initial population is
+        created in chunks."""
+
+    @property
+    def _map(self) -> pd.Series[int] | None:
+        """The mapping between the key columns and the randomness index, sorted by
+        simulant index."""
+        if not self._map_chunks:
+            return None
+        if len(self._map_chunks) > 1:
+            mapping = pd.concat(self._map_chunks)
+            if not mapping.index.get_level_values(
+                self.SIM_INDEX_COLUMN
+            ).is_monotonic_increasing:
+                mapping = mapping.sort_index(level=self.SIM_INDEX_COLUMN)
+            self._map_chunks = [mapping]
+        return self._map_chunks[0]
 
     def update(self, new_keys: pd.DataFrame, clock_time: pd.Timestamp) -> None:
         """Adds the new keys to the mapping.
 
+        Only the new keys are hashed and placed, so the cost of an update is
+        proportional to the number of new keys rather than to the size of
+        the map.
+
         Parameters
         ----------
         new_keys
@@ -50,30 +103,42 @@ class IndexMap:
         if new_keys.empty or not self._use_crn:
             return  # Nothing to do
 
-        new_mapping_index, final_mapping_index = self._parse_new_keys(new_keys)
-
-        final_keys = final_mapping_index.droplevel(self.SIM_INDEX_COLUMN)
-        if len(final_keys) != len(final_keys.unique()):
+        new_mapping_index = self._parse_new_keys(new_keys)
+        new_key_index = new_mapping_index.droplevel(self.SIM_INDEX_COLUMN)
+        key_hashes = self._hash_keys(new_key_index).to_numpy()
+        if new_key_index.has_duplicates or self._contains_any(new_key_index, key_hashes):
             raise RandomnessError("Non-unique keys in index")
 
-        final_mapping = self._build_final_mapping(new_mapping_index, clock_time)
-
-        # Tack on the simulant index to the front of the map.
-        final_mapping.index = final_mapping.index.join(final_mapping_index).reorder_levels(
-            [self.SIM_INDEX_COLUMN] + self._key_columns
-        )
-        final_mapping = final_mapping.sort_index(level=self.SIM_INDEX_COLUMN)
-        self._map = final_mapping
+        positions = self._resolve_collisions(new_key_index, key_hashes, clock_time)
+        mapping_update = pd.Series(positions, index=new_mapping_index)
+        if not new_mapping_index.get_level_values(
+            self.SIM_INDEX_COLUMN
+        ).is_monotonic_increasing:
+            mapping_update = mapping_update.sort_index(level=self.SIM_INDEX_COLUMN)
+
+        self._map_chunks.append(mapping_update)
+        self._add_key_hashes(key_hashes)
+        self._update_positions(mapping_update)
+
+    def _update_positions(self, mapping: pd.Series[int]) -> None:
+        """Adds new simulants to the dense lookup from simulant index to randomness index."""
+        simulants = mapping.index.get_level_values(self.SIM_INDEX_COLUMN).to_numpy()
+        if simulants.min() < 0:
+            raise RandomnessError("Simulant indices must be greater than or equal to zero.")
+        required_size = simulants.max() + 1
+        if required_size > len(self._positions):
+            # Grow geometrically so that adding simulants a few at a time
+            # doesn't copy the lookup on every update.
+            positions = np.full(
+                max(required_size, 2 * len(self._positions)), -1, dtype=np.int64
+            )
+            positions[: len(self._positions)] = self._positions
+            self._positions = positions
+        self._positions[simulants] = mapping.to_numpy()
 
-    def _parse_new_keys(self, new_keys: pd.DataFrame) -> tuple[pd.Index[Any], pd.Index[Any]]:
+    def _parse_new_keys(self, new_keys: pd.DataFrame) -> pd.Index[Any]:
         """Parses raw new keys into the mapping index.
 
-        This returns a tuple of the new and final mapping indices. Both are pandas
-        indices with a level for the index assigned by the population system and
-        additional levels for the key columns associated with the simulant index. The
-        new mapping index contains only the values for the new keys and the final mapping
-        combines the existing mapping and the new mapping index.
-
         Parameters
         ----------
         new_keys
@@ -82,77 +147,223 @@ class IndexMap:
 
         Returns
         -------
-            A tuple of the new mapping index and the final mapping index.
+            A pandas index with a level for the index assigned by the population
+            system and additional levels for the key columns associated with the
+            simulant index.
         """
         keys = new_keys.copy()
         keys.index.name = self.SIM_INDEX_COLUMN
-        new_mapping_index = keys.set_index(self._key_columns, append=True).index
+        return keys.set_index(self._key_columns, append=True).index
 
-        if self._map is None:
-            final_mapping_index = new_mapping_index
-        else:
-            final_mapping_index = self._map.index.append(new_mapping_index)  # type: ignore [no-untyped-call]
-        return new_mapping_index, final_mapping_index
+    def _contains_any(
+        self, new_key_index: pd.Index[Any], key_hashes: npt.NDArray[np.int64]
+    ) -> bool:
+        """Checks whether any of the new keys are already in the map.
 
-    def _build_final_mapping(
-        self, new_mapping_index: pd.Index[Any], clock_time: pd.Timestamp
-    ) -> pd.Series[int]:
-        """Builds a new mapping between key columns and the randomness index from the
-        new mapping index and the existing map.
+        Equal keys have equal hashes, so only new keys whose hash matches the
+        hash of an existing key need to be compared against the existing keys.
 
         Parameters
         ----------
-        new_mapping_index
-            An index with a level for the index assigned by the population system and
-            additional levels for the key columns associated with the simulant index.
-        clock_time
-            The simulation clock time. Used as the salt during hashing to
-            minimize inter-simulation collisions.
+        new_key_index
+            The index of new key attributes.
+        key_hashes
+            The unreduced hashes of the new keys.
 
         Returns
         -------
-            The new mapping incorporating the updates from the new mapping index and
-            resolving collisions.
+            Whether any of the new keys are already in the map.
         """
-        new_key_index = new_mapping_index.droplevel(self.SIM_INDEX_COLUMN)
-        mapping_update = self._hash(new_key_index, salt=clock_time)
-        if self._map is None:
-            current_map = mapping_update
-        else:
-            old_map = self._map.droplevel(self.SIM_INDEX_COLUMN)
-            current_map = pd.concat([old_map, mapping_update])
-
-        return self._resolve_collisions(new_key_index, current_map)
+        candidates = np.zeros(len(key_hashes), dtype=bool)
+        for run in self._key_hashes:
+            found = np.minimum(np.searchsorted(run, key_hashes), len(run) - 1)
+            candidates |= run[found] == key_hashes
+        if not candidates.any():
+            return False
+        assert self._map is not None
+        existing_keys = self._map.index.droplevel(self.SIM_INDEX_COLUMN)
+        return bool(new_key_index[candidates].isin(existing_keys).any())
+
+    def _add_key_hashes(self, key_hashes: npt.NDArray[np.int64]) -> None:
+        """Adds the hashes of new keys to the sorted runs of hashes."""
+        run = np.sort(key_hashes)
+        while self._key_hashes and len(self._key_hashes[-1]) <= 2 * len(run):
+            run = np.sort(np.concatenate([self._key_hashes.pop(), run]))
+        self._key_hashes.append(run)
 
     def _resolve_collisions(
         self,
         new_key_index: pd.Index[Any],
-        current_mapping: pd.Series[int],
-    ) -> pd.Series[int]:
-        """Resolves collisions in the new mapping by perturbing the hash.
+        key_hashes: npt.NDArray[np.int64],
+        clock_time: pd.Timestamp,
+    ) -> npt.NDArray[np.int64]:
+        """Maps new keys to unused positions, resolving collisions by perturbing the hash.
+
+        Each key is first hashed with the clock time as the salt. Keys whose
+        position is taken are hashed again with salts of 1, 2, ... until they
+        hash to an unused position. How keys that want the same position are
+        ordered depends on whether keys are placed in order.
 
         Parameters
         ----------
         new_key_index
             The index of new key attributes to hash.
-        current_mapping
-            The new mapping incorporating the updates from the new mapping index with
-            collisions unresolved.
+        key_hashes
+            The unreduced hashes of the new keys.
+        clock_time
+            The simulation clock time. Used as the salt for the first hash
+            of each key.
 
         Returns
         -------
-            The new mapping incorporating the updates from the new mapping index and
-            resolving collisions.
+            The positions of the new keys.
+
+        Raises
+        ------
+        RandomnessError
+            If a key can't be given an unused position because the map is too
+            full.
+        """
+        if not len(self._claims):
+            self._claims = np.full(len(self), self._UNCLAIMED, dtype=np.int32)
+
+        # Salting adds the same offset to the hash of every key, so keys are
+        # only hashed once.
+        positions = (key_hashes + self._get_salt_offset(new_key_index, clock_time)) % len(
+            self
+        )
+        if self._place_in_order:
+            self._resolve_in_order(new_key_index, key_hashes, positions)
+        else:
+            self._resolve_in_rounds(new_key_index, key_hashes, positions)
+        self._claims[positions] = -1
+        return positions
+
+    def _resolve_in_rounds(
+        self,
+        new_key_index: pd.Index[Any],
+        key_hashes: npt.NDArray[np.int64],
+        positions: npt.NDArray[np.int64],
+    ) -> None:
+        """Resolves collisions by re-hashing all collided keys together in rounds.
+
+        In each round, a key keeps its position if no key in the map has it
+        and no key before it in the round wants it. Every other key is
+        re-hashed with the next salt for the next round. Keys are ordered
+        as given in the first round and by their key values afterwards. A
+        key's position therefore depends on which other keys are added in the
+        same update.
+
+        Parameters
+        ----------
+        new_key_index
+            The index of new key attributes.
+        key_hashes
+            The unreduced hashes of the new keys.
+        positions
+            The positions of the new keys with the first salt, which are
+            updated in place.
         """
-        current_mapping = current_mapping.drop_duplicates()
-        collisions = new_key_index.difference(current_mapping.index)
-        salt = 1
-        while not collisions.empty:
-            mapping_update = self._hash(collisions, salt)
-            current_mapping = pd.concat([current_mapping, mapping_update]).drop_duplicates()
-            collisions = mapping_update.index.difference(current_mapping.index)
+        claims = self._claims
+        collided = np.arange(len(key_hashes))
+        placed: list[npt.NDArray[np.intp]] = []
+        salt = 0
+        while True:
+            wanted = positions[collided]
+            kept = np.zeros(len(collided), dtype=bool)
+            kept[np.unique(wanted, return_index=True)[1]] = True
+            kept &= claims[wanted] >= 0
+            claims[wanted[kept]] = -1
+            placed.append(collided[kept])
+            collided = collided[~kept]
+            if not len(collided):
+                break
+
+            if salt == 0:
+                key_order = np.asarray(new_key_index.argsort())
+                is_collided = np.zeros(len(key_hashes), dtype=bool)
+                is_collided[collided] = True
+                collided = key_order[is_collided[key_order]]
             salt += 1
-        return current_mapping
+            self._check_salt(salt)
+            offset = self._get_salt_offset(new_key_index, salt)
+            positions[collided] = (key_hashes[collided] + offset) % len(self)
+
+        if new_key_index.nlevels == 1 and salt > 0:
+            # With a single key column, the positions have always been handed
+            # out to the keys in the order the keys were placed in rather than
+            # to the keys that were placed. This is kept so that common random
+            # numbers line up with earlier simulations.
+            positions[:] = positions[np.concatenate(placed)]
+
+    def _resolve_in_order(
+        self,
+        new_key_index: pd.Index[Any],
+        key_hashes: npt.NDArray[np.int64],
+        positions: npt.NDArray[np.int64],
+    ) -> None:
+        """Resolves collisions as if keys were placed one at a time in order.
+
+        Each key takes the first of its salted positions that no key in the
+        map and no earlier key ends up with. The position of a key therefore
+        only depends on the keys before it, so adding simulants in several
+        batches maps them the same way as adding them all at once.
+
+        Parameters
+        ----------
+        new_key_index
+            The index of new key attributes.
+        key_hashes
+            The unreduced hashes of the new keys.
+        positions
+            The positions of the new keys with the first salt, which are
+            updated in place.
+        """
+        claims = self._claims
+        salt_offsets = [0]
+        salts = np.zeros(len(key_hashes), dtype=np.int64)
+
+        # Rather than placing keys one at a time, every key that has moved
+        # claims its current position and the earliest claim wins. A key that
+        # loses, or whose position is won by an earlier key that moved there,
+        # is certain to be blocked there and moves to its next salt. When no
+        # key moves, every key has the position it would have been given one
+        # at a time.
+        moving = np.arange(len(key_hashes), dtype=np.int32)
+        claimed = []
+        while len(moving):
+            moved_to = positions[moving]
+            previous = claims[moved_to]
+            np.minimum.at(claims, moved_to, moving)
+            claimed.append(moved_to)
+            winners = claims[moved_to]
+            lost = moving[winners != moving]
+            displaced = previous[
+                (previous >= 0) & (previous != self._UNCLAIMED) & (previous != winners)
+            ]
+            moving = np.union1d(lost, displaced)
+            if not len(moving):
+                break
+
+            salts[moving] += 1
+            max_salt = int(salts[moving].max())
+            self._check_salt(max_salt)
+            for salt in range(len(salt_offsets), max_salt + 1):
+                salt_offsets.append(self._get_salt_offset(new_key_index, salt))
+            offsets = np.array(salt_offsets, dtype=np.int64)
+            positions[moving] = (key_hashes[moving] + offsets[salts[moving]]) % len(self)
+
+        # Release the positions that were claimed but not kept.
+        claimed_positions = np.concatenate(claimed) if claimed else np.empty(0, np.int64)
+        claims[claimed_positions[claims[claimed_positions] >= 0]] = self._UNCLAIMED
+
+    def _check_salt(self, salt: int) -> None:
+        """Raises an error if keys have been re-hashed more times than the map has positions."""
+        if salt > len(self):
+            raise RandomnessError(
+                "Could not find unused positions for all new keys. The index map "
+                f"of size {len(self)} is too full."
+            )
 
     def _hash(self, keys: pd.Index[Any], salt: int | pd.Timestamp = 0) -> pd.Series[int]:
         """Hashes the index into an integer index in the range [0, self.stride]
@@ -171,24 +382,54 @@ class IndexMap:
             integers in the range [0, len(self)].  Duplicates may appear and
             should be dealt with by the calling code.
         """
-        key_frame = keys.to_frame()
-        new_map = pd.Series(0, index=keys)
-        salt_series = self._convert_to_ten_digit_int(pd.Series(salt, index=keys))
+        return (self._hash_keys(keys) + self._get_salt_offset(keys, salt)) % len(self)
 
-        for _i, column_name in enumerate(key_frame.columns):
-            column = self._convert_to_ten_digit_int(key_frame[column_name])
+    def _hash_keys(self, keys: pd.Index[Any]) -> pd.Series[int]:
+        """Hashes the index into 64-bit integers, before salting and reducing to the map size.
+
+        Parameters
+        ----------
+        keys
+            The new index to hash.
 
-            primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 27]
-            out = pd.Series(1, index=column.index)
-            for idx, p in enumerate(primes):
+        Returns
+        -------
+            A pandas series indexed by the given keys with the unreduced hash
+            of each key.
+        """
+        key_frame = keys.to_frame(index=False)
+        new_map = np.zeros(len(keys), dtype=np.int64)
+        out = np.empty_like(new_map)
+        digits = np.empty_like(new_map)
+        factors = np.empty_like(new_map)
+
+        for column_name in key_frame.columns:
+            # Peel off the digits of each number from the least significant
+            # up, which is equivalent to ``_digit`` for each position.
+            remaining = self._convert_to_ten_digit_int(key_frame[column_name]).to_numpy(
+                dtype=np.int64, copy=True
+            )
+            out.fill(1)
+            for powers in self._PRIME_POWERS:
+                np.divmod(remaining, 10, out=(remaining, digits))
+                # Digits are always between 0 and 9, so clipping skips the bounds check.
+                np.take(powers, digits, out=factors, mode="clip")
                 # numpy will almost always overflow here, but it is equivalent
                 # to modding out by 2**64.  Since it's much much larger than
                 # our map size the amount of additional periodicity this
                 # introduces is pretty trivial.
-                out *= np.power(p, self._digit(column, idx))
-            new_map += out + salt_series
+                np.multiply(out, factors, out=out)
+            np.add(new_map, out, out=new_map)
 
-        return new_map % len(self)
+        return pd.Series(new_map, index=keys)
+
+    def _get_salt_offset(self, keys: pd.Index[Any], salt: int | pd.Timestamp) -> int:
+        """Gets the amount a salt adds to the unreduced hash of a key.
+
+        The salt is added to the hash once per key column.
+        """
+        salt_value = self._convert_to_ten_digit_int(pd.Series(salt, index=[0])).iloc[0]
+        return int(salt_value) * keys.nlevels
 
     def _convert_to_ten_digit_int(
         self, column: pd.Series[datetime | int | float]
@@ -245,15 +486,30 @@ class IndexMap:
 
     def _shift(self, m: pd.Series[float]) -> pd.Series[int]:
         """Shifts floats so that the first 10 decimal digits are significant."""
-        out = m % 1 * self.TEN_DIGIT_MODULUS // 1
-        return out.astype("int64")
+        # Equivalent to ``m % 1 * self.TEN_DIGIT_MODULUS // 1`` but several
+        # times faster, as floor is cheaper than float mod and floor division.
+        values = m.to_numpy(dtype=np.float64)
+        out = np.floor(values)
+        np.subtract(values, out, out=out)
+        np.multiply(out, self.TEN_DIGIT_MODULUS, out=out)
+        np.floor(out, out=out)
+        return pd.Series(out.astype(np.int64), index=m.index, name=m.name)
 
     def __getitem__(self, index: pd.Index[int]) -> np.ndarray[int, Any]:
         if self._use_crn:
-            if self._map is None:
+            if not self._map_chunks:
                 raise RandomnessError("IndexMap is empty")
-            else:
-                return self._map.loc[index].to_numpy()
+            simulants = index.to_numpy()
+            if simulants.size and (
+                simulants.min() < 0 or simulants.max() >= len(self._positions)
+            ):
+                in_map = (0 <= simulants) & (simulants < len(self._positions))
+                raise KeyError(f"Simulants {list(index[~in_map])} are not in the index map.")
+            positions = self._positions[simulants]
+            if positions.min(initial=0) < 0:
+                missing = list(index[positions < 0])
+                raise KeyError(f"Simulants {missing} are not in the index map.")
+            return positions
         else:
             return index.values
 
@@ -8,9 +8,11 @@ Randomness System Manager
 
 import pandas as pd
 
+from vivarium.framework.randomness.cache import DrawCache
 from vivarium.framework.randomness.exceptions import RandomnessError
 from vivarium.framework.randomness.index_map import IndexMap
-from vivarium.framework.randomness.stream import RandomnessStream, get_hash
+from vivarium.framework.randomness.profiler import StreamProfiler
+from vivarium.framework.randomness.stream import STREAM_ENGINES, RandomnessStream, get_hash
 from vivarium.manager import Interface, Manager
 
 
@@ -23,6 +25,14 @@ class RandomnessManager(Manager):
             "key_columns": [],
             "random_seed": 0,
             "additional_seed": None,
+            # How streams generate random numbers. One of the keys of STREAM_ENGINES.
+            # The generator engine is the fastest but doesn't support key_columns.
+            "stream_engine": "random_state",
+            # The number of blocks of random numbers to keep for reuse within a time
+            # step. Each block holds map_size numbers. 0 disables the cache.
+            "draw_cache_size": 0,
+            # Whether to record the calls, draws, samples and time of every stream.
+            "profile_streams": False,
         }
     }
 
@@ -31,6 +41,9 @@ class RandomnessManager(Manager):
         self._clock = None
         self._key_columns = None
         self._key_mapping = None
+        self._stream_type = RandomnessStream
+        self._draw_cache = None
+        self._profiler = None
         self._decision_points = dict()
 
     @property
@@ -47,7 +60,37 @@ class RandomnessManager(Manager):
         map_size = builder.configuration.randomness.map_size
         pop_size = builder.configuration.population.population_size
         map_size = max(map_size, 10 * pop_size)
-        self._key_mapping = IndexMap(self._key_columns, map_size)
+        # Placing keys in order makes the map independent of how the initial
+        # population is chunked, but places collided keys differently than
+        # resolving them in rounds. It's only used when the initial population
+        # is actually created in more than one chunk, so that a chunk size of
+        # at least the population size keeps the unchunked random numbers.
+        chunk_size = builder.configuration.population.initialization_chunk_size
+        place_in_order = 0 < chunk_size < pop_size
+        self._key_mapping = IndexMap(self._key_columns, map_size, place_in_order)
+
+        stream_engine = builder.configuration.randomness.stream_engine
+        if stream_engine not in STREAM_ENGINES:
+            raise RandomnessError(
+                f"Unknown randomness stream engine {stream_engine}. "
+                f"Available engines are {list(STREAM_ENGINES)}."
+            )
+        self._stream_type = STREAM_ENGINES[stream_engine]
+        if self._key_columns and not self._stream_type.supports_crn:
+            raise RandomnessError(
+                f"The {stream_engine} randomness stream engine doesn't support common "
+                "random numbers, so randomness.key_columns must be empty."
+            )
+
+        draw_cache_size = builder.configuration.randomness.draw_cache_size
+        if draw_cache_size < 0:
+            raise RandomnessError(
+                f"The draw cache size must be non-negative, not {draw_cache_size}."
+            )
+        if draw_cache_size:
+            self._draw_cache = DrawCache(draw_cache_size, self._clock)
+        if builder.configuration.randomness.profile_streams:
+            self._profiler = StreamProfiler(builder.lifecycle.current_state())
 
         self.resources = builder.resources
         self._add_constraint = builder.lifecycle.add_constraint
@@ -127,12 +170,14 @@ class RandomnessManager(Manager):
                 f"Two separate places are attempting to create "
                 f"the same randomness stream for {decision_point}"
             )
-        stream = RandomnessStream(
+        stream = self._stream_type(
             key=decision_point,
             clock=self._clock,
             seed=self._seed,
             index_map=self._key_mapping,
             initializes_crn_attributes=initializes_crn_attributes,
+            draw_cache=self._draw_cache,
+            profiler=self._profiler,
         )
         self._decision_points[decision_point] = stream
         return stream
@@ -175,6 +220,62 @@ class RandomnessManager(Manager):
             )
         self._key_mapping.update(simulants.loc[:, self._key_columns], self._clock())
 
+    def set_crn_attribute_offset(self, offset: int) -> None:
+        """Sets where in each stream the draws for new simulants' CRN attributes start.
+
+        Parameters
+        ----------
+        offset
+            The number of simulants created earlier in the same batch of
+            simulants, e.g. in earlier chunks of the initial population.
+        """
+        self._key_mapping.crn_attribute_offset = offset
+
+    def get_performance_metrics(self) -> pd.DataFrame:
+        """Gets metrics on how efficiently random numbers were generated.
+
+        Returns
+        -------
+            A table with a row for the draw cache, if it is enabled, giving the
+            number of lookups and the percentage of them that were hits, and a
+            row for each stream and lifecycle state, if streams are profiled,
+            giving the number of calls, draws and samples and the time spent.
+        """
+        records = []
+        if self._draw_cache is not None:
+            records.append(
+                {
+                    "Event": "randomness draw cache",
+                    "Count": self._draw_cache.lookups,
+                    "Hit rate (%)": 100 * self._draw_cache.hit_rate,
+                }
+            )
+        for row in self.get_stream_profile().itertuples(index=False):
+            records.append(
+                {
+                    "Event": f"randomness stream {row.stream} ({row.phase})",
+                    "Count": row.calls,
+                    "Mean time (s)": row.time / row.calls,
+                    "Total time (s)": row.time,
+                    "Draws": row.draws,
+                    "Samples": row.samples,
+                }
+            )
+        return pd.DataFrame(records)
+
+    def get_stream_profile(self) -> pd.DataFrame:
+        """Gets the calls, draws, samples and time of every stream, if they are profiled.
+
+        Returns
+        -------
+            A table with a row for each stream and lifecycle state, sorted
+            from the most to the least time, or an empty table if
+            ``randomness.profile_streams`` is not set.
+        """
+        if self._profiler is None:
+            return pd.DataFrame()
+        return self._profiler.get_profile()
+
     def __str__(self):
         return "RandomnessManager()"
 
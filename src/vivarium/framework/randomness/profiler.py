@@ -0,0 +1,93 @@
+"""
+==========================
+Randomness Stream Profiler
+==========================
+
+In a large model it isn't obvious which
+:class:`RandomnessStreams <vivarium.framework.randomness.stream.RandomnessStream>`
+dominate the time and memory spent generating random numbers. When
+``randomness.profile_streams`` is set, every stream reports each request for
+draws to a shared :class:`StreamProfiler`, which totals them by stream and
+lifecycle state. The totals appear in the simulation's performance metrics
+and are written to ``randomness_profile.parquet`` next to the results. Streams
+that are called many times in the same state are candidates for batching
+with :meth:`get_draws <vivarium.framework.randomness.stream.RandomnessStream.get_draws>`,
+and streams that generate many more samples than they return are candidates
+for a cheaper ``randomness.stream_engine``.
+
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pandas as pd
+
+
+class StreamProfiler:
+    """Totals the requests for draws made to randomness streams.
+
+    Requests are totalled by stream key and by the lifecycle state they were
+    made in. For each, the profiler records the number of calls, the number
+    of draws returned, the number of raw random numbers generated to make
+    them and the wall time spent.
+    """
+
+    COLUMNS = ["stream", "phase", "calls", "draws", "samples", "time"]
+
+    def __init__(self, phase: Callable[[], str]):
+        """
+        Parameters
+        ----------
+        phase
+            A callable that returns the current lifecycle state.
+        """
+        self._phase = phase
+        # The numbers of calls, draws and samples and the total time, by stream
+        # and phase.
+        self._counts: dict[tuple[str, str], list[int]] = {}
+        self._times: dict[tuple[str, str], float] = {}
+
+    def record(self, stream: str, draws: int, samples: int, time: float) -> None:
+        """Records a request for draws.
+
+        Parameters
+        ----------
+        stream
+            The key of the stream that made the draws.
+        draws
+            The number of draws returned.
+        samples
+            The number of raw random numbers generated to make the draws.
+        time
+            The wall time spent making the draws, in seconds.
+        """
+        key = (stream, self._phase())
+        counts = self._counts.setdefault(key, [0, 0, 0])
+        counts[0] += 1
+        counts[1] += draws
+        counts[2] += samples
+        self._times[key] = self._times.get(key, 0.0) + time
+
+    def get_profile(self) -> pd.DataFrame:
+        """Gets the totals recorded so far.
+
+        Returns
+        -------
+            A table with a row for each stream and lifecycle state, giving the
+            number of calls, draws and samples and the total time in seconds,
+            sorted from the most to the least time.
+        """
+        profile = pd.DataFrame(
+            [[*key, *counts, self._times[key]] for key, counts in self._counts.items()],
+            columns=self.COLUMNS,
+        )
+        profile = profile.astype(
+            {"calls": "int64", "draws": "int64", "samples": "int64", "time": "float64"}
+        )
+        return profile.sort_values("time", ascending=False, ignore_index=True)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+        return f"StreamProfiler(size={len(self)})"
@@ -27,7 +27,9 @@ module.
 from __future__ import annotations
 
 import hashlib
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from typing import Any, TypeVar
 
 import numpy as np
@@ -35,8 +37,11 @@ import numpy.typing as npt
 import pandas as pd
 from scipy import stats
 
+from vivarium.framework.randomness import philox
+from vivarium.framework.randomness.cache import DrawCache
 from vivarium.framework.randomness.exceptions import RandomnessError
 from vivarium.framework.randomness.index_map import IndexMap
+from vivarium.framework.randomness.profiler import StreamProfiler
 from vivarium.framework.utilities import rate_to_probability
 from vivarium.types import ClockTime, NumericArray
 
@@ -82,6 +87,12 @@ class RandomnessStream:
         A key-index mapping with a fectorized hash and vectorized lookups.
     initializes_crn_attributes
         A boolean indicating whether the stram is used to initialize CRN attributes.
+    draw_cache
+        An optional cache of blocks of random numbers shared by the streams of a
+        simulation, so that identical draws within a time step are only generated once.
+    profiler
+        An optional profiler shared by the streams of a simulation, to which
+        every request for draws is reported.
 
     Notes
     -----
@@ -97,6 +108,9 @@ class RandomnessStream:
 
     """
 
+    supports_crn = True
+    """Whether the stream gives the same draws to the same simulants across simulations."""
+
     def __init__(
         self,
         key: str,
@@ -104,12 +118,18 @@ class RandomnessStream:
         seed: Any,
         index_map: IndexMap,
         initializes_crn_attributes: bool = False,
+        draw_cache: DrawCache | None = None,
+        profiler: StreamProfiler | None = None,
     ):
         self.key = key
         self.clock = clock
         self.seed = seed
         self.index_map = index_map
         self.initializes_crn_attributes = initializes_crn_attributes
+        self.draw_cache = draw_cache
+        self.profiler = profiler
+        self._samples_generated = 0
+        """The number of raw random numbers the stream has generated."""
 
     @property
     def name(self) -> str:
@@ -155,25 +175,96 @@ class RandomnessStream:
         "Untangling Uncertainty with Common Random Numbers:
         A Simulation Study; A.Flaxman, et. al., Summersim 2017"
         """
+        if self.profiler is None:
+            return self._get_draw(index, additional_key)
+        with self._profile(len(index)):
+            return self._get_draw(index, additional_key)
+
+    def get_draws(self, index: pd.Index[int], additional_keys: Sequence[Any]) -> pd.DataFrame:
+        """Get indexed sets of numbers uniformly drawn from the unit interval
+        for several additional keys at once.
+
+        The draws for each additional key are the same as those
+        :meth:`get_draw` returns for that key, but the positions of the
+        simulants in the streams of random numbers are only looked up once.
+
+        Parameters
+        ----------
+        index
+            An index whose length is the number of random draws made for each
+            additional key and which indexes the returned `pandas.DataFrame`.
+        additional_keys
+            The additional information used to seed random number generation
+            for each set of draws.
+
+        Returns
+        -------
+            A dataframe of random numbers indexed by the provided `pandas.Index`
+            with a column for each additional key.
+        """
+        if self.profiler is None:
+            return self._get_draws(index, additional_keys)
+        with self._profile(len(index) * len(additional_keys)):
+            return self._get_draws(index, additional_keys)
+
+    def _get_draw(self, index: pd.Index[int], additional_key: Any) -> pd.Series[float]:
         # Return a structured null value if an empty index is passed
         if index.empty:
             return pd.Series(index=index, dtype=float)
 
-        # Initialize a random_state with a seed based on the simulation clock, the
-        # decision_point this stream represents, and any additional user-supplied information.
-        # This is one pre-condition to reproducibility.
-        seed = get_hash(self._key(additional_key))
-        random_state = np.random.RandomState(seed=seed)
-
-        # Second, we need to sample a very large chunk of random numbers. The size of the
-        # index map is set at the simulation start and is at least 10x the size of the
-        # initial population. Which means this is a consistently sampled block of uniformly
-        # distributed random numbers, irrespective of the size of the simulation population,
-        # which is important if there are scenarios that result in different population sizes
-        # through time.
-        sample_size = len(self.index_map)
-        raw_draws = random_state.random_sample(sample_size)
+        # The draws are seeded with the simulation clock, the decision_point this
+        # stream represents, and any additional user-supplied information. This is
+        # one pre-condition to reproducibility.
+        return pd.Series(
+            self._get_uniform_draws(self._key(additional_key), self._get_positions(index)),
+            index=index,
+        )
+
+    def _get_draws(
+        self, index: pd.Index[int], additional_keys: Sequence[Any]
+    ) -> pd.DataFrame:
+        draws = np.empty((len(index), len(additional_keys)), order="F")
+        if not index.empty:
+            positions = self._get_positions(index)
+            for i, additional_key in enumerate(additional_keys):
+                draws[:, i] = self._get_uniform_draws(self._key(additional_key), positions)
+        return pd.DataFrame(draws, index=index, columns=list(additional_keys))
+
+    @contextmanager
+    def _profile(self, draws: int) -> Iterator[None]:
+        """Reports a request for draws to the profiler.
+
+        Streams only profile their draws when they have a profiler, so that
+        streams without one don't pay for entering a context manager.
+
+        Parameters
+        ----------
+        draws
+            The number of draws requested.
+        """
+        assert self.profiler is not None
+        samples_generated = self._samples_generated
+        start = time.perf_counter()
+        yield
+        self.profiler.record(
+            self.key,
+            draws,
+            self._samples_generated - samples_generated,
+            time.perf_counter() - start,
+        )
+
+    def _get_positions(self, index: pd.Index[int]) -> npt.NDArray[np.int64]:
+        """Gets the positions of simulants in the streams of random numbers.
+
+        Parameters
+        ----------
+        index
+            The simulants to get positions for.
 
+        Returns
+        -------
+            The position of each simulant.
+        """
         if self.initializes_crn_attributes:
             # If we're initializing CRN attributes (i.e. attributes used to identify a
             # simulant across multiple simulations), we can't use the index map yet since
@@ -181,14 +272,47 @@ class RandomnessStream:
             # from our random sample in order. This couples the initialization of CRN
             # attributes to the time step on which they are initialized, meaning interventions
             # that alter the entrance time of a simulant will break the CRN guarantees.
-            draws = pd.Series(raw_draws[: len(index)], index=index)
-        else:
-            # If we're not initializing CRN attributes, we can use the index map to get the
-            # correct draws for each simulant. This allows us to use the same CRN attributes
-            # across multiple simulations, even if the population size changes.
-            draw_index = self.index_map[index]
-            draws = pd.Series(raw_draws[draw_index], index=index)
+            # When the initial population is created in chunks, each chunk continues
+            # where the previous chunk left off.
+            start = self.index_map.crn_attribute_offset
+            return np.arange(start, start + len(index))
+        # If we're not initializing CRN attributes, we can use the index map to get the
+        # correct draws for each simulant. This allows us to use the same CRN attributes
+        # across multiple simulations, even if the population size changes.
+        return self.index_map[index]
+
+    def _get_uniform_draws(
+        self, key: str, positions: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.float64]:
+        """Gets the numbers at positions in a stream of uniform random numbers.
 
+        Parameters
+        ----------
+        key
+            The key identifying the stream of random numbers.
+        positions
+            The positions in the stream to get numbers for.
+
+        Returns
+        -------
+            The numbers at the given positions.
+        """
+        seed = get_hash(key)
+        raw_draws = self.draw_cache.get(seed) if self.draw_cache is not None else None
+        if raw_draws is None:
+            random_state = np.random.RandomState(seed=seed)
+            # We need to sample a very large chunk of random numbers. The size of the
+            # index map is set at the simulation start and is at least 10x the size of the
+            # initial population. Which means this is a consistently sampled block of
+            # uniformly distributed random numbers, irrespective of the size of the
+            # simulation population, which is important if there are scenarios that result
+            # in different population sizes through time.
+            sample_size = len(self.index_map)
+            raw_draws = random_state.random_sample(sample_size)
+            self._samples_generated += sample_size
+            if self.draw_cache is not None:
+                self.draw_cache.put(seed, raw_draws)
+        draws: npt.NDArray[np.float64] = raw_draws[positions]
         return draws
 
     def filter_for_rate(
@@ -282,6 +406,7 @@ class RandomnessStream:
             | None
         ) = None,
         additional_key: Any = None,
+        overwrite_p: bool = False,
     ) -> pd.Series[Any]:
         """Decides between a weighted or unweighted set of choices.
 
@@ -305,6 +430,9 @@ class RandomnessStream:
             set of weights for every item in the `index`.
         additional_key
             Any additional information used to seed random number generation.
+        overwrite_p
+            Whether `p` may be overwritten while making the choices, which
+            avoids copying it if it is an array of 64-bit floats.
 
         Returns
         -------
@@ -318,7 +446,7 @@ class RandomnessStream:
             more than one reference to `RESIDUAL_CHOICE`.
         """
         draws = self.get_draw(index, additional_key)
-        return _choice(draws, choices, p)
+        return _choice(draws, choices, p, overwrite_p)
 
     def sample_from_distribution(
         self,
@@ -367,6 +495,79 @@ class RandomnessStream:
         )
 
 
+class CounterBasedRandomnessStream(RandomnessStream):
+    """A stream for producing common random numbers with a counter-based generator.
+
+    Rather than generating a block of random numbers as long as the index map
+    and picking out the ones it needs, this stream computes only the numbers
+    at the positions it needs with the Philox counter-based generator, keyed
+    by the same key that seeds a :class:`RandomnessStream`. The number at a
+    position depends only on the key and the position, so common random
+    number guarantees hold, but the numbers differ from those of a
+    :class:`RandomnessStream`.
+
+    As this stream never generates a block of random numbers, it doesn't use
+    a draw cache.
+    """
+
+    def _get_uniform_draws(
+        self, key: str, positions: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.float64]:
+        self._samples_generated += len(positions)
+        return philox.get_uniform_draws(philox.get_philox_key(key), positions)
+
+
+class GeneratorRandomnessStream(RandomnessStream):
+    """A stream for producing random numbers without common random numbers.
+
+    This stream draws from a single :class:`numpy.random.Generator` that
+    persists for the life of the stream and is seeded from the simulation
+    seed and the stream key through a :class:`numpy.random.SeedSequence`.
+    Each request for draws takes exactly as many numbers as there are
+    simulants, which is much cheaper than generating a block as long as the
+    index map.
+
+    Runs with the same seed and the same sequence of requests are
+    reproducible, but the draws a simulant gets depend on every earlier
+    request, so the stream can't be used with key columns. The clock and
+    any additional key don't affect the draws.
+    """
+
+    supports_crn = False
+
+    def __init__(
+        self,
+        key: str,
+        clock: Callable[[], ClockTime],
+        seed: Any,
+        index_map: IndexMap,
+        initializes_crn_attributes: bool = False,
+        draw_cache: DrawCache | None = None,
+        profiler: StreamProfiler | None = None,
+    ):
+        super().__init__(
+            key, clock, seed, index_map, initializes_crn_attributes, draw_cache, profiler
+        )
+        seed_sequence = np.random.SeedSequence(
+            get_hash(str(seed)), spawn_key=(get_hash(key),)
+        )
+        self._generator = np.random.default_rng(seed_sequence)
+
+    def _get_uniform_draws(
+        self, key: str, positions: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.float64]:
+        self._samples_generated += len(positions)
+        return self._generator.random(len(positions))
+
+
+STREAM_ENGINES: dict[str, type[RandomnessStream]] = {
+    "random_state": RandomnessStream,
+    "philox": CounterBasedRandomnessStream,
+    "generator": GeneratorRandomnessStream,
+}
+"""The randomness stream implementations available through ``randomness.stream_engine``."""
+
+
 def _choice(
     draws: pd.Series[float],
     choices: list[Any] | tuple[Any] | npt.NDArray[Any] | pd.Series[Any],
@@ -377,6 +578,7 @@ def _choice(
         | pd.Series[Any]
         | None
     ) = None,
+    overwrite_p: bool = False,
 ) -> pd.Series[Any]:
     """Decides between a weighted or unweighted set of choices.
 
@@ -399,6 +601,9 @@ def _choice(
         are used to decide among the choices for every item in the `index`.
         In the 2-d case, each row in `p` contains a separate set of weights
         for every item in the `index`.
+    overwrite_p
+        Whether `p` may be overwritten while making the choices, which avoids
+        copying it if it is an array of 64-bit floats.
 
     Returns
     -------
@@ -411,38 +616,71 @@ def _choice(
         weights in the row are not normalized or any row of `p` contains
         more than one reference to `RESIDUAL_CHOICE`.
     """
-    # Convert p to normalized probabilities broadcasted over index.
-    p_norm = (
-        _set_residual_probability(_normalize_shape(p, draws.index))
-        if p is not None
-        else np.ones((len(draws.index), len(choices)))
-    )
-    p_norm = p_norm / p_norm.sum(axis=1, keepdims=True)
-
-    p_bins = np.cumsum(p_norm, axis=1)
-    # Use the random draw to make a choice for every row in index.
-    choice_index = (draws.values[np.newaxis].T > p_bins).sum(axis=1)
-
+    if p is None:
+        weights = np.ones(len(choices))
+    else:
+        weights = np.asarray(p) if overwrite_p else np.array(p)
+        if weights.dtype == np.object_:
+            # Only an object array can hold a RESIDUAL_CHOICE.
+            weights = _set_residual_probability(np.atleast_2d(weights)).reshape(weights.shape)
+        # Keep the memory layout of the weights, as it determines the order in
+        # which they are summed.
+        weights = np.asarray(weights, dtype=np.float64)
+
+    choice_index = _get_choice_indices(draws.to_numpy(), weights)
     decisions: pd.Series[Any] = pd.Series(np.array(choices)[choice_index], index=draws.index)
 
     return decisions
 
 
-def _normalize_shape(
-    p: (
-        list[float | object]
-        | tuple[float | object]
-        | npt.NDArray[np.number[npt.NBitBase] | np.object_]
-        | pd.Series[Any]
-    ),
-    index: pd.Index[int] | pd.MultiIndex,
-) -> npt.NDArray[np.number[npt.NBitBase] | np.object_]:
-    p = np.array(p)
-    # We got a 1-d array => same weights for every index.
-    if len(p.shape) == 1:
-        # Turn 1-d array into 2-d array with same weights in every row.
-        p = np.array(np.broadcast_to(p, (len(index), p.shape[0])))
-    return p
+# Above this many choices, comparing the draws against every cumulative weight
+# at once is faster than comparing them one column of weights at a time.
+_MAX_CHOICES_COMPARED_BY_COLUMN = 8
+
+
+def _get_choice_indices(
+    draws: npt.NDArray[np.float64], weights: npt.NDArray[np.float64]
+) -> npt.NDArray[np.intp]:
+    """Chooses an index into a set of weights for each draw.
+
+    The weights are normalized and cumulatively summed in place, and each draw
+    picks the first choice whose cumulative weight is at least the draw.
+
+    Parameters
+    ----------
+    draws
+        A uniformly distributed random number for every choice to make.
+    weights
+        An array of the relative weights of the choices, either 1-d to use
+        the same weights for every draw or 2-d with a row of weights for
+        every draw. It is overwritten with the cumulative normalized weights.
+
+    Returns
+    -------
+        The index of the choice made with each draw.
+    """
+    if weights.ndim == 1:
+        np.divide(weights, weights.sum(), out=weights)
+        np.cumsum(weights, out=weights)
+        if np.all(weights[1:] >= weights[:-1]):
+            # Counting the cumulative weights below a draw is a binary search.
+            return np.searchsorted(weights, draws, side="left")
+        weights = np.broadcast_to(weights, (len(draws), len(weights)))
+    else:
+        np.divide(weights, weights.sum(axis=1, keepdims=True), out=weights)
+        # Sum the columns one at a time, which is the same as np.cumsum along
+        # the rows but several times faster when there are few choices.
+        for column in range(1, weights.shape[1]):
+            np.add(weights[:, column - 1], weights[:, column], out=weights[:, column])
+
+    if weights.shape[1] > _MAX_CHOICES_COMPARED_BY_COLUMN:
+        return np.asarray(np.count_nonzero(draws[:, np.newaxis] > weights, axis=1), np.intp)
+    choice_index = np.zeros(len(draws), dtype=np.intp)
+    below = np.empty(len(draws), dtype=bool)
+    for column in range(weights.shape[1]):
+        np.greater(draws, weights[:, column], out=below)
+        np.add(choice_index, below, out=choice_index)
+    return choice_index
 
 
 def _set_residual_probability(
@@ -0,0 +1,226 @@
+"""
+=================================
+Tabulated Percent Point Functions
+=================================
+
+Sampling from a distribution with
+:meth:`RandomnessStream.sample_from_distribution <vivarium.framework.randomness.stream.RandomnessStream.sample_from_distribution>`
+evaluates the distribution's percent point function (the inverse of its
+cumulative distribution function) for every draw. For many scipy
+distributions, e.g. lognormal and gamma, this is far more expensive than
+generating the draws. A :class:`TabulatedPPF` evaluates the percent point
+function once, on a grid that is refined until linear interpolation between
+grid points is within a given tolerance, and then samples by interpolating.
+It is built during setup and passed as the ``ppf`` argument::
+
+    class Exposure(Component):
+        def setup(self, builder):
+            self.randomness = builder.randomness.get_stream("exposure")
+            self.exposure_ppf = TabulatedPPF(stats.lognorm, s=0.5, scale=20)
+
+        def on_initialize_simulants(self, pop_data):
+            exposure = self.randomness.sample_from_distribution(
+                pop_data.index, ppf=self.exposure_ppf
+            )
+
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy import special
+
+from vivarium.framework.randomness.exceptions import RandomnessError
+
+
+class TabulatedPPF:
+    """A percent point function approximated by interpolating in a table.
+
+    The table covers probabilities between ``tail_probability`` and
+    ``1 - tail_probability``, evenly spaced on the logit scale, which puts
+    more of them in the tails. The spacing is halved until linear
+    interpolation is within the tolerance at the midpoint of every interval.
+    As the spacing is even, the interval a draw falls in is found directly
+    rather than by searching the table. Draws outside the table are passed
+    to the exact percent point function.
+
+    Attributes
+    ----------
+    tolerance
+        The largest allowed interpolation error. It is an absolute error for
+        values between -1 and 1 and a relative error for larger values.
+    probabilities
+        The probabilities in the table.
+    values
+        The value of the percent point function at each probability.
+    """
+
+    def __init__(
+        self,
+        distribution: Any,
+        tolerance: float = 1e-6,
+        tail_probability: float = 1e-9,
+        initial_size: int = 1025,
+        max_size: int = 2**20,
+        **distribution_kwargs: Any,
+    ):
+        """
+        Parameters
+        ----------
+        distribution
+            A scipy.stats distribution, frozen or not, or a percent point
+            function that takes an array of probabilities.
+        tolerance
+            The largest allowed interpolation error. It is an absolute error
+            for values between -1 and 1 and a relative error for larger values.
+        tail_probability
+            The probability left out of the table in each tail.
+        initial_size
+            The number of probabilities in the table before its spacing is
+            first halved.
+        max_size
+            The largest number of probabilities the table may have.
+        distribution_kwargs
+            Scalar parameters of the distribution.
+
+        Raises
+        ------
+        RandomnessError
+            If a parameter of the distribution is not a scalar, the percent
+            point function is not finite over the table, or the table would
+            need more than ``max_size`` probabilities to meet the tolerance.
+        """
+        if tolerance <= 0:
+            raise RandomnessError(f"The tolerance must be positive, not {tolerance}.")
+        if not 0 < tail_probability < 0.5:
+            raise RandomnessError(
+                f"The tail probability must be between 0 and 0.5, not {tail_probability}."
+            )
+        non_scalar = [k for k, v in distribution_kwargs.items() if np.ndim(v) != 0]
+        if non_scalar:
+            raise RandomnessError(
+                f"Tabulated percent point functions need scalar parameters, but {non_scalar} "
+                "are not scalars."
+            )
+        self._ppf = self._get_ppf(distribution, distribution_kwargs)
+        self.tolerance = tolerance
+        self._lower_logit = special.logit(tail_probability)
+        self.probabilities, self.values = self._build_table(initial_size, max_size)
+        self._inverse_spacing = (len(self.probabilities) - 1) / (-2 * self._lower_logit)
+        self._slopes = np.diff(self.values) / np.diff(self.probabilities)
+
+    @staticmethod
+    def _get_ppf(
+        distribution: Any, distribution_kwargs: dict[str, Any]
+    ) -> Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]:
+        ppf = getattr(distribution, "ppf", distribution)
+        return lambda q: np.asarray(ppf(q, **distribution_kwargs), dtype=np.float64)
+
+    def _build_table(
+        self, initial_size: int, max_size: int
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Halves the spacing of the table until interpolation meets the tolerance."""
+        size = initial_size
+        while True:
+            logits = np.linspace(self._lower_logit, -self._lower_logit, size)
+            probabilities = special.expit(logits)
+            values = self._evaluate(probabilities)
+            midpoints = (probabilities[:-1] + probabilities[1:]) / 2
+            approximate = (values[:-1] + values[1:]) / 2
+            if self._within_tolerance(approximate, self._evaluate(midpoints)).all():
+                return probabilities, values
+            size = 2 * size - 1
+            if size > max_size:
+                raise RandomnessError(
+                    f"More than {max_size} probabilities are needed to tabulate the "
+                    f"percent point function to a tolerance of {self.tolerance}."
+                )
+
+    def _evaluate(self, probabilities: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Evaluates the exact percent point function over the table."""
+        values = self._ppf(probabilities)
+        if not np.isfinite(values).all():
+            raise RandomnessError(
+                "The percent point function is not finite for all probabilities in "
+                f"[{probabilities[0]}, {probabilities[-1]}]."
+            )
+        # Guard against round-off making the table non-monotone.
+        return np.maximum.accumulate(values)
+
+    def _within_tolerance(
+        self, approximate: npt.NDArray[np.float64], exact: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.bool_]:
+        within = np.abs(approximate - exact) <= self.tolerance * np.maximum(1, np.abs(exact))
+        return cast(npt.NDArray[np.bool_], within)
+
+    def __call__(
+        self, draws: pd.Series[float] | npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Gets the value of the percent point function at each draw.
+
+        Parameters
+        ----------
+        draws
+            Probabilities, e.g. uniformly distributed random numbers.
+
+        Returns
+        -------
+            The approximate value of the percent point function at each draw.
+        """
+        draws = np.asarray(draws, dtype=np.float64)
+        # Find the interval of the table each draw falls in from its logit.
+        with np.errstate(divide="ignore"):
+            positions = special.logit(draws)
+        np.subtract(positions, self._lower_logit, out=positions)
+        np.multiply(positions, self._inverse_spacing, out=positions)
+        np.clip(positions, 0, len(self._slopes) - 1, out=positions)
+        intervals = positions.astype(np.intp)
+
+        samples = draws - self.probabilities[intervals]
+        np.multiply(samples, self._slopes[intervals], out=samples)
+        np.add(samples, self.values[intervals], out=samples)
+        outside = (draws < self.probabilities[0]) | (draws > self.probabilities[-1])
+        if outside.any():
+            samples[outside] = self._ppf(draws[outside])
+        return cast(npt.NDArray[np.float64], samples)
+
+    def get_accuracy_report(
+        self, draws: npt.NDArray[np.float64] | None = None
+    ) -> pd.Series[Any]:
+        """Compares the tabulated percent point function with the exact one.
+
+        Parameters
+        ----------
+        draws
+            The probabilities to compare at. Defaults to 100,000 probabilities
+            spread over the table evenly on the logit scale.
+
+        Returns
+        -------
+            The table size, the tolerance, the largest absolute and relative
+            errors, and whether every error is within the tolerance.
+        """
+        if draws is None:
+            draws = special.expit(np.linspace(self._lower_logit, -self._lower_logit, 100_000))
+        draws = np.asarray(draws, dtype=np.float64)
+        approximate = self(draws)
+        exact = self._ppf(draws)
+        error = np.abs(approximate - exact)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_error = np.where(exact != 0, error / np.abs(exact), error)
+        return pd.Series(
+            {
+                "table_size": len(self.probabilities),
+                "tolerance": self.tolerance,
+                "max_absolute_error": error.max(initial=0.0),
+                "max_relative_error": relative_error.max(initial=0.0),
+                "within_tolerance": bool(self._within_tolerance(approximate, exact).all()),
+            }
+        )
+
+    def __repr__(self) -> str:
+        return f"TabulatedPPF(tolerance={self.tolerance}, size={len(self.probabilities)})"
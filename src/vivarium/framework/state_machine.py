@@ -358,7 +358,9 @@ class TransitionSet(Component):
         )
         probabilities = np.transpose(probabilities)
         outputs, probabilities = self._normalize_probabilities(outputs, probabilities)
-        return outputs, self.random.choice(index, outputs, probabilities)
+        # The probabilities are only used to make this choice, so they can be
+        # overwritten rather than copied.
+        return outputs, self.random.choice(index, outputs, probabilities, overwrite_p=True)
 
     def append(self, transition: Transition) -> None:
         if not isinstance(transition, Transition):
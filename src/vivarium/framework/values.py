@@ -201,6 +201,15 @@ class Pipeline:
     need a source or to be configured. This might occur when writing
     generic components that create a set of pipeline modifiers for
     values that won't be used in the particular simulation.
+
+    A pipeline may be memoized, in which case the value it generates for an
+    index of simulants is kept and reused when it is called again with the
+    same index, or a subset of it, until the clock advances or one of the
+    state table columns its source and modifiers require is written. A
+    pipeline should only be memoized if its value for each simulant depends
+    on nothing but the clock time and those columns, and the columns its
+    source and modifiers read, directly or through other pipelines, are all
+    declared as required columns.
     """
 
     def __init__(self) -> None:
@@ -222,6 +231,19 @@ class Pipeline:
         self._combiner: ValueCombiner | None = None
         self.post_processor: PostProcessor | None = None
         self._manager: ValuesManager | None = None
+        self.memoize = False
+        self.required_columns: set[str] = set()
+        """The state table columns the source and modifiers require."""
+        self.required_values: set[str] = set()
+        """The pipelines the source and modifiers require."""
+        self._memo_columns: list[str] = []
+        """The state table columns the value depends on, directly or through
+        other pipelines, which are set at post-setup if the pipeline is memoized."""
+        self._memo: tuple[
+            tuple[Any, int, bool], pd.Index[int], pd.Series[Any] | pd.DataFrame
+        ] | None = None
+        """The clock time, column version and whether the post-processor was
+        skipped when the value was last generated, with the index and the value."""
 
     def _get_attr_error(self, attribute: str) -> str:
         return (
@@ -298,7 +320,12 @@ class Pipeline:
                 f"The dynamic value pipeline for {self.name} has no source. This likely means "
                 f"you are attempting to modify a value that hasn't been created."
             )
-        value = self.source(*args, **kwargs)
+        if self.memoize and len(args) == 1 and not kwargs and isinstance(args[0], pd.Index):
+            return self._call_memoized(args[0], skip_post_processor)
+        return self._generate(*args, skip_post_processor=skip_post_processor, **kwargs)
+
+    def _generate(self, *args: Any, skip_post_processor: bool = False, **kwargs: Any) -> Any:
+        value = self.source(*args, **kwargs)  # type: ignore [misc]
         for mutator in self.mutators:
             value = self.combiner(value, mutator, *args, **kwargs)
         if self.post_processor and not skip_post_processor:
@@ -308,6 +335,43 @@ class Pipeline:
 
         return value
 
+    def _call_memoized(self, index: pd.Index[int], skip_post_processor: bool) -> Any:
+        """Reuses the value last generated if it is still valid and covers the index.
+
+        Parameters
+        ----------
+        index
+            The simulants to generate the value for.
+        skip_post_processor
+            Whether to skip the post-processor.
+
+        Returns
+        -------
+            The value represented by the pipeline. Reused values are copied,
+            so callers may modify them.
+        """
+        key = (
+            self.manager.clock(),
+            self.manager.get_column_version(self._memo_columns),
+            skip_post_processor,
+        )
+        if self._memo is not None and self._memo[0] == key:
+            memo_index, memo_value = self._memo[1], self._memo[2]
+            if index is memo_index:
+                return memo_value.copy()
+            positions = memo_index.get_indexer(index)
+            if (positions >= 0).all():
+                return memo_value.iloc[positions]
+
+        value = self._generate(index, skip_post_processor=skip_post_processor)
+        if (
+            isinstance(value, (pd.Series, pd.DataFrame))
+            and index.is_unique
+            and value.index.equals(index)
+        ):
+            self._memo = (key, index, value.copy())
+        return value
+
     def __repr__(self) -> str:
         return f"_Pipeline({self.name})"
 
@@ -327,6 +391,8 @@ class ValuesManager(Manager):
         self.logger = builder.logging.get_logger(self.name)
         self.step_size = builder.time.step_size()
         self.simulant_step_sizes = builder.time.simulant_step_sizes()
+        self.clock = builder.time.clock()
+        self.get_column_version = builder.population.get_column_version
         builder.event.register_listener("post_setup", self.on_post_setup)
 
         self.resources = builder.resources
@@ -360,6 +426,27 @@ class ValuesManager(Manager):
                 dependencies.append(f"value_modifier.{name}.{i+1}.{mutator_name}")
             self.resources.add_resources("value", [name], pipe._call, dependencies)
 
+        for pipe in self._pipelines.values():
+            if pipe.memoize:
+                pipe._memo_columns = sorted(self._get_required_columns(pipe))
+
+    def _get_required_columns(self, pipeline: Pipeline) -> set[str]:
+        """Gets the state table columns a pipeline requires, directly or through
+        other pipelines."""
+        columns: set[str] = set()
+        to_visit = [pipeline]
+        visited = set()
+        while to_visit:
+            pipe = to_visit.pop()
+            if pipe.name in visited:
+                continue
+            visited.add(pipe.name)
+            columns |= pipe.required_columns
+            to_visit.extend(
+                self._pipelines[name] for name in pipe.required_values if name in self
+            )
+        return columns
+
     def register_value_producer(
         self,
         value_name: str,
@@ -369,6 +456,7 @@ class ValuesManager(Manager):
         requires_streams: Iterable[str] = (),
         preferred_combiner: ValueCombiner = replace_combiner,
         preferred_post_processor: PostProcessor | None = None,
+        memoize: bool = False,
     ) -> Pipeline:
         """Marks a ``Callable`` as the producer of a named value.
 
@@ -379,6 +467,8 @@ class ValuesManager(Manager):
         pipeline = self._register_value_producer(
             value_name, source, preferred_combiner, preferred_post_processor
         )
+        pipeline.memoize = memoize
+        self._record_requirements(pipeline, source, requires_columns, requires_values)
 
         # The resource we add here is just the pipeline source.
         # The value will depend on the source and its modifiers, and we'll
@@ -448,6 +538,7 @@ class ValuesManager(Manager):
 
         pipeline = self._pipelines[value_name]  # May create a pipeline
         pipeline.mutators.append(modifier)
+        self._record_requirements(pipeline, modifier, requires_columns, requires_values)
 
         name = f"{value_name}.{len(pipeline.mutators)}.{modifier_name}"
         self.logger.debug(f"Registering {name} as modifier to {value_name}")
@@ -473,6 +564,20 @@ class ValuesManager(Manager):
         """
         return self._pipelines[name]  # May create a pipeline.
 
+    @staticmethod
+    def _record_requirements(
+        pipeline: Pipeline,
+        func: Callable[..., Any],
+        requires_columns: Iterable[str],
+        requires_values: Iterable[str],
+    ) -> None:
+        """Records the columns and pipelines a source or modifier requires."""
+        if isinstance(func, Pipeline):
+            pipeline.required_values.add(func.name)  # type: ignore [arg-type]
+        else:
+            pipeline.required_columns.update(requires_columns)
+            pipeline.required_values.update(requires_values)
+
     @staticmethod
     def _convert_dependencies(
         func: Callable[..., Any],
@@ -557,6 +662,7 @@ class ValuesInterface(Interface):
         requires_streams: Iterable[str] = (),
         preferred_combiner: ValueCombiner = replace_combiner,
         preferred_post_processor: PostProcessor | None = None,
+        memoize: bool = False,
     ) -> Pipeline:
         """Marks a ``Callable`` as the producer of a named value.
 
@@ -588,6 +694,12 @@ class ValuesInterface(Interface):
             and ``union_post_processor`` which are importable from
             ``vivarium.framework.values``.  Client code may define additional
             strategies as necessary.
+        memoize
+            Whether to reuse the value generated for an index of simulants
+            when the pipeline is called again with the same index, or a subset
+            of it, until the clock advances or any of the required columns of
+            the pipeline, its modifiers or the pipelines they require is
+            written. Only suitable for values that depend on nothing else.
 
         Returns
         -------
@@ -601,6 +713,7 @@ class ValuesInterface(Interface):
             requires_streams,
             preferred_combiner,
             preferred_post_processor,
+            memoize,
         )
 
     def register_rate_producer(
@@ -610,6 +723,7 @@ class ValuesInterface(Interface):
         requires_columns: Iterable[str] = (),
         requires_values: Iterable[str] = (),
         requires_streams: Iterable[str] = (),
+        memoize: bool = False,
     ) -> Pipeline:
         """Marks a ``Callable`` as the producer of a named rate.
 
@@ -636,6 +750,9 @@ class ValuesInterface(Interface):
         requires_streams
             A list of the randomness streams that need to be properly sourced
             before the pipeline source is called.
+        memoize
+            Whether to reuse the rates generated for an index of simulants, as
+            for :meth:`register_value_producer`.
 
         Returns
         -------
@@ -648,6 +765,7 @@ class ValuesInterface(Interface):
             requires_values,
             requires_streams,
             preferred_post_processor=rescale_post_processor,
+            memoize=memoize,
         )
 
     def register_value_modifier(
@@ -20,6 +20,7 @@ from typing import Any, Callable, Dict, List, Optional
 import pandas as pd
 
 from vivarium.framework.engine import SimulationContext
+from vivarium.framework.population.snapshots import PopulationDiff, PopulationSnapshot
 from vivarium.framework.values import Pipeline
 from vivarium.interface.utilities import log_progress, run_from_ipython
 from vivarium.types import ClockStepSize, ClockTime
@@ -174,6 +175,38 @@ class InteractiveContext(SimulationContext):
         """
         return self._population.get_population(untracked)
 
+    def get_population_snapshot(self, skip_unchanged: bool = False) -> PopulationSnapshot:
+        """Get a snapshot of the population state table to record changes against.
+
+        Parameters
+        ----------
+        skip_unchanged
+            Whether to leave values that are written back unchanged out of
+            diffs while the snapshot is alive, at the cost of slower updates.
+
+        Returns
+        -------
+            A copy of the population state table and its version.
+        """
+        return self._population.get_snapshot(skip_unchanged)
+
+    def get_population_diff(self, since_version: int) -> PopulationDiff:
+        """Get the changes to the population state table since an earlier version.
+
+        Parameters
+        ----------
+        since_version
+            The version of an earlier snapshot or diff.
+
+        Returns
+        -------
+            The values written to the population state table since the given
+            version, which can be applied to a snapshot with
+            :meth:`PopulationSnapshot.apply
+            <vivarium.framework.population.snapshots.PopulationSnapshot.apply>`.
+        """
+        return self._population.get_diff(since_version)
+
     def list_values(self) -> List[str]:
         """List the names of all pipelines in the simulation."""
         return list(self._values.keys())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vivarium import Component
+from vivarium.framework.population.state_table import STATE_TABLE_ENGINES
+from vivarium.interface import InteractiveContext
+
+
+@pytest.fixture(params=list(STATE_TABLE_ENGINES))
+def engine(request: pytest.FixtureRequest) -> str:
+    """The name of each state table engine in turn."""
+    name: str = request.param
+    return name
+
+
+@pytest.fixture
+def make_population() -> Callable[[int], pd.DataFrame]:
+    """Makes a population table with a column of each kind of data type."""
+
+    def make_population(size: int) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "age": np.arange(size, dtype=float),
+                "count": np.arange(size, dtype=int),
+                "color": pd.Categorical(np.where(np.arange(size) % 2, "blue", "red")),
+                "tracked": [True] * size,
+            }
+        )
+
+    return make_population
+
+
+@pytest.fixture
+def run_simulation() -> Callable[..., InteractiveContext]:
+    """Runs a simulation with the given population configuration for some steps."""
+
+    def run_simulation(
+        population: dict[str, Any],
+        components: list[Component] | None = None,
+        model_specification: Path | None = None,
+        steps: int = 1,
+        **configuration: Any,
+    ) -> InteractiveContext:
+        sim = InteractiveContext(  # type: ignore [no-untyped-call]
+            model_specification,
+            components=components,
+            configuration={"population": population, **configuration},
+        )
+        sim.take_steps(steps)
+        return sim
+
+    return run_simulation
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+import pytest
+
+from vivarium import Component
+from vivarium.framework.event import Event
+from vivarium.framework.population import PopulationManager
+from vivarium.framework.population.archive import PopulationArchive
+from vivarium.interface import InteractiveContext
+
+
+@pytest.mark.parametrize("spill", [True, False])
+def test_population_archive(
+    tmp_path: Path, spill: bool, make_population: Callable[[int], pd.DataFrame]
+) -> None:
+    population = make_population(4).set_axis(pd.Index([2, 5, 6, 9]))
+    directory = tmp_path / "archive"
+    archive = PopulationArchive(directory if spill else None)
+    assert len(archive) == 0
+    assert archive.to_frame().empty
+
+    archive.add(population.iloc[:2])
+    archive.add(population.iloc[:0])
+    archive.add(population.iloc[3:])
+
+    assert len(archive) == 3
+    assert archive.index.equals(pd.Index([2, 5, 9]))
+    pd.testing.assert_frame_equal(archive.to_frame(), population.iloc[[0, 1, 3]])
+    if spill:
+        assert len(list(directory.glob("*.parquet"))) == 2
+
+
+class Untracker(Component):
+    """Untracks a few more simulants every time step."""
+
+    @property
+    def columns_required(self) -> list[str]:
+        return ["tracked"]
+
+    def on_time_step(self, event: Event) -> None:
+        population = self.population_view.get(event.index)
+        to_untrack = population.index[population.index % 7 == event.time.day % 7]
+        self.population_view.update(pd.Series(False, index=to_untrack, name="tracked"))
+
+
+@pytest.mark.parametrize("interval", [1, 4])
+@pytest.mark.parametrize("spill", [True, False])
+def test_compaction(
+    tmp_path: Path,
+    interval: int,
+    spill: bool,
+    run_simulation: Callable[..., InteractiveContext],
+) -> None:
+    reference = run_simulation(
+        {"population_size": 50, "compaction": {"interval": 0}}, [Untracker()], steps=6
+    )
+    compaction: dict[str, Any] = {"interval": interval}
+    if spill:
+        compaction["archive_directory"] = str(tmp_path / "archive")
+    sim = run_simulation(
+        {"population_size": 50, "compaction": compaction}, [Untracker()], steps=6
+    )
+
+    population_manager = cast(PopulationManager, sim._population)
+    archive = population_manager._archive
+    state_table = population_manager.get_state_table()
+    untracked = reference.get_population(untracked=True).tracked == False
+    assert 0 < len(archive) <= untracked.sum()
+    assert len(state_table) == len(untracked) - len(archive)
+    assert archive.index.intersection(state_table.index).empty
+
+    for include_untracked in [True, False]:
+        pd.testing.assert_frame_equal(
+            sim.get_population(untracked=include_untracked),
+            reference.get_population(untracked=include_untracked),
+        )
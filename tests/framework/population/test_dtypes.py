@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vivarium import Component
+from vivarium.framework.event import Event
+from vivarium.framework.population import PopulationManager, SimulantData
+from vivarium.framework.population.dtypes import (
+    get_integer_dtype,
+    get_update_dtype,
+    infer_compact_dtype,
+)
+from vivarium.interface import InteractiveContext
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (pd.Series(["a", "b", "a", "a"]), pd.CategoricalDtype(["a", "b"])),
+        (pd.Series(["b", None, "b", "a"]), pd.CategoricalDtype(["a", "b"])),
+        (pd.Series(["a", "b", "c", "d"]), None),
+        (pd.Series(["a", 1, "a", "a"]), None),
+        (pd.Series([0, 5, 100]), np.dtype(np.int8)),
+        (pd.Series([-1000, 5]), np.dtype(np.int16)),
+        (pd.Series([0, 2**40]), None),
+        (pd.Series([0, 5], dtype=np.int8), None),
+        (pd.Series([0.0, 1.0, 1.0]), np.dtype(bool)),
+        (pd.Series([0.0, 0.5]), None),
+        (pd.Series([0.0, np.nan]), None),
+        (pd.Series([True, False]), None),
+        (pd.Series(pd.Categorical(["a"])), None),
+        (pd.Series([], dtype=object), None),
+    ],
+)
+def test_infer_compact_dtype(values: pd.Series[Any], expected: Any) -> None:
+    assert infer_compact_dtype(values) == expected
+
+
+@pytest.mark.parametrize(
+    "minimum, maximum, expected",
+    [
+        (0, 127, np.int8),
+        (-129, 0, np.int16),
+        (0, 2**16, np.int32),
+        (0, 2**40, np.int64),
+    ],
+)
+def test_get_integer_dtype(minimum: int, maximum: int, expected: Any) -> None:
+    assert get_integer_dtype(minimum, maximum) == np.dtype(expected)
+
+
+@pytest.mark.parametrize(
+    "update, compact_dtype, expected",
+    [
+        (pd.Series(["a"]), pd.CategoricalDtype(["a", "b"]), pd.CategoricalDtype(["a", "b"])),
+        (
+            pd.Series(["d", "c"]),
+            pd.CategoricalDtype(["b", "a"]),
+            pd.CategoricalDtype(["b", "a", "c", "d"]),
+        ),
+        (pd.Series([1.0]), pd.CategoricalDtype(["a"]), None),
+        (pd.Series([1, 2]), np.dtype(np.int8), np.dtype(np.int8)),
+        (pd.Series([1, 200]), np.dtype(np.int8), np.dtype(np.int16)),
+        (pd.Series([1], dtype=np.int8), np.dtype(np.int16), np.dtype(np.int16)),
+        (pd.Series([1.0]), np.dtype(np.int8), None),
+        (pd.Series([1.0, 0.0]), np.dtype(bool), np.dtype(bool)),
+        (pd.Series([0.5]), np.dtype(bool), None),
+    ],
+)
+def test_get_update_dtype(update: pd.Series[Any], compact_dtype: Any, expected: Any) -> None:
+    assert get_update_dtype(update, compact_dtype) == expected
+
+
+class WideColumns(Component):
+    """Creates columns with wide data types and updates them outside their initial range."""
+
+    @property
+    def columns_created(self) -> list[str]:
+        return ["state", "count", "flag", "value"]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.steps = 0
+
+    def on_initialize_simulants(self, pop_data: SimulantData) -> None:
+        index = pop_data.index
+        self.population_view.update(
+            pd.DataFrame(
+                {
+                    "state": np.where(index % 2, "odd", "even").astype(object),
+                    "count": index % 3,
+                    "flag": (index % 2).astype(float),
+                    "value": index / 10,
+                },
+                index=index,
+            )
+        )
+
+    def on_time_step(self, event: Event) -> None:
+        self.steps += 1
+        population = self.population_view.get(event.index)
+        population.loc[population.index % 5 == self.steps % 5, "state"] = f"step_{self.steps}"
+        population["count"] += 100
+        if self.steps == 3:
+            population["flag"] = 0.5
+        self.population_view.update(population)
+
+
+@pytest.mark.parametrize("buffer_updates", [True, False])
+def test_compact_dtypes(
+    engine: str, buffer_updates: bool, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    configuration = {
+        "population_size": 100,
+        "state_table_engine": engine,
+        "buffer_updates": buffer_updates,
+    }
+    sim = run_simulation({**configuration, "compact_dtypes": True}, [WideColumns()])
+    population_manager = cast(PopulationManager, sim._population)
+    report = population_manager.get_dtype_compaction_report()
+    assert report.set_index("column")["compact_dtype"].to_dict() == {
+        "state": "category",
+        "count": "int8",
+        "flag": "bool",
+    }
+    assert (report["bytes_saved"] > 0).all()
+    state_table = population_manager.get_state_table()
+    assert state_table.get_column("flag").dtype == np.dtype(bool)
+    # Compacted columns are read with their original data types.
+    assert sim.get_population()["flag"].dtype == np.dtype(float)
+
+    sim.take_steps(3)
+    reference = run_simulation({**configuration, "compact_dtypes": False}, [WideColumns()])
+    reference.take_steps(3)
+    state_table = population_manager.get_state_table()
+
+    assert isinstance(state_table.get_column("state").dtype, pd.CategoricalDtype)
+    assert state_table.get_column("count").dtype == np.dtype(np.int16)
+    assert state_table.get_column("flag").dtype == np.dtype(float)
+    pd.testing.assert_frame_equal(sim.get_population(), reference.get_population())
+
+
+def test_query_compacted_column(run_simulation: Callable[..., InteractiveContext]) -> None:
+    component = WideColumns()
+    sim = run_simulation({"population_size": 100, "compact_dtypes": True}, [component])
+    state_table = cast(PopulationManager, sim._population).get_state_table()
+    assert isinstance(state_table.get_column("state").dtype, pd.CategoricalDtype)
+
+    # Categories are unordered, so queries must see the original strings.
+    population = component.population_view.get(state_table.index, query="state < 'odd'")
+    expected = sim.get_population().query("state < 'odd'")
+    assert not expected.empty
+    pd.testing.assert_frame_equal(population, expected[population.columns])
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import pandas as pd
 import pytest
 
 from vivarium import Component
+from vivarium.framework.event import Event
 from vivarium.framework.population.exceptions import PopulationError
 from vivarium.framework.population.manager import InitializerComponentSet, PopulationManager
+from vivarium.interface import InteractiveContext
 
 
 def test_initializer_set_fail_type():
@@ -116,3 +119,119 @@ def test_setting_columns_with_get_view(
     manager = PopulationManager()
     view = manager._get_view(columns=columns, query="")
     assert view._columns == expected_columns
+
+
+@pytest.mark.parametrize(
+    "validation_mode, creating_initial_population, expected",
+    [
+        ("full", True, [True] * 5),
+        ("full", False, [True] * 5),
+        ("off", True, [False] * 5),
+        ("off", False, [False] * 5),
+        ("sampled", True, [True] * 5),
+        ("sampled", False, [True, False, True, False, True]),
+    ],
+)
+def test_should_validate_update(
+    monkeypatch, validation_mode, creating_initial_population, expected
+):
+    monkeypatch.setattr(PopulationManager, "VALIDATION_SAMPLE_INTERVAL", 2)
+    manager = PopulationManager()
+    manager._validation_mode = validation_mode
+    manager.creating_initial_population = creating_initial_population
+
+    assert [manager.should_validate_update() for _ in expected] == expected
+
+
+def test_unknown_validation_mode():
+    with pytest.raises(PopulationError, match="validation mode"):
+        InteractiveContext(configuration={"population": {"validation_mode": "sometimes"}})
+
+
+def test_negative_initialization_chunk_size():
+    with pytest.raises(PopulationError, match="chunk size"):
+        InteractiveContext(configuration={"population": {"initialization_chunk_size": -1}})
+
+
+class Untracker(Component):
+    @property
+    def columns_required(self) -> list[str]:
+        return ["tracked"]
+
+    def on_time_step(self, event: Event) -> None:
+        population = self.population_view.get(event.index)
+        to_untrack = population.index[population.index % 4 == event.time.day % 4]
+        self.population_view.update(pd.Series(False, index=to_untrack, name="tracked"))
+
+
+def _get_expected_tracked_index(sim: InteractiveContext) -> pd.Index:
+    population = sim.get_population(untracked=True)
+    return population.index[population["tracked"]]
+
+
+@pytest.mark.parametrize("compaction_interval", [0, 2])
+def test_get_tracked_index(compaction_interval):
+    sim = InteractiveContext(
+        components=[Untracker()],
+        configuration={
+            "population": {
+                "population_size": 40,
+                "compaction": {"interval": compaction_interval},
+            }
+        },
+    )
+    manager = sim._population
+    tracked_index = manager.get_tracked_index()
+    assert tracked_index.equals(pd.RangeIndex(40))
+    assert manager.get_tracked_index() is tracked_index
+
+    for _ in range(3):
+        sim.step()
+        assert manager.get_tracked_index().equals(_get_expected_tracked_index(sim))
+        pd.testing.assert_frame_equal(
+            sim.get_population(untracked=False),
+            sim.get_population(untracked=True).query("tracked"),
+        )
+
+    new_index = sim.simulant_creator(5, {"sim_state": "time_step"})
+    assert manager.get_tracked_index()[-5:].equals(new_index)
+    assert manager.get_tracked_index().equals(_get_expected_tracked_index(sim))
+
+    # The mask has spare capacity, so adding simulants doesn't reallocate it.
+    tracked_mask = manager._tracked_mask
+    new_index = sim.simulant_creator(5, {"sim_state": "time_step"})
+    assert manager._tracked_mask is tracked_mask
+    assert manager.get_tracked_index()[-5:].equals(new_index)
+    assert manager.get_tracked_index().equals(_get_expected_tracked_index(sim))
+
+
+@pytest.mark.parametrize("compaction_interval", [0, 1])
+def test_column_versions(compaction_interval):
+    sim = InteractiveContext(
+        components=[Untracker()],
+        configuration={
+            "population": {
+                "population_size": 40,
+                "compaction": {"interval": compaction_interval},
+            }
+        },
+    )
+    manager = sim._population
+    version = manager.get_column_version("tracked")
+    assert version > 0
+    assert manager.get_column_version("not_a_column") == 0
+    assert manager.get_updated_simulants("tracked", version).empty
+    assert manager.get_updated_simulants("tracked", version - 1).equals(pd.RangeIndex(40))
+
+    before = sim.get_population(untracked=True)["tracked"]
+    sim.step()
+    after = sim.get_population(untracked=True)["tracked"]
+    assert manager.get_column_version("tracked") > version
+    untracked = after.index[before & ~after]
+    updated = manager.get_updated_simulants("tracked", version)
+    assert set(updated) == set(untracked).intersection(manager.get_simulant_index())
+
+    version = manager.get_column_version(["tracked"])
+    new_index = sim.simulant_creator(5, {"sim_state": "time_step"})
+    assert manager.get_column_version("tracked") > version
+    assert manager.get_updated_simulants("tracked", version).equals(new_index)
@@ -7,6 +7,7 @@ import pandas as pd
 import pytest
 
 from vivarium.framework.population import PopulationError, PopulationManager, PopulationView
+from vivarium.framework.population.queries import compile_query
 
 ##########################
 # Mock data and fixtures #
@@ -213,6 +214,45 @@ def test_get(population_manager):
     assert len(pop) == len(RECORDS) // (2 * len(COLORS))
 
 
+def test_get_query_on_columns_outside_view(population_manager):
+    pv = population_manager.get_view(["color", "count"], query="pie == 'apple'")
+    full_idx = pd.RangeIndex(0, len(RECORDS))
+
+    pop = pv.get(full_idx, query="pi > 5")
+    assert list(pop.columns) == ["color", "count"]
+    expected = BASE_POPULATION.query("pie == 'apple' and pi > 5 and tracked == True")
+    assert pop.index.equals(expected.index)
+
+
+def test_get_does_not_share_data_with_state_table(population_manager):
+    pv = population_manager.get_view(COL_NAMES)
+    full_idx = pd.RangeIndex(0, len(RECORDS))
+
+    pop = pv.get(full_idx)
+    pop["count"] = -1
+    assert (population_manager.get_population(True)["count"] > 0).all()
+
+
+@pytest.mark.parametrize(
+    "queries, expected_columns",
+    [
+        ([], []),
+        (["color == 'red'"], ["color"]),
+        (
+            ["color == 'red' and tracked == True", "pie != 'pecan'"],
+            ["color", "pie", "tracked"],
+        ),
+        (["`count` > 10"], ["count"]),
+        (["color == 'pie'"], ["color"]),
+        (["color.str.startswith('pie')"], ["color", "pie"]),
+    ],
+)
+def test__get_query_columns(queries, expected_columns):
+    predicates = [compile_query(query) for query in queries]
+    columns = PopulationView._get_query_columns(predicates, BASE_POPULATION.columns)
+    assert columns == expected_columns
+
+
 def test_get_empty_idx(population_manager):
     pv = population_manager.get_view(COL_NAMES)
 
@@ -448,6 +488,38 @@ def test__format_update_and_check_preconditions_unknown_pop_fail(population_upda
         )
 
 
+def test__format_update_and_check_preconditions_without_validation(
+    population_update_new_cols,
+    update_index,
+):
+    if population_update_new_cols.empty:
+        pytest.skip()
+
+    # Unknown simulants and incoherent initialization aren't checked.
+    update = population_update_new_cols.copy()
+    update.index += 2 * update.index.max()
+    result = PopulationView._format_update_and_check_preconditions(
+        update,
+        BASE_POPULATION,
+        COL_NAMES + NEW_COL_NAMES,
+        True,
+        True,
+        validate=False,
+    )
+    assert result.index.equals(update.index)
+
+    # Structural checks always happen.
+    with pytest.raises(PopulationError, match="outside the initial population creation"):
+        PopulationView._format_update_and_check_preconditions(
+            population_update_new_cols,
+            BASE_POPULATION.loc[update_index],
+            COL_NAMES + NEW_COL_NAMES,
+            False,
+            True,
+            validate=False,
+        )
+
+
 def test__format_update_and_check_preconditions_coherent_initialization_fail(
     population_update,
     update_index,
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vivarium.framework.population.queries import QUERY_CACHE_SIZE, compile_query
+
+POPULATION = pd.DataFrame(
+    {
+        "alive": pd.Categorical(["alive", "dead", "alive", "alive", "dead", "alive"]),
+        "age": [0.5, 10.0, 25.0, np.nan, 80.0, 40.0],
+        "sex": ["Female", "Male", "Male", "Female", None, "Female"],
+        "tracked": [True, True, False, True, True, True],
+        "count": [1, 2, 3, 4, 5, 6],
+        "cause of death": ["none", "heart", "none", "none", "cancer", "none"],
+    },
+    index=pd.Index([3, 7, 8, 10, 11, 15]),
+)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "alive == 'alive'",
+        "alive == 'alive' and tracked == True",
+        "alive == 'alive' & tracked == True",
+        "alive != 'alive' or sex == 'Male'",
+        "alive != 'alive' | sex == 'Male'",
+        "tracked",
+        "not tracked",
+        "~tracked",
+        "age > 20",
+        "age <= 25.0",
+        "5 < age < 50",
+        "20 > age",
+        "sex in ['Male', 'Female']",
+        "sex not in ['Male']",
+        "sex == ['Male']",
+        "count != [1, 2, 3]",
+        "count >= -2",
+        "`cause of death` == 'none'",
+        "(alive == 'alive') and not (age < 1 or sex == 'Male')",
+        "age > count",
+    ],
+)
+def test_compiled_query_matches_pandas(query: str) -> None:
+    predicate = compile_query(query)
+
+    assert predicate.is_compiled
+    expected = POPULATION.query(query)
+    pd.testing.assert_frame_equal(POPULATION.loc[predicate(POPULATION)], expected)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "age + 1 > 20",
+        "age > count * 2",
+    ],
+)
+def test_uncompiled_query_falls_back_to_pandas(query: str) -> None:
+    predicate = compile_query(query)
+
+    assert not predicate.is_compiled
+    expected = POPULATION.query(query)
+    pd.testing.assert_frame_equal(POPULATION.loc[predicate(POPULATION)], expected)
+
+
+def test_query_referencing_non_column_falls_back_to_pandas() -> None:
+    predicate = compile_query("index > 8 and tracked")
+
+    assert predicate.is_compiled
+    expected = POPULATION.query("index > 8 and tracked")
+    pd.testing.assert_frame_equal(POPULATION.loc[predicate(POPULATION)], expected)
+
+
+def test_compile_query_is_cached() -> None:
+    assert compile_query("age > 5 and tracked") is compile_query("age > 5 and tracked")
+
+
+@pytest.mark.parametrize(
+    "query, columns",
+    [
+        ("alive == 'alive' and tracked == True", ["alive", "tracked"]),
+        ("`cause of death` == 'none' or age < count", ["cause of death", "age", "count"]),
+        ("sex in ['Male', 'Female']", ["sex"]),
+    ],
+)
+def test_query_columns(query: str, columns: list[str]) -> None:
+    assert compile_query(query).columns == columns
+
+
+def test_compile_query_cache_is_bounded() -> None:
+    compile_query.cache_clear()
+    for threshold in range(QUERY_CACHE_SIZE + 10):
+        compile_query(f"age > {threshold}")
+    assert compile_query.cache_info().currsize == QUERY_CACHE_SIZE
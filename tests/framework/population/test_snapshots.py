@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import cast
+
+import pandas as pd
+import pytest
+
+from vivarium import Component
+from vivarium.framework.event import Event
+from vivarium.framework.population import PopulationManager
+from vivarium.framework.population.exceptions import PopulationError
+from vivarium.interface import InteractiveContext
+
+
+@pytest.mark.parametrize("compaction_interval", [0, 2])
+@pytest.mark.parametrize("skip_unchanged", [True, False])
+def test_diffs_reproduce_population(
+    disease_model_spec: Path,
+    engine: str,
+    compaction_interval: int,
+    skip_unchanged: bool,
+    run_simulation: Callable[..., InteractiveContext],
+) -> None:
+    sim = run_simulation(
+        {
+            "population_size": 1000,
+            "state_table_engine": engine,
+            "compact_dtypes": True,
+            "compaction": {"interval": compaction_interval},
+        },
+        model_specification=disease_model_spec,
+        steps=0,
+    )
+    population_manager = cast(PopulationManager, sim._population)
+    snapshot = sim.get_population_snapshot(skip_unchanged)
+    pd.testing.assert_frame_equal(snapshot.population, population_manager.population)
+
+    for _ in range(3):
+        sim.step()
+        diff = sim.get_population_diff(snapshot.version)
+        assert diff.since_version == snapshot.version
+        assert diff.version > snapshot.version
+        assert len(diff.updates) < len(snapshot.population.columns)
+        snapshot = snapshot.apply(diff)
+        pd.testing.assert_frame_equal(snapshot.population, population_manager.population)
+
+    new_index = sim.simulant_creator(5, {"sim_state": "time_step"})
+    diff = sim.get_population_diff(snapshot.version)
+    assert all(update.index.equals(new_index) for update in diff.updates.values())
+    snapshot = snapshot.apply(diff)
+    pd.testing.assert_frame_equal(snapshot.population, population_manager.population)
+
+
+def test_diff_without_changes(
+    disease_model_spec: Path, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    sim = run_simulation({}, model_specification=disease_model_spec, steps=0)
+    snapshot = sim.get_population_snapshot()
+    diff = sim.get_population_diff(snapshot.version)
+
+    assert diff.version == snapshot.version
+    assert not diff.updates
+    pd.testing.assert_frame_equal(snapshot.apply(diff).population, snapshot.population)
+
+
+def test_apply_diff_missing_changes(
+    disease_model_spec: Path, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    sim = run_simulation({}, model_specification=disease_model_spec, steps=0)
+    snapshot = sim.get_population_snapshot()
+    sim.step()
+    diff = sim.get_population_diff(snapshot.version)
+    sim.step()
+    later_diff = sim.get_population_diff(diff.version)
+
+    with pytest.raises(PopulationError, match="Cannot apply"):
+        snapshot.apply(later_diff)
+    # Diffs since an earlier version can still be applied to later snapshots.
+    snapshot = snapshot.apply(diff)
+    assert snapshot.apply(sim.get_population_diff(0)).version == later_diff.version
+
+
+def test_writes_tracked_while_snapshot_alive(
+    disease_model_spec: Path, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    sim = run_simulation({}, model_specification=disease_model_spec, steps=0)
+    manager = cast(PopulationManager, sim._population)
+    snapshot = sim.get_population_snapshot()
+    assert set(manager._row_versions) == set(snapshot.population.columns)
+
+    sim.step()
+    # Snapshots derived from the first keep writes tracked.
+    snapshot = snapshot.apply(sim.get_population_diff(snapshot.version))
+    assert set(manager._row_versions) == set(snapshot.population.columns)
+
+    del snapshot
+    assert not manager._row_versions
+
+
+class Rewriter(Component):
+    """Writes the tracked column back unchanged."""
+
+    @property
+    def columns_required(self) -> list[str]:
+        return ["tracked"]
+
+    def on_time_step(self, event: Event) -> None:
+        self.population_view.update(self.population_view.get(event.index)["tracked"])
+
+
+@pytest.mark.parametrize("skip_unchanged", [True, False])
+def test_diff_skips_unchanged_values(
+    skip_unchanged: bool, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    sim = run_simulation({"population_size": 10}, [Rewriter()], steps=0)
+    snapshot = sim.get_population_snapshot(skip_unchanged)
+    sim.step()
+    diff = sim.get_population_diff(snapshot.version)
+    population_manager = cast(PopulationManager, sim._population)
+    updated = population_manager.get_updated_simulants("tracked", snapshot.version)
+
+    if skip_unchanged:
+        assert "tracked" not in diff.updates
+        assert updated.empty
+    else:
+        assert diff.updates["tracked"].index.equals(pd.RangeIndex(10))
+        assert updated.equals(pd.RangeIndex(10))
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vivarium.framework.population import PopulationManager
+from vivarium.framework.population.exceptions import PopulationError
+from vivarium.framework.population.state_table import (
+    STATE_TABLE_ENGINES,
+    BufferedStateTable,
+    ColumnarStateTable,
+    DataFrameStateTable,
+    MemoryMappedStateTable,
+    StateTable,
+)
+from vivarium.interface import InteractiveContext
+
+
+@pytest.fixture
+def state_table_data(make_population: Callable[[int], pd.DataFrame]) -> pd.DataFrame:
+    return make_population(10)
+
+
+@pytest.fixture
+def state_table(engine: str, state_table_data: pd.DataFrame) -> StateTable:
+    return STATE_TABLE_ENGINES[engine](state_table_data.copy())
+
+
+def test_get(state_table: StateTable, state_table_data: pd.DataFrame) -> None:
+    index = pd.Index([7, 2, 5])
+    columns = ["color", "age"]
+    result = state_table.get(index, columns)
+    pd.testing.assert_frame_equal(result, state_table_data.loc[index, columns])
+
+
+def test_get_missing_simulants(state_table: StateTable) -> None:
+    with pytest.raises(KeyError):
+        state_table.get(pd.Index([3, 10]), ["age"])
+
+
+def test_add_rows(state_table: StateTable, state_table_data: pd.DataFrame) -> None:
+    new_index = state_table.add_rows(3)
+
+    assert new_index.equals(pd.RangeIndex(10, 13))
+    assert len(state_table) == 13
+    expected = state_table_data.reindex(range(13))
+    pd.testing.assert_frame_equal(state_table.to_frame(), expected)
+    pd.testing.assert_frame_equal(
+        state_table.get(new_index, list(state_table.columns)), expected.loc[new_index]
+    )
+
+
+def test_update_column(state_table: StateTable, state_table_data: pd.DataFrame) -> None:
+    update = pd.Series([100.0, 200.0], index=[3, 8], name="age")
+    state_table.update_column("age", update, adding_simulants=False)
+
+    expected = state_table_data["age"].copy()
+    expected[update.index] = update
+    pd.testing.assert_series_equal(state_table.get_column("age"), expected)
+
+
+def test_update_column_after_add_rows(
+    state_table: StateTable, state_table_data: pd.DataFrame
+) -> None:
+    new_index = state_table.add_rows(2)
+    update = pd.Series([True, False], index=new_index, name="tracked")
+    state_table.update_column("tracked", update, adding_simulants=True)
+
+    expected = pd.concat([state_table_data["tracked"], update])
+    pd.testing.assert_series_equal(state_table.get_column("tracked"), expected)
+
+
+def test_update_column_dtype_change_fails(state_table: StateTable) -> None:
+    update = pd.Series([1, 2], index=[3, 8], name="age")
+    with pytest.raises(PopulationError, match="corrupting the population table"):
+        state_table.update_column("age", update, adding_simulants=False)
+
+
+def test_to_frame_copy(state_table: StateTable, state_table_data: pd.DataFrame) -> None:
+    frame = state_table.to_frame()
+    frame.loc[:, "age"] = -1.0
+    pd.testing.assert_series_equal(state_table.get_column("age"), state_table_data["age"])
+
+
+@pytest.mark.parametrize("table_type", [ColumnarStateTable, MemoryMappedStateTable])
+def test_columnar_to_frame_always_copies(
+    table_type: type[ColumnarStateTable], state_table_data: pd.DataFrame
+) -> None:
+    state_table = table_type(state_table_data.copy())
+    frame = state_table.to_frame(copy=False)
+    frame.loc[:, "age"] = -1.0
+    pd.testing.assert_series_equal(state_table.get_column("age"), state_table_data["age"])
+
+
+def test_columnar_update_is_in_place(state_table_data: pd.DataFrame) -> None:
+    state_table = ColumnarStateTable(state_table_data)
+    values = state_table._data["count"]
+    update = pd.Series([-1, -2], index=[0, 9], name="count")
+    state_table.update_column("count", update, adding_simulants=False)
+
+    assert state_table._data["count"] is values
+    assert values[0] == -1 and values[9] == -2
+
+
+def test_columnar_does_not_share_data_with_input(state_table_data: pd.DataFrame) -> None:
+    state_table = ColumnarStateTable(state_table_data)
+    update = pd.Series([-1], index=[0], name="count")
+    state_table.update_column("count", update, adding_simulants=False)
+
+    assert state_table_data.loc[0, "count"] == 0
+
+
+def test_unknown_engine(
+    disease_model_spec: Path, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    with pytest.raises(PopulationError, match="state table engine"):
+        run_simulation(
+            {"state_table_engine": "spreadsheet"}, model_specification=disease_model_spec
+        )
+
+
+def test_default_engine(
+    disease_model_spec: Path, run_simulation: Callable[..., InteractiveContext]
+) -> None:
+    sim = run_simulation({}, model_specification=disease_model_spec, steps=0)
+    population_manager = cast(PopulationManager, sim._population)
+    assert isinstance(population_manager.get_state_table(), DataFrameStateTable)
+
+
+def test_columnar_capacity_grows_geometrically(state_table_data: pd.DataFrame) -> None:
+    state_table = ColumnarStateTable(state_table_data)
+    assert state_table.capacity == 10
+
+    state_table.add_rows(1)
+    capacity = state_table.capacity
+    assert capacity == ColumnarStateTable.MINIMUM_CAPACITY
+    values = state_table._data["age"]
+
+    state_table.add_rows(capacity - 11)
+    assert state_table.capacity == capacity
+    assert state_table._data["age"] is values
+
+    state_table.add_rows(1)
+    assert state_table.capacity == ColumnarStateTable.GROWTH_FACTOR * capacity
+
+
+def test_columnar_exposes_live_rows(state_table_data: pd.DataFrame) -> None:
+    state_table = ColumnarStateTable(state_table_data)
+    new_index = state_table.add_rows(5)
+    update = pd.Series(np.arange(5, dtype=float), index=new_index, name="age")
+    state_table.update_column("age", update, adding_simulants=True)
+
+    assert state_table.capacity > len(state_table) == 15
+    expected = pd.concat([state_table_data["age"], update])
+    pd.testing.assert_series_equal(state_table.get_column("age"), expected)
+    assert "age" not in state_table._uninitialized
+    assert len(state_table.to_frame()) == 15
+    with pytest.raises(KeyError):
+        state_table.get(pd.Index([15]), ["age"])
+
+
+def test_columnar_tracks_only_uninitialized_rows(state_table_data: pd.DataFrame) -> None:
+    state_table = ColumnarStateTable(state_table_data)
+    first = state_table.add_rows(4)
+    second = state_table.add_rows(3)
+    update = pd.Series([1.0, 2.0], index=first[[0, 2]], name="age")
+    state_table.update_column("age", update, adding_simulants=True)
+
+    start, written = state_table._uninitialized["age"]
+    assert (start, len(written)) == (11, 6)
+    expected = pd.Series(
+        [1.0, np.nan, 2.0, np.nan, np.nan, np.nan, np.nan],
+        index=first.append(second),
+        name="age",
+    )
+    pd.testing.assert_series_equal(state_table.get_column("age")[10:], expected)
+    pd.testing.assert_series_equal(
+        state_table.get(first.append(second), ["age"])["age"], expected
+    )
+
+    state_table.remove_rows(pd.Index([0, first[1]]))
+    assert state_table._uninitialized["age"][0] == 10
+    state_table.update_column(
+        "age", pd.Series(0.0, index=pd.Index([first[3]]).append(second), name="age"), True
+    )
+    assert "age" not in state_table._uninitialized
+    assert state_table.get_column("age").notna().all()
+
+
+@pytest.fixture
+def buffered_state_table(state_table: StateTable) -> BufferedStateTable:
+    return BufferedStateTable(state_table)
+
+
+def test_buffered_updates_are_deferred(
+    buffered_state_table: BufferedStateTable, state_table_data: pd.DataFrame
+) -> None:
+    wrapped = buffered_state_table.state_table
+    buffered_state_table.update_column(
+        "age", pd.Series([100.0, 200.0], index=[3, 8], name="age"), adding_simulants=False
+    )
+    buffered_state_table.update_column(
+        "age", pd.Series([300.0, 400.0], index=[8, 9], name="age"), adding_simulants=False
+    )
+
+    assert buffered_state_table.has_pending_updates
+    pd.testing.assert_series_equal(wrapped.get_column("age"), state_table_data["age"])
+
+    expected = state_table_data["age"].copy()
+    expected[[3, 8, 9]] = [100.0, 300.0, 400.0]
+    index = pd.Index([9, 8, 0, 3])
+    pd.testing.assert_frame_equal(
+        buffered_state_table.get(index, ["count", "age"]),
+        pd.DataFrame({"count": state_table_data["count"][index], "age": expected[index]}),
+    )
+
+    buffered_state_table.flush()
+    assert not buffered_state_table.has_pending_updates
+    pd.testing.assert_series_equal(wrapped.get_column("age"), expected)
+
+
+def test_buffered_update_copies_data(buffered_state_table: BufferedStateTable) -> None:
+    update = pd.Series([100.0], index=[3], name="age")
+    buffered_state_table.update_column("age", update, adding_simulants=False)
+    update[3] = -1.0
+
+    assert buffered_state_table.get_column("age")[3] == 100.0
+
+
+def test_buffered_update_dtype_change_fails(buffered_state_table: BufferedStateTable) -> None:
+    update = pd.Series([1, 2], index=[3, 8], name="age")
+    with pytest.raises(PopulationError, match="corrupting the population table"):
+        buffered_state_table.update_column("age", update, adding_simulants=False)
+
+
+def test_buffered_updates_flush_before_adding_rows(
+    buffered_state_table: BufferedStateTable, state_table_data: pd.DataFrame
+) -> None:
+    update = pd.Series([-1], index=[5], name="count")
+    buffered_state_table.update_column("count", update, adding_simulants=False)
+    buffered_state_table.add_rows(2)
+
+    assert not buffered_state_table.has_pending_updates
+    assert buffered_state_table.state_table.get(pd.Index([5]), ["count"]).iloc[0, 0] == -1
+
+
+@pytest.mark.parametrize("buffer_updates", [True, False])
+def test_engines_with_buffered_updates_are_equivalent(
+    engine: str,
+    buffer_updates: bool,
+    disease_model_spec: Path,
+    run_simulation: Callable[..., InteractiveContext],
+) -> None:
+    sim = run_simulation(
+        {"state_table_engine": engine, "buffer_updates": buffer_updates},
+        model_specification=disease_model_spec,
+        steps=3,
+    )
+    reference = run_simulation({}, model_specification=disease_model_spec, steps=3)
+    pd.testing.assert_frame_equal(sim.get_population(), reference.get_population())
+
+
+def test_remove_rows(state_table: StateTable, state_table_data: pd.DataFrame) -> None:
+    removed = pd.Index([0, 4, 5, 9])
+    state_table.remove_rows(removed)
+
+    expected = state_table_data.drop(removed)
+    pd.testing.assert_frame_equal(state_table.to_frame(), expected)
+    pd.testing.assert_frame_equal(
+        state_table.get(pd.Index([8, 1]), ["count", "color"]),
+        expected.loc[[8, 1], ["count", "color"]],
+    )
+    with pytest.raises(KeyError):
+        state_table.get(pd.Index([4]), ["count"])
+
+
+def test_add_rows_after_remove_rows_uses_new_labels(
+    state_table: StateTable, state_table_data: pd.DataFrame
+) -> None:
+    state_table.remove_rows(pd.Index([8, 9]))
+    new_index = state_table.add_rows(2)
+
+    assert new_index.equals(pd.RangeIndex(10, 12))
+    assert state_table.index.equals(pd.Index(list(range(8)) + [10, 11]))
+    update = pd.Series([-1, -2], index=new_index, name="count")
+    state_table.update_column("count", update, adding_simulants=True)
+    pd.testing.assert_series_equal(
+        state_table.get_column("count"),
+        pd.concat([state_table_data["count"].iloc[:8], update]),
+    )
+
+
+def test_memory_mapped_columns(tmp_path: Path, state_table_data: pd.DataFrame) -> None:
+    state_table = MemoryMappedStateTable(state_table_data, directory=tmp_path)
+    directory = state_table.directory
+    assert directory.parent == tmp_path
+
+    for column in ["age", "count", "tracked"]:
+        assert isinstance(state_table._data[column], np.memmap)
+    assert not isinstance(state_table._data["color"], np.memmap)
+    assert len(list(directory.iterdir())) == 3
+
+    state_table.add_rows(5)
+    # Growing replaces the mapped files rather than accumulating them.
+    assert len(list(directory.iterdir())) == 3
+    assert len(state_table._data["age"]) == state_table.capacity
+    pd.testing.assert_frame_equal(
+        state_table.get(pd.Index([3, 1]), list(state_table_data)),
+        state_table_data.loc[[3, 1]],
+    )
+
+
+def test_memory_mapped_temporary_directory(state_table_data: pd.DataFrame) -> None:
+    state_table = MemoryMappedStateTable(state_table_data)
+    directory = state_table.directory
+    assert directory.exists()
+
+    del state_table
+    assert not directory.exists()
+
+
+def test_memory_mapped_directories_are_separate(
+    tmp_path: Path, state_table_data: pd.DataFrame
+) -> None:
+    first = MemoryMappedStateTable(state_table_data, directory=tmp_path)
+    second = MemoryMappedStateTable(state_table_data.iloc[:5], directory=tmp_path)
+    assert first.directory != second.directory
+    pd.testing.assert_frame_equal(first.to_frame(), state_table_data)
+
+    first.close()
+    assert not first.directory.exists()
+    assert second.directory.exists()
+    del second
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("results_directory", [True, False])
+def test_memory_mapped_engine_directory(
+    tmp_path: Path,
+    results_directory: bool,
+    run_simulation: Callable[..., InteractiveContext],
+) -> None:
+    population = {"state_table_engine": "memory_mapped", "population_size": 10}
+    if results_directory:
+        output_data = {"results_directory": str(tmp_path)}
+        expected = tmp_path / "state_table"
+    else:
+        output_data = {}
+        population["state_table_directory"] = str(tmp_path / "mm")
+        expected = tmp_path / "mm"
+
+    sim = run_simulation(population, output_data=output_data)
+    state_table = cast(PopulationManager, sim._population).get_state_table()
+    assert isinstance(state_table, MemoryMappedStateTable)
+    assert state_table.directory.parent == expected
+    assert list(state_table.directory.iterdir())
+
+    sim.finalize()
+    sim.report(print_results=False)
+    assert not state_table.directory.exists()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vivarium.framework.randomness import RandomnessManager
+from vivarium.framework.randomness.cache import DrawCache
+from vivarium.framework.randomness.index_map import IndexMap
+from vivarium.framework.randomness.stream import RandomnessStream
+from vivarium.interface import InteractiveContext
+
+
+def test_draw_cache() -> None:
+    times = [pd.Timestamp("2005-01-01")]
+    cache = DrawCache(2, lambda: times[-1])
+    assert np.isnan(cache.hit_rate)
+
+    for seed in range(3):
+        assert cache.get(seed) is None
+        cache.put(seed, np.full(10, seed, dtype=float))
+    # The least recently used block was dropped.
+    assert len(cache) == 2
+    assert cache.get(0) is None
+    block = cache.get(1)
+    assert block is not None
+    assert block[0] == 1
+    with pytest.raises(ValueError):
+        block[0] = 0
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert cache.hit_rate == 0.2
+
+    times.append(pd.Timestamp("2005-01-02"))
+    assert cache.get(2) is None
+    assert len(cache) == 0
+
+
+def test_stream_uses_draw_cache() -> None:
+    clock = lambda: pd.Timestamp("2005-01-01")
+    cache = DrawCache(4, clock)
+    stream = RandomnessStream("test", clock, 1, IndexMap(), draw_cache=cache)
+    uncached = RandomnessStream("test", clock, 1, IndexMap())
+
+    index = pd.Index(range(1000))
+    draws = stream.get_draw(index)
+    pd.testing.assert_series_equal(stream.get_draw(index[::2]), draws[::2])
+    pd.testing.assert_series_equal(uncached.get_draw(index), draws)
+    stream.get_draw(index, additional_key="other")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_draw_cache_performance_metrics() -> None:
+    sim = InteractiveContext(  # type: ignore [no-untyped-call]
+        configuration={"randomness": {"draw_cache_size": 2}}
+    )
+    stream = cast(RandomnessManager, sim._randomness)._get_randomness_stream("test")
+    index = sim.get_population().index
+    stream.get_draw(index)
+    stream.get_draw(index)
+
+    metrics = sim.get_performance_metrics().set_index("Event")
+    assert metrics.loc["randomness draw cache", "Count"] == 2
+    assert metrics.loc["randomness draw cache", "Hit rate (%)"] == 50
+    default = InteractiveContext()  # type: ignore [no-untyped-call]
+    assert "Hit rate (%)" not in default.get_performance_metrics()
@@ -118,6 +118,22 @@ def test_convert_to_ten_digit_int():
         m._convert_to_ten_digit_int(bad_col)
 
 
+@pytest.mark.parametrize("types_", [("int",), ("float",), ("int", "float", "datetime")])
+def test_hash_keys(types_):
+    keys = generate_keys(1000, types_).set_index(list(types_)).index
+    m = IndexMap(key_columns=list(types_))
+
+    expected = pd.Series(0, index=keys)
+    for level in range(keys.nlevels):
+        column = m._convert_to_ten_digit_int(pd.Series(keys.get_level_values(level)))
+        out = pd.Series(1, index=column.index)
+        for idx, p in enumerate([2, 3, 5, 7, 11, 13, 17, 19, 23, 27]):
+            out *= np.power(p, m._digit(column, idx))
+        expected += out.to_numpy()
+
+    pd.testing.assert_series_equal(m._hash_keys(keys), expected)
+
+
 @pytest.mark.skip("This fails because the hash needs work")
 def test_hash_collisions(map_size_and_hashed_values):
     n, h = map_size_and_hashed_values
@@ -152,13 +168,12 @@ def test_hash_uniformity(map_size_and_hashed_values):
 def index_map(mocker):
     mock_index_map = IndexMap
 
-    def hash_mock(k, salt):
-        seed = 123456
-        salt = IndexMap()._convert_to_ten_digit_int(pd.Series(salt, index=k))
-        rs = np.random.RandomState(seed=seed + salt)
+    def hash_mock(k):
+        # Hash into a small range so that many keys collide.
+        rs = np.random.RandomState(seed=123456)
         return pd.Series(rs.randint(0, len(k) * 10, size=len(k)), index=k)
 
-    mocker.patch.object(mock_index_map, "_hash", side_effect=hash_mock)
+    mocker.patch.object(mock_index_map, "_hash_keys", side_effect=hash_mock)
 
     return mock_index_map
 
@@ -204,3 +219,82 @@ def test_update_nonempty_good_keys(index_map):
         m._map.index.droplevel(m.SIM_INDEX_COLUMN).difference(key_index).empty
     ), "Extra keys in mapping"
     assert len(m._map.unique()) == len(keys), "Duplicate values in mapping"
+
+
+@pytest.mark.parametrize("chunk_size", [37, 400])
+def test_update_in_chunks(chunk_size):
+    # A small map so that many keys collide.
+    keys = generate_keys(1000)
+    clock_time = pd.to_datetime("2023-01-01")
+    m = IndexMap(key_columns=list(keys.columns), size=2000, place_in_order=True)
+    m.update(keys, clock_time)
+
+    chunked = IndexMap(key_columns=list(keys.columns), size=2000, place_in_order=True)
+    for start in range(0, len(keys), chunk_size):
+        chunked.update(keys.iloc[start : start + chunk_size], clock_time)
+
+    assert len(m._map.unique()) == len(keys)
+    pd.testing.assert_series_equal(chunked._map, m._map)
+
+
+def place_in_rounds(m, keys, clock_time):
+    """Places keys in an empty map by hashing all collided keys again each round."""
+    key_index = keys.set_index(m._key_columns).index
+    mapping = m._hash(key_index, salt=clock_time).drop_duplicates()
+    collisions = key_index.difference(mapping.index)
+    salt = 1
+    while not collisions.empty:
+        update = m._hash(collisions, salt)
+        mapping = pd.concat([mapping, update]).drop_duplicates()
+        collisions = update.index.difference(mapping.index)
+        salt += 1
+    if key_index.nlevels == 1:
+        # A single key column is given the positions in the order they were found.
+        return mapping.to_numpy()
+    return mapping.loc[key_index].to_numpy()
+
+
+@pytest.mark.parametrize("types_", [("int",), ("float",), ("int", "float", "datetime")])
+def test_update_resolves_collisions_in_rounds(types_):
+    keys = generate_keys(1000, types_)
+    clock_time = pd.to_datetime("2023-01-01")
+    m = IndexMap(key_columns=list(types_), size=1501)
+    expected = place_in_rounds(m, keys, clock_time)
+    m.update(keys, clock_time)
+
+    np.testing.assert_array_equal(m._map.to_numpy(), expected)
+
+
+def test_getitem():
+    keys = generate_keys(1000)
+    m = IndexMap(key_columns=list(keys.columns))
+    m.update(keys.iloc[:600], pd.to_datetime("2023-01-01"))
+    m.update(keys.iloc[600:], pd.to_datetime("2023-01-02"))
+
+    index = pd.Index([999, 3, 600, 42])
+    expected = m._map.loc[index].to_numpy()
+    np.testing.assert_array_equal(m[index], expected)
+    assert m[pd.Index([], dtype=int)].size == 0
+    with pytest.raises(KeyError):
+        m[pd.Index([3, 1000])]
+
+
+def test_update_out_of_order_and_existing_keys():
+    keys = generate_keys(1000)
+    m = IndexMap(key_columns=list(keys.columns))
+    m.update(keys.iloc[500:], pd.to_datetime("2023-01-01"))
+    m.update(keys.iloc[:500], pd.to_datetime("2023-01-02"))
+
+    assert m._map.index.get_level_values(m.SIM_INDEX_COLUMN).equals(pd.RangeIndex(1000))
+    np.testing.assert_array_equal(m[keys.index], m._map.to_numpy())
+
+    # Existing keys under new simulant indices are still duplicates.
+    with pytest.raises(RandomnessError):
+        m.update(keys.iloc[:10].set_axis(range(1000, 1010)), pd.to_datetime("2023-01-03"))
+
+
+def test_update_too_many_keys():
+    keys = generate_keys(20)
+    m = IndexMap(key_columns=list(keys.columns), size=10)
+    with pytest.raises(RandomnessError, match="too full"):
+        m.update(keys, pd.to_datetime("2023-01-01"))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from vivarium.framework.randomness.philox import (
+    get_philox_key,
+    get_uniform_draws,
+    philox4x32,
+)
+
+
+@pytest.mark.parametrize(
+    "counter, key, expected",
+    [
+        # Known answer tests from the Random123 distribution.
+        ([0, 0, 0, 0], (0, 0), [0x6627E8D5, 0xE169C58D, 0xBC57AC4C, 0x9B00DBD8]),
+        (
+            [0xFFFFFFFF] * 4,
+            (0xFFFFFFFF, 0xFFFFFFFF),
+            [0x408F276D, 0x41C83B0E, 0xA20BC7C6, 0x6D5451FD],
+        ),
+        (
+            [0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344],
+            (0xA4093822, 0x299F31D0),
+            [0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1],
+        ),
+    ],
+)
+def test_philox4x32(counter: list[int], key: tuple[int, int], expected: list[int]) -> None:
+    counters = np.array([[word] for word in counter], dtype=np.uint64)
+    assert philox4x32(counters, key)[:, 0].tolist() == expected
+
+
+def test_get_uniform_draws() -> None:
+    key = get_philox_key("test_2020-01-01_None_0")
+    positions = np.arange(100_000)
+    draws = get_uniform_draws(key, positions)
+
+    assert ((0 <= draws) & (draws < 1)).all()
+    assert stats.kstest(draws, "uniform").pvalue > 0.01
+    shuffled = np.random.default_rng(0).permutation(positions)
+    np.testing.assert_array_equal(get_uniform_draws(key, shuffled), draws[shuffled])
+    large_positions = positions + 2**40
+    assert not np.array_equal(get_uniform_draws(key, large_positions), draws)
+    assert not np.array_equal(get_uniform_draws(get_philox_key("other"), positions), draws)
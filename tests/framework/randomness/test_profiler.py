@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import cast
+
+import pandas as pd
+
+from vivarium.framework.randomness import RandomnessManager
+from vivarium.framework.randomness.index_map import IndexMap
+from vivarium.framework.randomness.profiler import StreamProfiler
+from vivarium.framework.randomness.stream import (
+    CounterBasedRandomnessStream,
+    RandomnessStream,
+)
+from vivarium.interface import InteractiveContext
+
+
+def test_stream_profiler() -> None:
+    phases = ["setup"]
+    profiler = StreamProfiler(lambda: phases[-1])
+    profiler.record("a", 10, 100, 0.5)
+    phases.append("time_step")
+    profiler.record("a", 10, 100, 1.0)
+    profiler.record("a", 5, 0, 0.5)
+    profiler.record("b", 1, 1, 0.25)
+
+    expected = pd.DataFrame(
+        {
+            "stream": ["a", "a", "b"],
+            "phase": ["time_step", "setup", "time_step"],
+            "calls": [2, 1, 1],
+            "draws": [15, 10, 1],
+            "samples": [100, 100, 1],
+            "time": [1.5, 0.5, 0.25],
+        }
+    )
+    pd.testing.assert_frame_equal(profiler.get_profile(), expected)
+    assert StreamProfiler(lambda: "setup").get_profile().empty
+
+
+def test_streams_report_to_profiler() -> None:
+    clock = lambda: pd.Timestamp("2005-01-01")
+    profiler = StreamProfiler(lambda: "time_step")
+    index_map = IndexMap(size=1000)
+    index = pd.Index(range(100))
+    RandomnessStream("block", clock, 1, index_map, profiler=profiler).get_draw(index)
+    stream = CounterBasedRandomnessStream("counter", clock, 1, index_map, profiler=profiler)
+    stream.get_draws(index, ["a", "b"])
+    stream.get_draw(index[:0])
+
+    profile = profiler.get_profile().set_index("stream")
+    assert profile.loc["block", ["calls", "draws", "samples"]].tolist() == [1, 100, 1000]
+    assert profile.loc["counter", ["calls", "draws", "samples"]].tolist() == [2, 200, 200]
+    assert (profile["time"] > 0).all()
+
+
+def test_stream_profile_performance_metrics_and_output(tmp_path: Path) -> None:
+    sim = InteractiveContext(  # type: ignore [no-untyped-call]
+        configuration={
+            "randomness": {"profile_streams": True},
+            "output_data": {"results_directory": str(tmp_path)},
+        }
+    )
+    randomness = cast(RandomnessManager, sim._randomness)
+    stream = randomness._get_randomness_stream("test")
+    index = sim.get_population().index
+    stream.get_draw(index)
+    stream.filter_for_probability(index, 0.5)
+
+    metrics = sim.get_performance_metrics().set_index("Event")
+    row = metrics.loc[f"randomness stream test ({sim._lifecycle.current_state})"]
+    assert row["Count"] == 2
+    assert row["Draws"] == 2 * len(index)
+
+    sim._write_results({})
+    written = pd.read_parquet(Path(tmp_path) / "randomness_profile.parquet")
+    pd.testing.assert_frame_equal(written, randomness.get_stream_profile())
+    default = InteractiveContext()  # type: ignore [no-untyped-call]
+    assert "Draws" not in default.get_performance_metrics()
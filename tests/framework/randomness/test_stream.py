@@ -7,24 +7,28 @@ from scipy import stats
 
 from vivarium.framework.randomness import RESIDUAL_CHOICE, RandomnessError, RandomnessStream
 from vivarium.framework.randomness.index_map import IndexMap
-from vivarium.framework.randomness.stream import _normalize_shape, _set_residual_probability
+from vivarium.framework.randomness.stream import (
+    STREAM_ENGINES,
+    CounterBasedRandomnessStream,
+    GeneratorRandomnessStream,
+    _choice,
+    _get_choice_indices,
+    _set_residual_probability,
+)
 
 
-@pytest.fixture
-def randomness_stream():
+@pytest.fixture(params=list(STREAM_ENGINES))
+def randomness_stream(request):
     dates = [pd.Timestamp(1991, 1, 1), pd.Timestamp(1990, 1, 1)]
-    randomness = RandomnessStream("test", dates.pop, 1, IndexMap())
+    randomness = STREAM_ENGINES[request.param]("test", dates.pop, 1, IndexMap())
     return randomness
 
 
-def test_normalize_shape(weights_with_residuals, index):
-    p = _normalize_shape(weights_with_residuals, index)
-    assert p.shape == (len(index), len(weights_with_residuals))
-
-
 def test__set_residual_probability(weights_with_residuals, index):
     # Coerce the weights to a 2-d numpy array.
-    p = _normalize_shape(weights_with_residuals, index)
+    p = np.array(
+        np.broadcast_to(weights_with_residuals, (len(index), len(weights_with_residuals)))
+    )
 
     residual = np.where(p == RESIDUAL_CHOICE, 1, 0)
     non_residual = np.where(p != RESIDUAL_CHOICE, p, 0)
@@ -104,7 +108,9 @@ def test_choice(randomness_stream, index, choices, weights):
 def test_choice_with_residuals(randomness_stream, index, choices, weights_with_residuals):
     print(RESIDUAL_CHOICE in weights_with_residuals)
 
-    p = _normalize_shape(weights_with_residuals, index)
+    p = np.array(
+        np.broadcast_to(weights_with_residuals, (len(index), len(weights_with_residuals)))
+    )
 
     residual = np.where(p == RESIDUAL_CHOICE, 1, 0)
     non_residual = np.where(p != RESIDUAL_CHOICE, p, 0)
@@ -191,3 +197,112 @@ def test_sample_from_distribution_using_ppf(index: pd.Index):
     assert isinstance(sample, pd.Series)
     assert sample.index.equals(index)
     assert np.allclose(sample, expected)
+
+
+@pytest.mark.parametrize("num_choices", [2, 5, 10, 50])
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_get_choice_indices(num_choices, order):
+    rs = np.random.RandomState(12345)
+    draws = rs.random_sample(1000)
+    weights = np.array(rs.random_sample((1000, num_choices)), order=order)
+
+    bins = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+    expected = (draws[:, np.newaxis] > bins).sum(axis=1)
+    np.testing.assert_array_equal(
+        _get_choice_indices(draws, weights.copy(order="K")), expected
+    )
+
+    row_bins = np.cumsum(weights[0] / weights[0].sum())
+    expected = (draws[:, np.newaxis] > row_bins).sum(axis=1)
+    np.testing.assert_array_equal(_get_choice_indices(draws, weights[0].copy()), expected)
+
+
+def test_choice_overwrite_p():
+    draws = pd.Series(np.linspace(0, 1, 100, endpoint=False))
+    p = np.tile([0.2, 0.3, 0.5], (100, 1))
+    original = p.copy()
+
+    expected = _choice(draws, ["a", "b", "c"], p)
+    np.testing.assert_array_equal(p, original)
+    pd.testing.assert_series_equal(
+        _choice(draws, ["a", "b", "c"], p, overwrite_p=True), expected
+    )
+    assert not np.array_equal(p, original)
+
+
+@pytest.mark.parametrize(
+    "stream_type",
+    [stream_type for stream_type in STREAM_ENGINES.values() if stream_type.supports_crn],
+)
+def test_get_draws(stream_type):
+    clock = lambda: pd.Timestamp(1990, 1, 1)
+    index_map = IndexMap(["age"])
+    index_map.update(pd.DataFrame({"age": np.linspace(0, 1, 1000)}), clock())
+    stream = stream_type("test", clock, 1, index_map)
+
+    index = pd.Index(range(0, 1000, 3))
+    additional_keys = ["first", None, 3]
+    draws = stream.get_draws(index, additional_keys)
+    assert draws.index.equals(index)
+    assert list(draws.columns) == additional_keys
+    for additional_key in additional_keys:
+        np.testing.assert_array_equal(
+            draws[additional_key], stream.get_draw(index, additional_key)
+        )
+
+    empty = stream.get_draws(index[:0], additional_keys)
+    assert empty.shape == (0, len(additional_keys))
+
+
+def test_counter_based_draws_only_depend_on_position():
+    clock = lambda: pd.Timestamp(1990, 1, 1)
+    key_columns = ["age"]
+    index_map = IndexMap(key_columns)
+    index_map.update(pd.DataFrame({"age": np.linspace(0, 1, 1000)}), clock())
+    stream = CounterBasedRandomnessStream("test", clock, 1, index_map)
+
+    index = pd.Index(range(1000))
+    draws = stream.get_draw(index)
+    subset = index[::7]
+    pd.testing.assert_series_equal(stream.get_draw(subset), draws[subset])
+    pd.testing.assert_series_equal(
+        CounterBasedRandomnessStream("test", clock, 1, index_map).get_draw(index), draws
+    )
+    assert not stream.get_draw(index, additional_key="other").equals(draws)
+    assert ((0 <= draws) & (draws < 1)).all()
+    assert stats.kstest(draws, "uniform").pvalue > 0.01
+
+
+def test_generator_stream():
+    clock = lambda: pd.Timestamp(1990, 1, 1)
+    index = pd.Index(range(1000))
+
+    stream = GeneratorRandomnessStream("test", clock, 1, IndexMap())
+    draws = [stream.get_draw(index), stream.get_draw(index[:10], additional_key="other")]
+    assert len(draws[1]) == 10
+    assert not draws[0][:10].equals(draws[1])
+    assert stats.kstest(draws[0], "uniform").pvalue > 0.01
+
+    same_seed = GeneratorRandomnessStream("test", clock, 1, IndexMap())
+    pd.testing.assert_series_equal(same_seed.get_draw(index), draws[0])
+    pd.testing.assert_series_equal(same_seed.get_draw(index[:10]), draws[1])
+    for other_stream in [
+        GeneratorRandomnessStream("other", clock, 1, IndexMap()),
+        GeneratorRandomnessStream("test", clock, 2, IndexMap()),
+    ]:
+        assert not other_stream.get_draw(index).equals(draws[0])
+
+
+def test_generator_stream_engine_without_crn():
+    from vivarium.interface import InteractiveContext
+
+    configuration = {"randomness": {"stream_engine": "generator", "key_columns": ["age"]}}
+    with pytest.raises(RandomnessError, match="common random numbers"):
+        InteractiveContext(configuration=configuration)
+
+
+def test_unknown_stream_engine():
+    from vivarium.interface import InteractiveContext
+
+    with pytest.raises(RandomnessError, match="stream engine"):
+        InteractiveContext(configuration={"randomness": {"stream_engine": "dice"}})
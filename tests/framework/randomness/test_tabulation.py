@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pytest
+from scipy import stats
+
+from vivarium.framework.randomness import RandomnessError, RandomnessStream, TabulatedPPF
+from vivarium.framework.randomness.index_map import IndexMap
+
+
+@pytest.mark.parametrize(
+    "distribution, kwargs",
+    [
+        (stats.lognorm, {"s": 0.5, "scale": 20}),
+        (stats.gamma, {"a": 2.0, "scale": 3}),
+        (stats.norm(loc=5, scale=2), {}),
+    ],
+)
+@pytest.mark.parametrize("tolerance", [1e-4, 1e-6])
+def test_tabulated_ppf(distribution: Any, kwargs: dict[str, float], tolerance: float) -> None:
+    ppf = TabulatedPPF(distribution, tolerance=tolerance, **kwargs)
+    assert np.all(np.diff(ppf.values) >= 0)
+
+    report = ppf.get_accuracy_report()
+    assert report["within_tolerance"]
+    assert report["table_size"] == len(ppf.probabilities)
+
+    draws = np.random.RandomState(1234).random_sample(10_000)
+    exact = distribution.ppf(draws, **kwargs)
+    assert np.all(np.abs(ppf(draws) - exact) <= tolerance * np.maximum(1, np.abs(exact)))
+    assert ppf.get_accuracy_report(draws)["within_tolerance"]
+
+
+def test_tabulated_ppf_tails() -> None:
+    ppf = TabulatedPPF(stats.lognorm, tail_probability=1e-6, s=1)
+    draws = np.array([0.0, 1e-8, 0.5, 1 - 1e-8])
+    np.testing.assert_array_equal(
+        ppf(draws)[[0, 1, 3]], stats.lognorm.ppf(draws, s=1)[[0, 1, 3]]
+    )
+
+
+def test_tabulated_ppf_of_function() -> None:
+    weights = [0.3, 0.7]
+    distributions = [stats.norm(0, 1), stats.norm(3, 0.5)]
+
+    def mixture_cdf(x: npt.NDArray[np.float64]) -> Any:
+        return sum(w * d.cdf(x) for w, d in zip(weights, distributions))
+
+    grid = np.linspace(-10, 10, 200_001)
+    ppf = TabulatedPPF(lambda q: np.interp(q, mixture_cdf(grid), grid), tolerance=1e-4)
+    assert ppf.get_accuracy_report()["within_tolerance"]
+
+
+def test_tabulated_ppf_errors() -> None:
+    with pytest.raises(RandomnessError, match="scalar"):
+        TabulatedPPF(stats.lognorm, s=np.array([0.5, 1]))
+    with pytest.raises(RandomnessError, match="probabilities are needed"):
+        TabulatedPPF(stats.lognorm, tolerance=1e-12, max_size=5000, s=1)
+    with pytest.raises(RandomnessError, match="not finite"):
+        TabulatedPPF(lambda q: np.where(q < 0.5, -np.inf, q))
+
+
+def test_sample_from_tabulated_distribution() -> None:
+    clock = lambda: pd.Timestamp(1990, 1, 1)
+    stream = RandomnessStream("test", clock, 1, IndexMap())
+    index = pd.Index(range(10_000))
+
+    exact = stream.sample_from_distribution(index, stats.gamma, a=2.0, scale=3)
+    tabulated = stream.sample_from_distribution(
+        index, ppf=TabulatedPPF(stats.gamma, a=2.0, scale=3)
+    )
+    assert tabulated.index.equals(index)
+    np.testing.assert_allclose(tabulated, exact, rtol=1e-6)
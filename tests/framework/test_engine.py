@@ -245,6 +245,43 @@ def test_SimulationContext_initialize_simulants(SimulationContext, base_config,
     assert sim._clock.time == current_time
 
 
+@pytest.mark.parametrize(
+    "key_columns, chunk_sizes",
+    [
+        # A chunk size of at least the population size is a single chunk.
+        (["entrance_time", "age"], [0, 1000, 5000]),
+        # Populations created in several chunks agree with each other, but
+        # collisions in the index map are resolved differently than for a
+        # single chunk.
+        (["entrance_time", "age"], [999, 300, 70]),
+        # Without key columns, every chunk size gives the same population.
+        ([], [0, 300, 1000]),
+    ],
+)
+def test_SimulationContext_initialize_simulants_in_chunks(
+    SimulationContext, disease_model_spec, key_columns, chunk_sizes
+):
+    populations = []
+    for chunk_size in chunk_sizes:
+        sim = SimulationContext(
+            disease_model_spec,
+            configuration={
+                "population": {
+                    "population_size": 1000,
+                    "initialization_chunk_size": chunk_size,
+                },
+                "randomness": {"key_columns": key_columns},
+            },
+        )
+        sim.setup()
+        sim.initialize_simulants()
+        populations.append(sim._population.get_population(True))
+
+    assert len(populations[0]) == 1000
+    for population in populations[1:]:
+        pd.testing.assert_frame_equal(population, populations[0])
+
+
 def test_SimulationContext_step(SimulationContext, log, base_config, components):
     sim = SimulationContext(base_config, components)
     sim.setup()
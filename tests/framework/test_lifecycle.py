@@ -308,6 +308,21 @@ def test_lifecycle_manager_set_state():
     assert lm.current_state == "d"
 
 
+def test_lifecycle_manager_exit_hooks():
+    lm = LifeCycleManager()
+    lm.add_phase("phase1", ["a", "b"])
+    exited = []
+    lm.add_exit_hook(lambda state: exited.append((state, lm.current_state)))
+
+    lm.set_state("a")
+    lm.set_state("b")
+    assert exited == [("initialization", "initialization"), ("a", "a")]
+
+    with pytest.raises(LifeCycleError, match="Invalid transition"):
+        lm.set_state("a")
+    assert len(exited) == 2
+
+
 def test_lifecycle_manager_set_state_with_loop():
     lm = LifeCycleManager()
     lm.add_phase("phase1", ["a", "b"], loop=True)
@@ -130,3 +130,53 @@ def test_unsourced_pipeline():
         match=f"The dynamic value pipeline for {pipeline.name} has no source.",
     ):
         pipeline()
+
+
+def test_memoized_pipeline(mocker):
+    manager = ValuesManager()
+    builder = mocker.MagicMock()
+    times = [pd.Timestamp("2020-01-01")]
+    versions = {"age": 1, "sex": 1}
+    builder.time.clock = lambda: lambda: times[-1]
+    builder.population.get_column_version = lambda columns: max(versions[c] for c in columns)
+    manager.setup(builder)
+
+    calls = []
+
+    def source(index):
+        calls.append(len(index))
+        return pd.Series(float(len(calls)), index=index)
+
+    other = manager.register_value_producer(
+        "other", source=lambda idx: pd.Series(2.0, index=idx), requires_columns=["sex"]
+    )
+    value = manager.register_value_producer(
+        "test", source=source, requires_columns=["age"], memoize=True
+    )
+    manager.register_value_modifier(
+        "test", modifier=lambda idx, v: v * other(idx), requires_values=["other"]
+    )
+    manager.on_post_setup(None)
+    assert value._memo_columns == ["age", "sex"]
+
+    index = pd.Index(range(10))
+    first = value(index)
+    assert (first == 2).all()
+    pd.testing.assert_series_equal(value(index), first)
+    # Sub-indexes are sliced from the memoized value.
+    pd.testing.assert_series_equal(value(pd.Index([7, 2])), first.iloc[[7, 2]])
+    # Callers may modify the values they get.
+    value(index)[:] = -1
+    pd.testing.assert_series_equal(value(index), first)
+    assert calls == [10]
+
+    # Writing a column a required pipeline depends on invalidates the value.
+    versions["sex"] = 2
+    assert (value(index) == 4).all()
+    # So does advancing the clock.
+    times.append(pd.Timestamp("2020-01-02"))
+    assert (value(index) == 6).all()
+    # An index that isn't covered is generated and memoized.
+    assert (value(pd.Index(range(5, 15))) == 8).all()
+    assert (value(pd.Index(range(5, 10))) == 8).all()
+    assert calls == [10, 10, 10, 10]